@@ -0,0 +1,320 @@
+import os
+import queue
+import time
+from multiprocessing import Queue, Process, cpu_count
+from multiprocessing.pool import ThreadPool
+import numpy as np
+import pandas as pd
+import scipy.sparse as spa
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from problem_classes.maros_meszaros import MarosMeszaros
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+from utils.general import make_sure_path_exists, is_qp_solution_optimal
+from utils.maros_meszaros import OPT_COST_MAP
+
+
+def coefficient_range(*matrices):
+    '''
+    Ratio of the largest and the smallest nonzero coefficient of the
+    matrices in log10 scale
+    '''
+    data = np.abs(np.hstack([M.data for M in matrices]))
+    data = data[data != 0]
+    if data.shape[0] == 0:
+        return 0.
+    return np.log10(data.max() / data.min())
+
+
+def kkt_norm_range(P, C):
+    '''
+    Ratio of the largest and the smallest nonzero infinity norm of the rows
+    of the KKT matrix [P C'; C 0] in log10 scale, i.e., an estimate of the
+    condition number of its diagonal scaling
+    '''
+    K = spa.bmat([[P, C.T], [C, None]], format='csr')
+    norms = abs(K).max(axis=1).toarray().ravel()
+    norms = norms[norms != 0]
+    if norms.shape[0] == 0:
+        return 0.
+    return np.log10(norms.max() / norms.min())
+
+
+def scaled_coefficient_range(P, C, exponents, amplitude):
+    '''
+    Coefficient range of P and C in log10 scale after scaling the rows,
+    columns and objective by 10^(amplitude * exponents), see
+    MarosMeszaros.scale
+
+    The logarithms of the scaled coefficients are linear in the amplitude,
+    hence the range is a convex function of the amplitude.
+    '''
+    row_exp, col_exp, cost_exp = exponents
+    P = spa.coo_matrix(P)
+    C = spa.coo_matrix(C)
+    log_data = np.log10(np.abs(np.hstack([P.data, C.data])))
+    log_scale = np.hstack([cost_exp + col_exp[P.row] + col_exp[P.col],
+                           row_exp[C.row] + col_exp[C.col]])
+    finite = np.isfinite(log_data)
+    if not np.any(finite):
+        return 0.
+    log_data = log_data[finite] + amplitude * log_scale[finite]
+    return log_data.max() - log_data.min()
+
+
+class MarosMeszarosConditioningRunner(object):
+    '''
+    Scaling stress runner
+    '''
+    def __init__(self,
+                 solvers,
+                 settings,
+                 output_folder,
+                 levels=[0, 2, 4, 6, 8],
+                 seed=1,
+                 max_amplitude=100.):
+        '''
+        Args:
+            solvers: solver names
+            settings: settings dictionary of each solver
+            output_folder: results folder
+            levels: stress levels s, i.e., the number of decades the
+                    scaling adds to the coefficient range of P and A.
+                    Level 0 is the original problem.
+            seed: random seed of the scaling factors
+            max_amplitude: largest amplitude t of the scaling factors
+                           10^(t U(-1/2, 1/2)) if the target range cannot
+                           be reached
+        '''
+        self.solvers = solvers
+        self.settings = settings
+        self.output_folder = output_folder
+        self.levels = levels
+        self.seed = seed
+        self.max_amplitude = max_amplitude
+
+        # Get maros problems list
+        problems_dir = os.path.join(".", "problem_classes", PROBLEMS_FOLDER)
+        # List of problems in .mat format
+        lst_probs = [f for f in os.listdir(problems_dir) if \
+            f.endswith('.mat')]
+        self.problems = [f[:-4] for f in lst_probs]   # List of problem names
+
+    @staticmethod
+    def level_folder(level):
+        return 'level_%i' % level
+
+    def solve(self, parallel=True, cores=32):
+        '''
+        Solve the scaled problems of every stress level
+
+        The results are stored as
+
+            ./results/{self.output_folder}/level_{s}/{solver}/results.csv
+
+        with the same fields as the Maros Meszaros runner and
+            - 'level': stress level s
+            - 'amplitude': amplitude t of the scaling factors
+            - 'coef_range': range of the coefficients of the scaled P and A
+              in log10 scale, i.e., the one of the original problem plus s
+              unless the amplitude reached max_amplitude
+            - 'coef_range_P', 'coef_range_A': ranges of the coefficients of
+              the scaled P and A in log10 scale
+            - 'kkt_norm_range': range of the row norms of the scaled KKT
+              matrix in log10 scale, see kkt_norm_range
+
+        The solutions are mapped back and verified on the original
+        problem, the status is SOLVER_ERROR if they are not optimal. The
+        objective values are the ones of the original problem.
+
+        Every solve runs in a separate process that is killed after the
+        time limit of the solver and reported as TIME_LIMIT.
+        '''
+        print("Solving scaled Maros Meszaros problems")
+        print("--------------------------------------")
+
+        if parallel:
+            pool = ThreadPool(processes=min(cores, cpu_count()))
+            results = pool.map(self.solve_levels, self.problems, 1)
+            pool.close()  # Not accepting any more jobs on this pool
+            pool.join()   # Wait for all processes to finish
+        else:
+            results = [self.solve_levels(problem)
+                       for problem in self.problems]
+
+        df = pd.concat(results)
+        for level in self.levels:
+            for solver in self.solvers:
+                path = os.path.join('.', 'results', self.output_folder,
+                                    self.level_folder(level), solver)
+                make_sure_path_exists(path)
+                df.loc[(df['level'] == level) &
+                       (df['solver'] == solver)].to_csv(
+                    os.path.join(path, 'results.csv'), index=False)
+
+    def solve_levels(self, problem):
+        '''
+        Solve Maros Meszaros 'problem' with all solvers at all stress
+        levels
+
+        Returns:
+            pandas dataframe with one row per solver and level
+        '''
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = MarosMeszaros(full_name)
+        n = instance.n
+        n_con = instance.m - instance.n
+        N = instance.qp_problem['P'].nnz + instance.qp_problem['A'].nnz
+
+        # Seeded by problem to be independent of the order of the problems
+        rng = np.random.default_rng([self.seed, sum(map(ord, problem))])
+        exponents = (rng.uniform(-.5, .5, n_con),
+                     rng.uniform(-.5, .5, n),
+                     rng.uniform(-.5, .5))
+
+        P = instance.qp_problem['P']
+        C = instance.A[:n_con]
+        original_range = coefficient_range(P, C)
+
+        results = []
+        for level in self.levels:
+            amplitude = self.stress_amplitude(P, C, exponents,
+                                              original_range + level)
+            example = instance.scale(10 ** (amplitude * exponents[0]),
+                                     10 ** (amplitude * exponents[1]),
+                                     10 ** (amplitude * exponents[2]))
+            coef_range = coefficient_range(example.P, example.A[:n_con])
+            coef_range_P = coefficient_range(example.P)
+            coef_range_A = coefficient_range(example.A[:n_con])
+            cond_range = kkt_norm_range(example.P, example.A[:n_con])
+
+            for solver in self.solvers:
+                settings = self.settings[solver]
+                print(" - Solving %s (level %i) with solver %s" %
+                      (problem, level, solver), flush=True)
+                row = {'name': [problem],
+                       'solver': [solver],
+                       'level': [level]}
+                row.update(self.solve_example_with_timeout(
+                    instance, example, solver, settings))
+                row.update({'obj_opt': [OPT_COST_MAP[problem]],
+                            'amplitude': [amplitude],
+                            'coef_range': [coef_range],
+                            'coef_range_P': [coef_range_P],
+                            'coef_range_A': [coef_range_A],
+                            'kkt_norm_range': [cond_range],
+                            'n': [n],
+                            'm': [instance.m],
+                            'N': [N]})
+                results.append(pd.DataFrame(row))
+
+        return pd.concat(results)
+
+    def stress_amplitude(self, P, C, exponents, target_range):
+        '''
+        Amplitude t of the scaling factors 10^(t * exponents) such that the
+        coefficient range of P and C is target_range (in log10 scale)
+
+        The range is convex in t and equal to the original range at t = 0,
+        hence the bisection finds the unique t > 0 reaching a larger
+        target. If even max_amplitude does not reach it, e.g., if the
+        scaling cannot change the range, max_amplitude is returned.
+        '''
+        def coef_range(t):
+            return scaled_coefficient_range(P, C, exponents, t)
+
+        if coef_range(0.) >= target_range:
+            return 0.
+        if coef_range(self.max_amplitude) < target_range:
+            return self.max_amplitude
+
+        low, high = 0., self.max_amplitude
+        while high - low > 1e-06 * max(1., low):
+            middle = (low + high) / 2.
+            if coef_range(middle) < target_range:
+                low = middle
+            else:
+                high = middle
+        return high
+
+    def solve_example_with_timeout(self, instance, example, solver,
+                                   settings):
+        '''
+        Solve the scaled 'example' of 'instance' with 'solver' in a new
+        process
+
+        A process exceeding the time limit is killed and reported as
+        TIME_LIMIT, a process terminated without results as SOLVER_ERROR.
+
+        Returns:
+            dictionary with the fields 'status', 'run_time', 'iter' and
+            'obj_val'
+        '''
+        q = Queue()
+        p = Process(target=self.solve_example_in_queue,
+                    args=(q, instance, example, solver, settings))
+        p.start()
+
+        start_time = time.time()
+        while True:
+            try:
+                result = q.get(timeout=1.0)
+                p.join()
+                return result
+            except queue.Empty:
+                if not p.is_alive():
+                    # The results might have been queued just before
+                    # exiting
+                    try:
+                        result = q.get(timeout=1.0)
+                        p.join()
+                        return result
+                    except queue.Empty:
+                        status = s.SOLVER_ERROR
+                        break
+                elif time.time() - start_time > settings['time_limit'] + 5:
+                    status = s.TIME_LIMIT
+                    break
+
+        if p.is_alive():
+            p.terminate()
+        p.join()
+
+        return {'status': [status],
+                'run_time': [settings['time_limit']],
+                'iter': [0],
+                'obj_val': [np.inf]}
+
+    def solve_example_in_queue(self, queue, instance, example, solver,
+                               settings):
+        queue.put(self.solve_example(instance, example, solver, settings))
+
+    @staticmethod
+    def solve_example(instance, example, solver, settings):
+        '''
+        Solve the scaled 'example' of 'instance' with 'solver' and verify
+        the unscaled solution on the original problem
+        '''
+        solver_results = SOLVER_MAP[solver](settings).solve(example)
+        status = solver_results.status
+
+        # Verify the solution on the original problem
+        if status in s.SOLUTION_PRESENT:
+            x, y = example.unscale_solution(solver_results.x,
+                                            solver_results.y)
+            if not is_qp_solution_optimal(
+                    instance.qp_problem, x, y,
+                    high_accuracy=settings.get('high_accuracy'),
+                    strict=True):
+                status = s.SOLVER_ERROR
+
+        obj = solver_results.obj_val
+        if obj is not None:
+            obj = (obj + example.qp_problem["r"]) / example.cost_scale
+
+        return {'status': [status],
+                'run_time': [solver_results.run_time],
+                'iter': [solver_results.niter],
+                'obj_val': [obj]}
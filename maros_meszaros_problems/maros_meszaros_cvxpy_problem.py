@@ -0,0 +1,194 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import cvxpy
+import cvxpy.settings as stgs
+
+import solvers.statuses as s
+from problem_classes.maros_meszaros import MarosMeszaros
+from maros_meszaros_problems.maros_meszaros_problem import \
+    MarosMeszarosRunner, PROBLEMS_FOLDER
+from utils.general import is_qp_solution_optimal
+from utils.maros_meszaros import OPT_COST_MAP
+
+
+class MarosMeszarosCVXPYRunner(MarosMeszarosRunner):
+    '''
+    Examples runner solving the problems through CVXPY
+
+    The run time is split in
+        - 'compile_time': canonicalization of the problem for the solver
+        - 'solve_time': solver call on the canonicalized data
+        - 'retrieval_time': unpacking of the solution and recovery of the
+                            QP primal and dual variables
+        - 'recompile_time': compilation after perturbing the parameter
+                            values, i.e., reusing the cached
+                            canonicalization
+    '''
+
+    STATUS_MAP = {stgs.OPTIMAL: s.OPTIMAL,
+                  stgs.OPTIMAL_INACCURATE: s.OPTIMAL_INACCURATE,
+                  stgs.INFEASIBLE: s.PRIMAL_INFEASIBLE,
+                  stgs.INFEASIBLE_INACCURATE: s.PRIMAL_INFEASIBLE_INACCURATE,
+                  stgs.UNBOUNDED: s.DUAL_INFEASIBLE,
+                  stgs.UNBOUNDED_INACCURATE: s.DUAL_INFEASIBLE_INACCURATE,
+                  stgs.USER_LIMIT: s.MAX_ITER_REACHED}
+
+    # Benchmark settings which are not solver options
+    BENCHMARK_SETTINGS = ['verbose', 'high_accuracy', 'strict_optimality',
+                          'time_limit', 'dense_memory_limit', 'backend',
+                          'kkt_solver', 'trace']
+
+    @staticmethod
+    def cvxpy_solver(solver):
+        '''
+        Get CVXPY solver name of benchmark 'solver', e.g., OSQP_high -> OSQP
+        '''
+        return solver.split('_')[0]
+
+    @classmethod
+    def supported_solvers(cls, solvers):
+        '''
+        Get benchmark solvers which are installed in CVXPY
+        '''
+        installed = cvxpy.installed_solvers()
+        return [solver for solver in solvers
+                if cls.cvxpy_solver(solver) in installed]
+
+    def solver_opts(self, solver, settings):
+        '''
+        Get CVXPY solver options from the benchmark settings
+        '''
+        opts = {param: value for param, value in settings.items()
+                if param not in self.BENCHMARK_SETTINGS}
+        cvxpy_solver = self.cvxpy_solver(solver)
+        if cvxpy_solver == 'MOSEK':
+            opts = {'mosek_params': opts}
+        elif cvxpy_solver in ['OSQP', 'QPALM', 'CLARABEL']:
+            opts['time_limit'] = settings['time_limit']
+        elif cvxpy_solver == 'SCS':
+            opts['time_limit_secs'] = settings['time_limit']
+        return opts
+
+    def solve_single_example(self,
+                             problem,
+                             solver, settings):
+        '''
+        Solve Maros Meszaro 'problem' with 'solver' through CVXPY
+
+        Args:
+            problem: Maros problem name
+            solver: solver name
+            settings: settings dictionary for the solver
+
+        '''
+        # Create example instance with CVXPY problem
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = MarosMeszaros(full_name, create_cvxpy_problem=True)
+        cvxpy_problem = instance.cvxpy_problem
+        cvxpy_solver = self.cvxpy_solver(solver)
+        solver_opts = self.solver_opts(solver, settings)
+
+        print(" - Solving %s with solver %s (CVXPY)" % (problem, solver),
+              flush=True)
+
+        P = instance.qp_problem['P']
+        A = instance.qp_problem['A']
+        N = P.nnz + A.nnz
+
+        compile_time = solve_time = retrieval_time = recompile_time = None
+        obj = None
+        niter = None
+        try:
+            # Compile
+            t_start = time.perf_counter()
+            data, chain, inverse_data = \
+                cvxpy_problem.get_problem_data(cvxpy_solver, enforce_dpp=True,
+                                               solver_opts=solver_opts)
+            compile_time = time.perf_counter() - t_start
+
+            # Solve
+            t_start = time.perf_counter()
+            solution = chain.solve_via_data(cvxpy_problem, data,
+                                            warm_start=False,
+                                            verbose=settings.get('verbose'),
+                                            solver_opts=solver_opts)
+            solve_time = time.perf_counter() - t_start
+
+            # Retrieve solution
+            t_start = time.perf_counter()
+            cvxpy_problem.unpack_results(solution, chain, inverse_data)
+            status = self.STATUS_MAP.get(cvxpy_problem.status,
+                                         s.SOLVER_ERROR)
+            if status in s.SOLUTION_PRESENT:
+                x, y = instance.revert_cvxpy_solution()
+            retrieval_time = time.perf_counter() - t_start
+
+            niter = cvxpy_problem.solver_stats.num_iters
+        except Exception as e:
+            # Errors of the solver interfaces are not only SolverError
+            if settings.get('verbose'):
+                print("Error in %s solution through CVXPY: %s\n" %
+                      (solver, e))
+            status = s.SOLVER_ERROR
+
+        if status in s.SOLUTION_PRESENT:
+            # Objective value includes the constant part
+            obj = cvxpy_problem.value
+
+            if not is_qp_solution_optimal(instance.qp_problem, x, y,
+                                          high_accuracy=settings.get('high_accuracy'),
+                                          strict=settings.get('strict_optimality', False)):
+                status = s.SOLVER_ERROR
+
+        # Recompile with perturbed parameter values. The perturbed problem
+        # shares the CVXPY problem of the instance.
+        if compile_time is not None:
+            n = instance.n
+            q_scale = max(np.linalg.norm(instance.q, np.inf), 1.)
+            rng = np.random.default_rng(0)
+            perturbed = instance.perturb(1e-3 * q_scale * rng.standard_normal(n),
+                                         1e-3 * rng.standard_normal(n))
+            try:
+                perturbed.set_cvxpy_parameters()
+                t_start = time.perf_counter()
+                cvxpy_problem.get_problem_data(cvxpy_solver, enforce_dpp=True,
+                                               solver_opts=solver_opts)
+                recompile_time = time.perf_counter() - t_start
+            except Exception as e:
+                if settings.get('verbose'):
+                    print("Error in %s recompilation through CVXPY: %s\n" %
+                          (solver, e))
+            instance.set_cvxpy_parameters()
+
+        if solve_time is not None:
+            run_time = compile_time + solve_time
+            if retrieval_time is not None:
+                run_time += retrieval_time
+            if run_time > settings['time_limit']:
+                status = s.TIME_LIMIT
+        else:
+            run_time = None
+
+        solution_dict = {'name': [problem],
+                         'solver': [solver],
+                         'status': [status],
+                         'run_time': [run_time],
+                         'iter': [niter],
+                         'obj_val': [obj],
+                         'obj_opt': [OPT_COST_MAP[problem]],
+                         'n': [instance.qp_problem["n"]],
+                         'm': [instance.qp_problem["m"]],
+                         'N': [N],
+                         'compile_time': [compile_time],
+                         'solve_time': [solve_time],
+                         'retrieval_time': [retrieval_time],
+                         'recompile_time': [recompile_time]}
+
+        print(" - Solved %s with solver %s (CVXPY)" % (problem, solver),
+              flush=True)
+
+        # Return solution
+        return pd.DataFrame(solution_dict)
@@ -0,0 +1,162 @@
+import os
+import gc
+import time
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from problem_classes.maros_meszaros import MarosMeszaros
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+from utils.general import make_sure_path_exists, timed_optimality_checks
+
+# Smallest Maros Meszaros problems
+SMALL_PROBLEMS = ['HS21', 'HS35', 'HS76', 'QAFIRO', 'GENHS28']
+
+# Percentiles of the latency distributions
+PERCENTILES = [50, 90, 99]
+
+
+class MarosMeszarosLatencyRunner(object):
+    '''
+    Latency runner for tiny problems
+    '''
+    def __init__(self,
+                 solvers,
+                 settings,
+                 output_folder,
+                 problems=SMALL_PROBLEMS,
+                 n_runs=1000,
+                 n_warmup=10):
+        '''
+        Args:
+            solvers: solver names
+            settings: settings dictionary of each solver
+            output_folder: results folder
+            problems: Maros Meszaros problem names
+            n_runs: number of timed solves of each problem
+            n_warmup: number of solves before the timed ones
+        '''
+        self.solvers = solvers
+        self.settings = settings
+        self.output_folder = output_folder
+        self.problems = problems
+        self.n_runs = n_runs
+        self.n_warmup = n_warmup
+
+    def solve(self):
+        '''
+        Solve every problem n_runs times with every solver in this process
+
+        NB. The solves are sequential on purpose: parallel solves would
+        perturb the latencies.
+
+        The samples are stored as
+
+            ./results/{self.output_folder}/{solver}/latency/{problem}.csv
+
+        with the fields (in microseconds)
+            - 'wall_time': time of the call of the solver interface, i.e.,
+              data conversion, setup, solve and extraction of the results,
+              without the optimality check of the benchmark
+            - 'run_time': run time reported by the solver
+            - 'setup_time', 'solve_time': setup and solve time reported by
+              the solver (if available)
+            - 'extraction_time': time from the return of the solver to the
+              return of the interface, without the optimality check (if
+              measured by the solver wrapper)
+            - 'check_time': optimality check of the benchmark
+            - 'overhead': wall_time - run_time, i.e., the time outside of
+              the solver: bindings, data conversion and extraction
+            - 'conversion_time': overhead - extraction_time, i.e., bindings
+              and data conversion
+
+        and the percentiles, means and maxima of each problem in
+
+            ./results/{self.output_folder}/latency.csv
+        '''
+        print("Measuring latency of small Maros Meszaros problems")
+        print("--------------------------------------------------")
+
+        row_list = []
+        for solver in self.solvers:
+            path = os.path.join('.', 'results', self.output_folder, solver,
+                                'latency')
+            make_sure_path_exists(path)
+            for problem in self.problems:
+                df = self.measure_latency(problem, solver)
+                df.to_csv(os.path.join(path, '%s.csv' % problem),
+                          index=False)
+                row_list.append(self.latency_stats(df, problem, solver))
+
+        latency_file = os.path.join('.', 'results', self.output_folder,
+                                    'latency.csv')
+        print("Saving latency statistics to %s" % latency_file)
+        pd.DataFrame(row_list).to_csv(latency_file, index=False)
+
+    def measure_latency(self, problem, solver):
+        '''
+        Solve Maros Meszaros 'problem' n_runs times with 'solver', each time
+        with a new solver object
+
+        Returns:
+            pandas dataframe with one row per timed solve
+        '''
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = MarosMeszaros(full_name)
+        settings = self.settings[solver]
+
+        print(" - Measuring %s with solver %s" % (problem, solver),
+              flush=True)
+
+        for _ in range(self.n_warmup):
+            SOLVER_MAP[solver](settings).solve(instance)
+
+        keys = ['run_time', 'setup_time', 'solve_time', 'extraction_time']
+        samples = np.full((self.n_runs, len(keys) + 2), np.nan)
+        statuses = []
+        gc.collect()
+        for i in range(self.n_runs):
+            with timed_optimality_checks() as check_times:
+                t_start = time.perf_counter_ns()
+                results = SOLVER_MAP[solver](settings).solve(instance)
+                wall_time = time.perf_counter_ns() - t_start
+            check_time = 1e6 * sum(check_times)
+
+            samples[i, 0] = 1e-3 * wall_time - check_time
+            for j, key in enumerate(keys):
+                value = getattr(results, key, None)
+                if value is not None:
+                    samples[i, j + 1] = 1e6 * value
+            samples[i, len(keys)] -= check_time
+            samples[i, len(keys) + 1] = check_time
+            statuses.append(results.status)
+
+        df = pd.DataFrame(samples, columns=['wall_time'] + keys +
+                          ['check_time'])
+        df['overhead'] = df['wall_time'] - df['run_time']
+        df['conversion_time'] = df['overhead'] - df['extraction_time']
+        df['status'] = statuses
+        return df
+
+    @staticmethod
+    def latency_stats(df, problem, solver):
+        '''
+        Percentiles, mean and maximum of the latencies of the samples
+        '''
+        stats = {'name': problem,
+                 'solver': solver,
+                 'failure_rate': 100 * np.mean(
+                     ~df['status'].isin(s.SOLUTION_PRESENT))}
+        for key in ['wall_time', 'run_time', 'setup_time', 'solve_time',
+                    'extraction_time', 'check_time', 'overhead',
+                    'conversion_time']:
+            t = df[key].values
+            if np.all(np.isnan(t)):
+                continue
+            for p in PERCENTILES:
+                stats['%s_p%i' % (key, p)] = np.nanpercentile(t, p)
+            stats['%s_mean' % key] = np.nanmean(t)
+            stats['%s_max' % key] = np.nanmax(t)
+        return stats
@@ -0,0 +1,216 @@
+import os
+import queue
+import time
+from multiprocessing import Queue, Process, cpu_count
+from multiprocessing.pool import ThreadPool
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from problem_classes.maros_meszaros import MarosMeszaros
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+from utils.general import make_sure_path_exists, is_qp_solution_optimal
+
+
+class MarosMeszarosPermutationRunner(object):
+    '''
+    Permutation sensitivity runner
+    '''
+    def __init__(self,
+                 solvers,
+                 settings,
+                 output_folder,
+                 n_permutations=5,
+                 seed=1):
+        '''
+        Args:
+            solvers: solver names
+            settings: settings dictionary of each solver
+            output_folder: results folder
+            n_permutations: number K of random permutations of each problem
+            seed: random seed of the permutations
+        '''
+        self.solvers = solvers
+        self.settings = settings
+        self.output_folder = output_folder
+        self.n_permutations = n_permutations
+        self.seed = seed
+
+        # Get maros problems list
+        problems_dir = os.path.join(".", "problem_classes", PROBLEMS_FOLDER)
+        # List of problems in .mat format
+        lst_probs = [f for f in os.listdir(problems_dir) if \
+            f.endswith('.mat')]
+        self.problems = [f[:-4] for f in lst_probs]   # List of problem names
+
+    def solve(self, parallel=True, cores=32):
+        '''
+        Solve every problem in its original order and with K random row and
+        column permutations
+
+        The results are stored as
+
+            ./results/{self.output_folder}/{solver}/results.csv
+
+        using a pandas table with fields
+            - 'name': Maros problem name
+            - 'solver': solver name
+            - 'permutation': 0 for the original order, 1, ..., K for the
+              permutations
+            - 'status': solver status, SOLVER_ERROR if the solution mapped
+              back to the original problem is not optimal or the solver
+              crashed, TIME_LIMIT if it did not return within the time
+              limit
+            - 'run_time': execution time
+            - 'iter': number of iterations
+            - 'obj_val': objective value from solver
+            - 'n': leading dimension
+            - 'N': nnz dimension (nnz(P) + nnz(A))
+
+        Every solve runs in a separate process that is killed after the
+        time limit of the solver.
+        '''
+        print("Solving permuted Maros Meszaros problems")
+        print("----------------------------------------")
+
+        if parallel:
+            pool = ThreadPool(processes=min(cores, cpu_count()))
+            results = pool.map(self.solve_permutations, self.problems, 1)
+            pool.close()  # Not accepting any more jobs on this pool
+            pool.join()   # Wait for all processes to finish
+        else:
+            results = [self.solve_permutations(problem)
+                       for problem in self.problems]
+
+        df = pd.concat(results)
+        for solver in self.solvers:
+            path = os.path.join('.', 'results', self.output_folder, solver)
+            make_sure_path_exists(path)
+            df.loc[df['solver'] == solver].to_csv(
+                os.path.join(path, 'results.csv'), index=False)
+
+    def solve_permutations(self, problem):
+        '''
+        Solve Maros Meszaros 'problem' and its permutations with all solvers
+
+        The permutations are the same for all solvers.
+
+        Returns:
+            pandas dataframe with one row per solver and permutation
+        '''
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = MarosMeszaros(full_name)
+        n = instance.n
+        n_con = instance.m - instance.n
+        P = instance.qp_problem['P']
+        A = instance.qp_problem['A']
+        N = P.nnz + A.nnz
+
+        # Seeded by problem to be independent of the order of the problems
+        rng = np.random.default_rng([self.seed, sum(map(ord, problem))])
+        examples = [instance]
+        for _ in range(self.n_permutations):
+            examples.append(instance.permute(rng.permutation(n_con),
+                                             rng.permutation(n)))
+
+        results = []
+        for solver in self.solvers:
+            settings = self.settings[solver]
+            print(" - Solving %s with solver %s" % (problem, solver),
+                  flush=True)
+            for permutation, example in enumerate(examples):
+                row = {'name': [problem],
+                       'solver': [solver],
+                       'permutation': [permutation]}
+                row.update(self.solve_example_with_timeout(
+                    instance, example, permutation, solver, settings))
+                row.update({'n': [n], 'N': [N]})
+                results.append(pd.DataFrame(row))
+
+        return pd.concat(results)
+
+    def solve_example_with_timeout(self, instance, example, permutation,
+                                   solver, settings):
+        '''
+        Solve the permutation 'example' of 'instance' with 'solver' in a new
+        process
+
+        A process exceeding the time limit is killed and reported as
+        TIME_LIMIT, a process terminated without results as SOLVER_ERROR.
+
+        Returns:
+            dictionary with the fields 'status', 'run_time', 'iter' and
+            'obj_val'
+        '''
+        q = Queue()
+        p = Process(target=self.solve_example_in_queue,
+                    args=(q, instance, example, permutation, solver,
+                          settings))
+        p.start()
+
+        start_time = time.time()
+        while True:
+            try:
+                result = q.get(timeout=1.0)
+                p.join()
+                return result
+            except queue.Empty:
+                if not p.is_alive():
+                    # The results might have been queued just before
+                    # exiting
+                    try:
+                        result = q.get(timeout=1.0)
+                        p.join()
+                        return result
+                    except queue.Empty:
+                        status = s.SOLVER_ERROR
+                        break
+                elif time.time() - start_time > settings['time_limit'] + 5:
+                    status = s.TIME_LIMIT
+                    break
+
+        if p.is_alive():
+            p.terminate()
+        p.join()
+
+        return {'status': [status],
+                'run_time': [settings['time_limit']],
+                'iter': [0],
+                'obj_val': [np.inf]}
+
+    def solve_example_in_queue(self, queue, instance, example, permutation,
+                               solver, settings):
+        queue.put(self.solve_example(instance, example, permutation, solver,
+                                     settings))
+
+    @staticmethod
+    def solve_example(instance, example, permutation, solver, settings):
+        '''
+        Solve the permutation 'example' of 'instance' with 'solver' and
+        verify the solution mapped back on the original problem
+        '''
+        solver_results = SOLVER_MAP[solver](settings).solve(example)
+        status = solver_results.status
+
+        # Verify the solution on the original problem, with the same check
+        # for the original order and the permutations
+        if status in s.SOLUTION_PRESENT:
+            x, y = solver_results.x, solver_results.y
+            if permutation > 0:
+                x, y = example.unpermute_solution(x, y)
+            if not is_qp_solution_optimal(
+                    instance.qp_problem, x, y,
+                    high_accuracy=settings.get('high_accuracy'),
+                    strict=True):
+                status = s.SOLVER_ERROR
+
+        obj = solver_results.obj_val
+        if obj is not None:
+            obj += instance.qp_problem["r"]
+
+        return {'status': [status],
+                'run_time': [solver_results.run_time],
+                'iter': [solver_results.niter],
+                'obj_val': [obj]}
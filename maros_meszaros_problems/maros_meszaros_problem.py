@@ -1,4 +1,5 @@
 import os
+import queue
 import time
 from multiprocessing import Queue, Pool, Process, cpu_count
 from multiprocessing.pool import ThreadPool
@@ -8,13 +9,27 @@ import pandas as pd
 from solvers.solvers import SOLVER_MAP
 import solvers.statuses as s
 from problem_classes.maros_meszaros import MarosMeszaros
-from utils.general import make_sure_path_exists
-from utils.maros_meszaros import OPT_COST_MAP
+from utils.general import make_sure_path_exists, kkt_residuals, \
+    kkt_scales
+from utils.maros_meszaros import OPT_COST_MAP, load_reference_solution, \
+    reference_errors
 
 import numpy as np
 
 PROBLEMS_FOLDER = "maros_meszaros_data"
 
+# Name of the racing portfolio in the results
+RACE = 'RACE'
+
+
+def race_name(race_solvers):
+    '''
+    Name of the racing portfolio of 'race_solvers' in the results, e.g.,
+    RACE_PIQP-GUROBI-MOSEK, such that results of different race sets are
+    not reused
+    '''
+    return '%s_%s' % (RACE, '-'.join(race_solvers))
+
 
 class MarosMeszarosRunner(object):
     '''
@@ -23,10 +38,24 @@ class MarosMeszarosRunner(object):
     def __init__(self,
                  solvers,
                  settings,
-                 output_folder):
+                 output_folder,
+                 store_solutions=False,
+                 race_solvers=None):
+        '''
+        Args:
+            solvers: solver names
+            settings: settings dictionary of each solver
+            output_folder: results folder
+            store_solutions: store the primal-dual solutions
+            race_solvers: solvers racing each other on every problem,
+                          stored as solver race_name(race_solvers) (see
+                          solve_race)
+        '''
         self.solvers = solvers
         self.settings = settings
         self.output_folder = output_folder
+        self.store_solutions = store_solutions
+        self.race_solvers = race_solvers
 
         # Get maros problems list
         problems_dir = os.path.join(".", "problem_classes", PROBLEMS_FOLDER)
@@ -53,6 +82,25 @@ class MarosMeszarosRunner(object):
             - 'obj_opt': optimal objective value
             - 'n': leading dimension
             - 'N': nnz dimension (nnz(P) + nnz(A))
+            - 'pri_res', 'dua_res', 'gap', 'compl_res': absolute KKT
+              residuals of the returned solution
+            - 'pri_res_rel', 'dua_res_rel', 'gap_rel', 'compl_res_rel':
+              relative KKT residuals of the returned solution
+            - 'x_err', 'y_err', 'obj_err_rel': distance from the reference
+              solution (if computed with run_reference_solutions.py)
+
+        If the solver settings contain 'trace', the convergence traces are
+        stored as
+
+            ./results/{self.output_folder}/{solver}/traces/{problem}.npy
+
+        and the results contain the scales 'pri_scale', 'dua_scale' and
+        'gap_scale' of the residuals at the returned solution.
+
+        If store_solutions is True, the primal-dual solutions x and y are
+        stored as
+
+            ./results/{self.output_folder}/{solver}/solutions/{problem}.npz
         '''
 
         print("Solving Maros Meszaros problems")
@@ -109,6 +157,154 @@ class MarosMeszarosRunner(object):
             pool.close()  # Not accepting any more jobs on this pool
             pool.join()   # Wait for all processes to finish
 
+        # Race the solvers, one problem after another since every race
+        # uses one core per solver
+        if self.race_solvers:
+            path = os.path.join('.', 'results', self.output_folder,
+                                race_name(self.race_solvers))
+            make_sure_path_exists(path)
+            results_file_name = os.path.join(path, 'results.csv')
+            if not os.path.isfile(results_file_name):
+                results = [self.solve_race(problem)
+                           for problem in self.problems]
+                pd.concat(results).to_csv(results_file_name, index=False)
+
+    def solve_race(self, problem):
+        '''
+        Solve Maros Meszaros 'problem' with all race_solvers at the same
+        time, each pinned to its own core if possible. The first result
+        with a solution wins and the other solvers are cancelled, i.e., the
+        solutions are checked as the ones of the single solvers: strictly
+        only if the settings contain 'strict_optimality'.
+
+        Returns:
+            pandas dataframe with the fields of solve_single_example for
+            solver race_name(race_solvers), where
+                - 'run_time': wall time until the winner returned
+                - 'winner': winning solver
+                - 'winner_run_time': run time reported by the winner
+                - 'cpu_time': CPU time used by all the racing solvers
+        '''
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = MarosMeszaros(full_name)
+        P = instance.qp_problem['P']
+        A = instance.qp_problem['A']
+        N = P.nnz + A.nnz
+
+        print(" - Racing %s with solvers %s" %
+              (problem, ', '.join(self.race_solvers)), flush=True)
+
+        time_limit = max(self.settings[solver]['time_limit']
+                         for solver in self.race_solvers)
+
+        # The CPU time of the solvers is accounted once they are joined
+        cpu_start = os.times()
+        q = Queue()
+        processes = []
+        wall_start = time.perf_counter()
+        for i, solver in enumerate(self.race_solvers):
+            p = Process(target=self.solve_race_entry,
+                        args=(q, instance, solver, self.settings[solver], i))
+            p.start()
+            processes.append(p)
+
+        # A racing process which died without putting its entry, e.g., on a
+        # segmentation fault, counts as finished
+        winner = None
+        n_finished = 0
+        while n_finished < len(processes):
+            if time.perf_counter() - wall_start > time_limit + 5:
+                break
+            try:
+                entry = q.get(timeout=0.1)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processes):
+                    # Collect the entries queued just before exiting
+                    try:
+                        entry = q.get(timeout=1.0)
+                    except queue.Empty:
+                        n_finished = len(processes)
+                        break
+                else:
+                    continue
+            n_finished += 1
+            if entry['optimal']:
+                winner = entry
+                break
+        wall_time = time.perf_counter() - wall_start
+
+        # Cancel the other solvers
+        for p in processes:
+            if p.is_alive():
+                p.terminate()
+            p.join()
+        cpu_end = os.times()
+        cpu_time = (cpu_end.children_user - cpu_start.children_user) + \
+            (cpu_end.children_system - cpu_start.children_system)
+
+        if winner is not None:
+            status = winner['status']
+            obj = winner['obj_val'] + instance.qp_problem["r"]
+            winner_solver = winner['solver']
+            winner_run_time = winner['run_time']
+            niter = winner['niter']
+        else:
+            status = s.TIME_LIMIT if n_finished < len(processes) \
+                else s.SOLVER_ERROR
+            wall_time = time_limit if status == s.TIME_LIMIT else wall_time
+            obj = np.inf
+            winner_solver = None
+            winner_run_time = None
+            niter = 0
+
+        print(" - Raced %s, winner %s" % (problem, winner_solver), flush=True)
+
+        return pd.DataFrame({'name': [problem],
+                             'solver': [race_name(self.race_solvers)],
+                             'status': [status],
+                             'run_time': [wall_time],
+                             'iter': [niter],
+                             'obj_val': [obj],
+                             'obj_opt': [OPT_COST_MAP[problem]],
+                             'n': [instance.qp_problem["n"]],
+                             'm': [instance.qp_problem["m"]],
+                             'N': [N],
+                             'winner': [winner_solver],
+                             'winner_run_time': [winner_run_time],
+                             'cpu_time': [cpu_time]})
+
+    @staticmethod
+    def solve_race_entry(queue, instance, solver, settings, core):
+        '''
+        Solve 'instance' with 'solver' in a racing process and put a
+        summary of the result in 'queue'
+        '''
+        if hasattr(os, 'sched_setaffinity'):
+            cores = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, [cores[core % len(cores)]])
+
+        try:
+            # The wrapper checks the solution as for the single solvers
+            results = SOLVER_MAP[solver](settings).solve(instance)
+            optimal = results.status in s.SOLUTION_PRESENT
+        except Exception as e:
+            # E.g., a missing license
+            print("Error in %s race entry: %s" % (solver, e), flush=True)
+            queue.put({'solver': solver,
+                       'status': s.SOLVER_ERROR,
+                       'optimal': False,
+                       'obj_val': None,
+                       'run_time': None,
+                       'niter': None})
+            return
+        queue.put({'solver': solver,
+                   'status': results.status,
+                   'optimal': optimal,
+                   'obj_val': results.obj_val,
+                   'run_time': results.run_time,
+                   'niter': results.niter})
+
     def solve_single_example_with_timeout(self, problem, solver, settings):
         q = Queue()
         p = Process(target=self.solve_single_example_in_queue, args=(q, problem, solver, settings))
@@ -126,26 +322,34 @@ class MarosMeszarosRunner(object):
         if p.is_alive():
             p.terminate()
             p.join()
+            status = s.TIME_LIMIT
+        else:
+            # A crashed process does not put any results
+            try:
+                result = q.get(timeout=5.0)
+                p.join()
+                return result
+            except queue.Empty:
+                p.join()
+                status = s.SOLVER_ERROR
 
-            full_name = os.path.join(".", "problem_classes",
-                                     PROBLEMS_FOLDER, problem)
-            instance = MarosMeszaros(full_name)
-            P = instance.qp_problem['P']
-            A = instance.qp_problem['A']
-            N = P.nnz + A.nnz
-            return pd.DataFrame({'name': [problem],
-                                 'solver': [solver],
-                                 'status': [s.TIME_LIMIT],
-                                 'run_time': [settings['time_limit']],
-                                 'iter': [0],
-                                 'obj_val': [np.inf],
-                                 'obj_opt': [OPT_COST_MAP[problem]],
-                                 #  'obj_dist': [obj_dist],
-                                 'n': [instance.qp_problem["n"]],
-                                 'm': [instance.qp_problem["m"]],
-                                 'N': [N]})
-
-        return q.get()
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = MarosMeszaros(full_name)
+        P = instance.qp_problem['P']
+        A = instance.qp_problem['A']
+        N = P.nnz + A.nnz
+        return pd.DataFrame({'name': [problem],
+                             'solver': [solver],
+                             'status': [status],
+                             'run_time': [settings['time_limit']],
+                             'iter': [0],
+                             'obj_val': [np.inf],
+                             'obj_opt': [OPT_COST_MAP[problem]],
+                             #  'obj_dist': [obj_dist],
+                             'n': [instance.qp_problem["n"]],
+                             'm': [instance.qp_problem["m"]],
+                             'N': [N]})
 
     def solve_single_example_in_queue(self, queue, problem, solver, settings):
         queue.put(self.solve_single_example(problem, solver, settings))
@@ -171,8 +375,8 @@ class MarosMeszarosRunner(object):
         print(" - Solving %s with solver %s" % (problem, solver), flush=True)
 
         # Solve problem
-        s = SOLVER_MAP[solver](settings)
-        results = s.solve(instance)
+        solver_object = SOLVER_MAP[solver](settings)
+        results = solver_object.solve(instance)
 
         # Create solution as pandas table
         P = instance.qp_problem['P']
@@ -209,6 +413,21 @@ class MarosMeszarosRunner(object):
                          'm': [instance.qp_problem["m"]],
                          'N': [N]}
 
+        # Add KKT residuals of the solution
+        if results.x is not None and results.y is not None:
+            residuals = kkt_residuals(instance.qp_problem,
+                                      results.x, results.y)
+            for name, value in residuals.items():
+                solution_dict[name] = [value]
+
+            # Add distance from the reference solution
+            reference = load_reference_solution(problem)
+            if reference is not None:
+                errors = reference_errors(reference, results.x, results.y,
+                                          obj)
+                for name, value in errors.items():
+                    solution_dict[name] = [value]
+
         # Add status polish if OSQP
         if solver[:4] == 'OSQP':
             solution_dict['status_polish'] = results.status_polish
@@ -217,15 +436,44 @@ class MarosMeszarosRunner(object):
             solution_dict['update_time'] = results.update_time
             solution_dict['rho_updates'] = results.rho_updates
         if solver[:4] == 'PIQP':
-            solution_dict['setup_time'] = results.setup_time
-            solution_dict['solve_time'] = results.solve_time
-            solution_dict['update_time'] = results.update_time
+            solution_dict['backend'] = results.backend
+            if results.status != s.MEMORY_LIMIT:
+                solution_dict['setup_time'] = results.setup_time
+                solution_dict['solve_time'] = results.solve_time
+                solution_dict['update_time'] = results.update_time
+        if solver[:4] == 'AUTO':
+            solution_dict['selected_solver'] = \
+                getattr(results, 'selected_solver', None)
         if solver[:6] == 'PROXQP':
             solution_dict['setup_time'] = results.setup_time
             solution_dict['solve_time'] = results.solve_time
         if solver[:3] == 'SCS':
             solution_dict['setup_time'] = results.setup_time
             solution_dict['solve_time'] = results.solve_time
+        if solver[:4] == 'ECOS':
+            solution_dict['factor_time'] = results.factor_time
+
+        # Store convergence trace and the scales of the residuals to
+        # compare the trace with relative tolerances
+        if results.trace is not None:
+            path = os.path.join('.', 'results', self.output_folder,
+                                solver, 'traces')
+            make_sure_path_exists(path)
+            np.save(os.path.join(path, problem + '.npy'), results.trace)
+            if results.x is not None and results.y is not None:
+                scales = kkt_scales(instance.qp_problem,
+                                    results.x, results.y)
+                for name, value in scales.items():
+                    solution_dict[name] = [value]
+
+        # Store primal-dual solution
+        if self.store_solutions and results.x is not None and \
+                results.y is not None:
+            path = os.path.join('.', 'results', self.output_folder,
+                                solver, 'solutions')
+            make_sure_path_exists(path)
+            np.savez_compressed(os.path.join(path, problem + '.npz'),
+                                x=results.x, y=results.y)
 
         print(" - Solved %s with solver %s" % (problem, solver), flush=True)
 
@@ -0,0 +1,204 @@
+import os
+import queue
+import time
+from multiprocessing import Queue, Process, cpu_count
+from multiprocessing.pool import ThreadPool
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP, settings_with_tolerance
+import solvers.statuses as s
+from solvers.results import Results
+from problem_classes.maros_meszaros import MarosMeszaros
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+from utils.general import make_sure_path_exists, kkt_residuals
+from utils.maros_meszaros import REFERENCE_FOLDER
+
+# KKT residuals stored with the reference solutions, see kkt_residuals
+RESIDUALS = ['pri_res', 'pri_res_rel', 'dua_res', 'dua_res_rel',
+             'gap', 'gap_rel', 'compl_res', 'compl_res_rel']
+
+
+class MarosMeszarosReference(object):
+    '''
+    High-accuracy reference solutions of the Maros Meszaros problems
+    '''
+    def __init__(self,
+                 solvers,
+                 eps=1e-10,
+                 overwrite=False):
+        '''
+        Args:
+            solvers: candidate solvers
+            eps: absolute and relative tolerance of the solvers
+            overwrite: recompute existing reference solutions
+        '''
+        self.solvers = solvers
+        self.eps = eps
+        self.overwrite = overwrite
+
+        # Get maros problems list
+        problems_dir = os.path.join(".", "problem_classes", PROBLEMS_FOLDER)
+        # List of problems in .mat format
+        lst_probs = [f for f in os.listdir(problems_dir) if \
+            f.endswith('.mat')]
+        self.problems = [f[:-4] for f in lst_probs]   # List of problem names
+
+    def solve(self, parallel=True, cores=32):
+        '''
+        Compute the reference solutions of all problems
+
+        Every candidate solver solves the problem at tolerance eps and the
+        solution with the smallest KKT residuals is stored as
+
+            {REFERENCE_FOLDER}/{problem}.npz
+
+        with the fields 'x', 'y', 'obj_val', 'solver' and the KKT residuals
+        ('pri_res', 'pri_res_rel', ...). The residuals of all the references
+        are summarized in
+
+            {REFERENCE_FOLDER}/reference_solutions.csv
+
+        Every solve runs in a separate process which is killed after the
+        time limit of the solver. Solvers exceeding it or crashing are not
+        candidates.
+        '''
+        print("Computing Maros Meszaros reference solutions")
+        print("--------------------------------------------")
+
+        make_sure_path_exists(REFERENCE_FOLDER)
+
+        if parallel:
+            pool = ThreadPool(processes=min(cores, cpu_count()))
+            results = pool.map(self.solve_reference, self.problems, 1)
+            pool.close()  # Not accepting any more jobs on this pool
+            pool.join()   # Wait for all processes to finish
+        else:
+            results = [self.solve_reference(problem)
+                       for problem in self.problems]
+
+        df = pd.concat(results)
+        df.to_csv(os.path.join(REFERENCE_FOLDER, 'reference_solutions.csv'),
+                  index=False)
+
+    def solve_reference(self, problem):
+        '''
+        Compute the reference solution of Maros Meszaros 'problem'
+
+        Returns:
+            pandas dataframe with the solver and KKT residuals of the
+            reference solution
+        '''
+        reference_file = os.path.join(REFERENCE_FOLDER, problem + '.npz')
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        if os.path.isfile(reference_file) and not self.overwrite:
+            reference = np.load(reference_file)
+            solution_dict = {'name': [problem],
+                             'solver': [str(reference['solver'])],
+                             'obj_val': [float(reference['obj_val'])]}
+            if 'pri_res' in reference:
+                residuals = {name: float(reference[name])
+                             for name in RESIDUALS}
+            else:
+                # Reference stored without its residuals
+                instance = MarosMeszaros(full_name)
+                residuals = kkt_residuals(instance.qp_problem,
+                                          reference['x'], reference['y'])
+            for name in RESIDUALS:
+                solution_dict[name] = [residuals[name]]
+            return pd.DataFrame(solution_dict)
+
+        instance = MarosMeszaros(full_name)
+
+        best = None
+        for solver in self.solvers:
+            print(" - Solving %s with solver %s" % (problem, solver),
+                  flush=True)
+            solver_settings = settings_with_tolerance(solver, self.eps,
+                                                      self.eps)
+            results = self.solve_with_timeout(instance, solver,
+                                              solver_settings)
+            if results is None or results.status not in s.SOLUTION_PRESENT:
+                continue
+
+            residuals = kkt_residuals(instance.qp_problem,
+                                      results.x, results.y)
+            max_residual = max(residuals['pri_res_rel'],
+                               residuals['dua_res_rel'],
+                               residuals['gap_rel'],
+                               residuals['compl_res_rel'])
+            if best is None or max_residual < best['max_residual']:
+                best = {'solver': solver,
+                        'x': results.x,
+                        'y': results.y,
+                        'obj_val': results.obj_val +
+                        instance.qp_problem['r'],
+                        'residuals': residuals,
+                        'max_residual': max_residual}
+
+        if best is None:
+            print(" - No reference solution for %s" % problem, flush=True)
+            return pd.DataFrame({'name': [problem],
+                                 'solver': [None],
+                                 'obj_val': [np.nan]})
+
+        np.savez_compressed(reference_file,
+                            x=best['x'], y=best['y'],
+                            obj_val=best['obj_val'],
+                            solver=best['solver'],
+                            **best['residuals'])
+
+        solution_dict = {'name': [problem],
+                         'solver': [best['solver']],
+                         'obj_val': [best['obj_val']]}
+        for name, value in best['residuals'].items():
+            solution_dict[name] = [value]
+
+        return pd.DataFrame(solution_dict)
+
+    def solve_with_timeout(self, instance, solver, settings):
+        '''
+        Solve 'instance' with 'solver' in a new process
+
+        Returns:
+            results structure, or None if the process exceeded the time
+            limit or terminated without results
+        '''
+        q = Queue()
+        p = Process(target=self.solve_in_queue,
+                    args=(q, instance, solver, settings))
+        p.start()
+
+        results = None
+        start_time = time.time()
+        while True:
+            try:
+                results = q.get(timeout=1.0)
+                break
+            except queue.Empty:
+                if not p.is_alive():
+                    # The results might have been queued just before
+                    # exiting
+                    try:
+                        results = q.get(timeout=1.0)
+                    except queue.Empty:
+                        print(" - Solver %s crashed" % solver, flush=True)
+                    break
+                elif time.time() - start_time > settings['time_limit'] + 5:
+                    print(" - Solver %s exceeded the time limit" % solver,
+                          flush=True)
+                    break
+
+        if p.is_alive():
+            p.terminate()
+        p.join()
+
+        return results
+
+    @staticmethod
+    def solve_in_queue(queue, instance, solver, settings):
+        results = SOLVER_MAP[solver](settings).solve(instance)
+        # Only the picklable fields of the results
+        queue.put(Results(results.status, results.obj_val, results.x,
+                          results.y, results.run_time, results.niter))
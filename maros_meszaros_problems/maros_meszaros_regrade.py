@@ -0,0 +1,123 @@
+import os
+from multiprocessing import Pool, cpu_count
+import numpy as np
+import pandas as pd
+
+import solvers.statuses as s
+from problem_classes.maros_meszaros import MarosMeszaros
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+from utils.general import make_sure_path_exists, is_qp_solution_optimal
+
+
+class MarosMeszarosRegrader(object):
+    '''
+    Re-evaluate the statuses of stored Maros Meszaros solutions at a
+    different tolerance without calling the solvers
+    '''
+
+    # Statuses of solutions which are regraded. The solver errors include
+    # the solutions which failed the optimality check at the original
+    # tolerance. All other statuses, e.g., time limit, are kept.
+    REGRADED_STATUSES = s.SOLUTION_PRESENT + [s.OPTIMAL_INACCURATE,
+                                              s.SOLVER_ERROR]
+
+    def __init__(self,
+                 solvers,
+                 input_folder,
+                 output_folder,
+                 eps_abs,
+                 eps_rel):
+        '''
+        Args:
+            solvers: solver names
+            input_folder: results folder with the stored solutions, see
+                          MarosMeszarosRunner(store_solutions=True)
+            output_folder: results folder of the regraded results
+            eps_abs: absolute tolerance
+            eps_rel: relative tolerance
+        '''
+        self.solvers = solvers
+        self.input_folder = input_folder
+        self.output_folder = output_folder
+        self.eps_abs = eps_abs
+        self.eps_rel = eps_rel
+
+        self.results = {}
+        for solver in solvers:
+            self.results[solver] = pd.read_csv(
+                os.path.join('.', 'results', input_folder, solver,
+                              'results.csv'))
+        self.problems = list(self.results[solvers[0]]['name'])
+
+    def regrade(self, parallel=True, cores=32):
+        '''
+        Regrade the solutions of all problems
+
+        The results are stored as
+
+            ./results/{self.output_folder}/{solver}/results.csv
+
+        with the fields of the input results, the regraded 'status' and the
+        'original_status'.
+        '''
+        print("Regrading Maros Meszaros solutions")
+        print("----------------------------------")
+
+        if parallel:
+            pool = Pool(processes=min(cores, cpu_count()))
+            results = pool.map(self.regrade_problem, self.problems, 1)
+            pool.close()  # Not accepting any more jobs on this pool
+            pool.join()   # Wait for all processes to finish
+        else:
+            results = [self.regrade_problem(problem)
+                       for problem in self.problems]
+
+        df = pd.concat(results)
+        for solver in self.solvers:
+            path = os.path.join('.', 'results', self.output_folder, solver)
+            make_sure_path_exists(path)
+            df.loc[df['solver'] == solver].to_csv(
+                os.path.join(path, 'results.csv'), index=False)
+
+    def regrade_problem(self, problem):
+        '''
+        Regrade the solutions of Maros Meszaros 'problem' of all solvers
+
+        Returns:
+            pandas dataframe with one row per solver
+        '''
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = MarosMeszaros(full_name)
+
+        print(" - Regrading %s" % problem, flush=True)
+
+        rows = []
+        for solver in self.solvers:
+            df = self.results[solver]
+            row = df.loc[df['name'] == problem].copy()
+            if row.empty:
+                continue
+            status = row['status'].values[0]
+            row['original_status'] = status
+
+            solution_file = os.path.join('.', 'results', self.input_folder,
+                                         solver, 'solutions',
+                                         problem + '.npz')
+            if status in self.REGRADED_STATUSES and \
+                    os.path.isfile(solution_file):
+                solution = np.load(solution_file)
+                if is_qp_solution_optimal(instance.qp_problem,
+                                          solution['x'], solution['y'],
+                                          eps_abs=self.eps_abs,
+                                          eps_rel=self.eps_rel,
+                                          strict=True):
+                    if status not in s.SOLUTION_PRESENT:
+                        status = s.OPTIMAL
+                else:
+                    status = s.SOLVER_ERROR
+                row['status'] = status
+
+            rows.append(row)
+
+        return pd.concat(rows)
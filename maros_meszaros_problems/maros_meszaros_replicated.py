@@ -0,0 +1,194 @@
+import os
+import queue
+import resource
+import signal
+import time
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from problem_classes.replicated_maros_meszaros import ReplicatedMarosMeszaros
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+from utils.general import make_sure_path_exists
+from utils.maros_meszaros import OPT_COST_MAP
+
+
+class MarosMeszarosReplicatedRunner(object):
+    '''
+    Replicated Maros Meszaros problems runner
+    '''
+    def __init__(self,
+                 solvers,
+                 settings,
+                 output_folder,
+                 problems,
+                 factors,
+                 n_linking=0):
+        '''
+        Args:
+            solvers: solver names
+            settings: settings dictionary of each solver
+            output_folder: results folder
+            problems: Maros Meszaros problem names
+            factors: replication factors k
+            n_linking: number of rows linking the copies
+        '''
+        self.solvers = solvers
+        self.settings = settings
+        self.output_folder = output_folder
+        self.problems = problems
+        self.factors = factors
+        self.n_linking = n_linking
+
+    def solve(self):
+        '''
+        Solve the replicated problems
+
+        Every problem is generated and solved in a new process to measure
+        its peak memory. The processes are spawned, not forked, such that
+        their peak memory does not start at the one of the runner. The
+        solves are sequential since parallel solves of large problems
+        would compete for the memory.
+
+        The results are stored as
+
+            ./results/{self.output_folder}/{solver}/results.csv
+
+        using a pandas table with fields
+            - 'name': {problem}_k{k}
+            - 'problem': Maros Meszaros problem name
+            - 'solver': solver name
+            - 'status': solver status
+            - 'run_time': execution time
+            - 'iter': number of iterations
+            - 'obj_val': objective value from solver
+            - 'obj_opt': optimal objective value, k times the one of the
+              original problem
+            - 'dimension': replication factor k
+            - 'base_memory': peak resident memory of the new process before
+              generating the problem, i.e., of the interpreter and the
+              imported modules [MB]
+            - 'problem_memory': peak resident memory of the new process
+              after generating the problem [MB]
+            - 'peak_memory': peak resident memory of the new process after
+              solving [MB]
+            - 'n': number of variables
+            - 'm': number of constraints
+            - 'N': nnz dimension (nnz(P) + nnz(A))
+        '''
+        print("Solving replicated Maros Meszaros problems")
+        print("------------------------------------------")
+
+        for solver in self.solvers:
+            results = []
+            for problem in self.problems:
+                for k in self.factors:
+                    results.append(self.solve_in_process(problem, k, solver))
+
+            path = os.path.join('.', 'results', self.output_folder, solver)
+            make_sure_path_exists(path)
+            pd.concat(results).to_csv(os.path.join(path, 'results.csv'),
+                                      index=False)
+
+    def solve_in_process(self, problem, k, solver):
+        '''
+        Solve the replicated 'problem' in a new process
+
+        The process is killed after the time limit. A process killed
+        without results by SIGKILL, i.e., by the out-of-memory killer,
+        counts as MEMORY_LIMIT and any other process terminated without
+        results, e.g., on an exception, as SOLVER_ERROR.
+        '''
+        settings = self.settings[solver]
+        # A forked process would inherit the peak memory of the runner
+        context = multiprocessing.get_context('spawn')
+        q = context.Queue()
+        p = context.Process(target=self.solve_replicated_in_queue,
+                            args=(q, problem, k, solver, settings))
+        p.start()
+
+        result = None
+        start_time = time.time()
+        while time.time() - start_time < settings['time_limit'] + 5:
+            try:
+                result = q.get(timeout=1.0)
+                break
+            except queue.Empty:
+                if not p.is_alive():
+                    break
+        if result is None:
+            # The results might have been queued just before exiting
+            try:
+                result = q.get(timeout=1.0)
+            except queue.Empty:
+                pass
+
+        if p.is_alive():
+            status = s.TIME_LIMIT
+            p.terminate()
+            p.join()
+        else:
+            p.join()
+            status = s.MEMORY_LIMIT if p.exitcode == -signal.SIGKILL \
+                else s.SOLVER_ERROR
+
+        if result is not None:
+            return result
+
+        return pd.DataFrame({'name': ['%s_k%i' % (problem, k)],
+                             'problem': [problem],
+                             'solver': [solver],
+                             'status': [status],
+                             'run_time': [settings['time_limit']],
+                             'iter': [0],
+                             'obj_val': [np.inf],
+                             'obj_opt': [k * OPT_COST_MAP[problem]],
+                             'dimension': [k]})
+
+    def solve_replicated_in_queue(self, queue, problem, k, solver, settings):
+        queue.put(self.solve_replicated(problem, k, solver, settings))
+
+    def solve_replicated(self, problem, k, solver, settings):
+        '''
+        Solve Maros Meszaros 'problem' replicated k times with 'solver'
+        '''
+        # Peak resident memory in kB on Linux
+        base_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = ReplicatedMarosMeszaros(full_name, k,
+                                           n_linking=self.n_linking)
+        problem_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        print(" - Solving %s (k = %i) with solver %s" % (problem, k, solver),
+              flush=True)
+
+        results = SOLVER_MAP[solver](settings).solve(instance)
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        P = instance.qp_problem['P']
+        A = instance.qp_problem['A']
+        N = P.nnz + A.nnz
+
+        obj = results.obj_val
+        if obj is not None:
+            obj += instance.qp_problem["r"]
+
+        return pd.DataFrame({'name': ['%s_k%i' % (problem, k)],
+                             'problem': [problem],
+                             'solver': [solver],
+                             'status': [results.status],
+                             'run_time': [results.run_time],
+                             'iter': [results.niter],
+                             'obj_val': [obj],
+                             'obj_opt': [k * OPT_COST_MAP[problem]],
+                             'dimension': [k],
+                             'base_memory': [base_memory / 1024.],
+                             'problem_memory': [problem_memory / 1024.],
+                             'peak_memory': [peak_memory / 1024.],
+                             'n': [instance.qp_problem["n"]],
+                             'm': [instance.qp_problem["m"]],
+                             'N': [N]})
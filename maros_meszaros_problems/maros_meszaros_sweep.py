@@ -0,0 +1,191 @@
+import os
+import json
+import hashlib
+import itertools
+import numpy as np
+import pandas as pd
+import scipy.io as spio
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from maros_meszaros_problems.maros_meszaros_problem import \
+    MarosMeszarosRunner, PROBLEMS_FOLDER
+from utils.benchmark import geom_mean, MAX_TIMING
+from utils.general import make_sure_path_exists
+
+
+class MarosMeszarosSweep(object):
+    '''
+    Settings sweep with successive halving over the Maros Meszaros problems
+    '''
+    def __init__(self,
+                 solver,
+                 search_space,
+                 settings,
+                 output_folder,
+                 eta=3,
+                 min_problems=10,
+                 max_problems=None):
+        '''
+        Expand the 'search_space' of 'solver' into settings variants
+
+        Args:
+            solver: name of the solver whose settings are swept
+            search_space: dictionary with a list of values for each setting
+            settings: settings dictionary of all solvers. The variants are
+                      added to it and to SOLVER_MAP
+            output_folder: results folder
+            eta: only the best 1/eta variants are kept after each rung and
+                 the number of problems grows by eta
+            min_problems: number of problems in the first rung
+            max_problems: number of problems in the last rung (None for all)
+        '''
+        self.solver = solver
+        self.search_space = search_space
+        self.settings = settings
+        self.output_folder = output_folder
+        self.eta = eta
+        self.min_problems = min_problems
+
+        # Problems ordered by size such that the first rungs are cheap
+        self.problems = self.problems_by_size()
+        if max_problems is not None:
+            self.problems = self.problems[:max_problems]
+
+        self.variants = self.expand_search_space()
+
+    @staticmethod
+    def problems_by_size():
+        '''
+        Get Maros problem names ordered by nnz(P) + nnz(A)
+        '''
+        problems_dir = os.path.join(".", "problem_classes", PROBLEMS_FOLDER)
+        sizes = {}
+        for f in os.listdir(problems_dir):
+            if f.endswith('.mat'):
+                m = spio.loadmat(os.path.join(problems_dir, f),
+                                 variable_names=['P', 'A'])
+                sizes[f[:-4]] = m['P'].nnz + m['A'].nnz
+        return sorted(sizes, key=lambda p: (sizes[p], p))
+
+    def expand_search_space(self):
+        '''
+        Register every combination of the search space as a solver variant
+
+        The variant names start with the solver name, e.g.,
+        PIQP_sweep_3f2a9c01d7, such that solver specific results are stored
+        by the runner. The suffix is a hash of the settings of the variant:
+        the runner reuses stored results of a variant, which must therefore
+        not be reused with different settings.
+
+        Returns:
+            dictionary with the swept settings of each variant
+        '''
+        keys = sorted(self.search_space)
+        variants = {}
+        for values in itertools.product(
+                *[self.search_space[key] for key in keys]):
+            swept = dict(zip(keys, values))
+            variant_settings = dict(self.settings[self.solver], **swept)
+            digest = hashlib.sha1(json.dumps(variant_settings, sort_keys=True,
+                                             default=str).encode())
+            name = '%s_sweep_%s' % (self.solver, digest.hexdigest()[:10])
+            variants[name] = swept
+            SOLVER_MAP[name] = SOLVER_MAP[self.solver]
+            self.settings[name] = variant_settings
+        return variants
+
+    def solve(self, parallel=True, cores=32):
+        '''
+        Run successive halving
+
+        Rung k solves the next problems of the size ordered list such that
+        in total min_problems * eta^k problems are solved. The results of
+        each rung are stored as
+
+            ./results/{self.output_folder}/rung{k}_{start}-{end}/{variant}/results.csv
+
+        where start and end are the positions of the problems of the rung in
+        the size ordered list, i.e., results of a rung are only reused for
+        the same problems. The variants are ranked on all the problems
+        solved so far.
+
+        Returns:
+            ranking dataframe
+        '''
+        print("Sweeping %s settings over %i variants" %
+              (self.solver, len(self.variants)))
+        print("---------------------------------------")
+
+        alive = list(self.variants)
+        scores = {}
+        rung_folders = []
+        start, end, rung = 0, min(self.min_problems, len(self.problems)), 0
+        while start < len(self.problems):
+            print("Rung %i: %i variants on %i problems" %
+                  (rung, len(alive), end))
+
+            rung_folders.append('rung%i_%i-%i' % (rung, start, end))
+            runner = MarosMeszarosRunner(alive, self.settings,
+                                         os.path.join(self.output_folder,
+                                                      rung_folders[-1]))
+            runner.problems = self.problems[start:end]
+            runner.solve(parallel=parallel, cores=cores)
+
+            for variant in alive:
+                scores[variant] = self.score(variant, rung_folders)
+                scores[variant]['rung'] = rung
+
+            # Keep the best variants
+            alive = sorted(alive, key=lambda v: scores[v]['geom_mean'])
+            alive = alive[:max(1, int(np.ceil(len(alive) / self.eta)))]
+
+            start, end, rung = end, min(end * self.eta,
+                                        len(self.problems)), rung + 1
+
+        return self.rank(scores)
+
+    def score(self, variant, rung_folders):
+        '''
+        Compute the failure rate and shifted geometric mean of 'variant'
+        on the problems of the rungs stored in 'rung_folders'
+        '''
+        df = pd.concat([pd.read_csv(os.path.join('.', 'results',
+                                                 self.output_folder,
+                                                 folder, variant,
+                                                 'results.csv'))
+                        for folder in rung_folders])
+
+        failed = ~df['status'].isin(s.SOLUTION_PRESENT).values
+        t = df['run_time'].values.astype(float)
+        t[failed] = MAX_TIMING
+
+        return {'n_problems': len(df),
+                'failure_rate': 100 * np.mean(failed),
+                'geom_mean': geom_mean(t)}
+
+    def rank(self, scores):
+        '''
+        Rank the variants by the last rung reached and by shifted geometric
+        mean, store the ranking in
+
+            ./results/{self.output_folder}/sweep_ranking.csv
+        '''
+        row_list = []
+        for variant, score in scores.items():
+            row = {'variant': variant}
+            row.update(score)
+            row.update(self.variants[variant])
+            row_list.append(row)
+
+        df = pd.DataFrame(row_list)
+        df = df.sort_values(['rung', 'geom_mean'], ascending=[False, True])
+        df['rank'] = np.arange(1, len(df) + 1)
+
+        path = os.path.join('.', 'results', self.output_folder)
+        make_sure_path_exists(path)
+        ranking_file = os.path.join(path, 'sweep_ranking.csv')
+        print("Saving ranking to %s" % ranking_file)
+        df.to_csv(ranking_file, index=False)
+
+        return df
@@ -0,0 +1,246 @@
+import os
+import queue
+import time
+from multiprocessing import Queue, Process, cpu_count
+from multiprocessing.pool import ThreadPool
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP, settings_with_tolerance
+import solvers.statuses as s
+from problem_classes.maros_meszaros import MarosMeszaros
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+from utils.general import make_sure_path_exists, is_qp_solution_optimal
+from utils.maros_meszaros import OPT_COST_MAP
+
+
+class MarosMeszarosToleranceRunner(object):
+    '''
+    Tolerance ladder runner
+    '''
+
+    # Solvers continuing from the looser solution. PIQP is not one of
+    # them: its update restarts the interior point method from scratch.
+    WARM_START_SOLVERS = ['OSQP', 'PROXQP', 'QPALM', 'SCS']
+
+    def __init__(self,
+                 solvers,
+                 tolerances,
+                 output_folder,
+                 warm_start=True):
+        '''
+        Args:
+            solvers: solver names
+            tolerances: absolute tolerances from the loosest to the tightest.
+                        The relative tolerances are 10 times smaller.
+            output_folder: results folder
+            warm_start: continue from the looser solution if supported
+        '''
+        self.solvers = solvers
+        self.tolerances = sorted(tolerances, reverse=True)
+        self.output_folder = output_folder
+        self.warm_start = warm_start
+
+        # Get maros problems list
+        problems_dir = os.path.join(".", "problem_classes", PROBLEMS_FOLDER)
+        # List of problems in .mat format
+        lst_probs = [f for f in os.listdir(problems_dir) if \
+            f.endswith('.mat')]
+        self.problems = [f[:-4] for f in lst_probs]   # List of problem names
+
+    @staticmethod
+    def tolerance_folder(eps):
+        return 'eps_%.0e' % eps
+
+    def solve(self, parallel=True, cores=32):
+        '''
+        Solve problems with all the tolerances of the ladder
+
+        The results are stored as
+
+            ./results/{self.output_folder}/eps_{eps}/{solver}/results.csv
+
+        with the same fields as the Maros Meszaros runner. For the warm
+        started solvers 'run_time' is the time to reach the tolerance along
+        the ladder, i.e., including the looser solves, and 'step_time' the
+        time of the solve at the tolerance only.
+
+        The ladder of every problem and solver runs in a new process. A
+        step exceeding the time limit is reported as TIME_LIMIT and a
+        crashed process as SOLVER_ERROR, for this and the remaining steps.
+        '''
+        print("Solving Maros Meszaros problems with a tolerance ladder")
+        print("-------------------------------------------------------")
+
+        if parallel:
+            pool = ThreadPool(processes=min(cores, cpu_count()))
+            results = pool.map(self.solve_ladder, self.problems, 1)
+            pool.close()  # Not accepting any more jobs on this pool
+            pool.join()   # Wait for all processes to finish
+        else:
+            results = [self.solve_ladder(problem)
+                       for problem in self.problems]
+
+        df = pd.concat(results)
+        for eps in self.tolerances:
+            for solver in self.solvers:
+                path = os.path.join('.', 'results', self.output_folder,
+                                    self.tolerance_folder(eps), solver)
+                make_sure_path_exists(path)
+                df_solver = df.loc[(df['eps_abs'] == eps) &
+                                   (df['solver'] == solver)]
+                df_solver.to_csv(os.path.join(path, 'results.csv'),
+                                 index=False)
+
+    def solve_ladder(self, problem):
+        '''
+        Solve Maros Meszaros 'problem' with all solvers and tolerances
+
+        The problem is loaded only once.
+
+        Returns:
+            pandas dataframe with one row per solver and tolerance
+        '''
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        instance = MarosMeszaros(full_name)
+
+        results = []
+        for solver in self.solvers:
+            print(" - Solving %s with solver %s" % (problem, solver),
+                  flush=True)
+            results += self.solve_solver_ladder_with_timeout(problem,
+                                                             instance,
+                                                             solver)
+            print(" - Solved %s with solver %s" % (problem, solver),
+                  flush=True)
+
+        return pd.concat(results)
+
+    def solve_solver_ladder_with_timeout(self, problem, instance, solver):
+        '''
+        Solve the ladder of 'solver' in a new process which puts the
+        results of every step in a queue
+
+        Returns:
+            list of pandas dataframes, one per tolerance
+        '''
+        time_limit = settings_with_tolerance(solver, self.tolerances[0],
+                                             self.tolerances[0] / 10.)['time_limit']
+        q = Queue()
+        p = Process(target=self.solve_solver_ladder,
+                    args=(q, problem, instance, solver))
+        p.start()
+
+        results = []
+        status = None
+        for eps in self.tolerances:
+            start_time = time.time()
+            while True:
+                try:
+                    results.append(q.get(timeout=1.0))
+                    break
+                except queue.Empty:
+                    if not p.is_alive():
+                        # The results might have been queued just before
+                        # exiting
+                        try:
+                            results.append(q.get(timeout=1.0))
+                            break
+                        except queue.Empty:
+                            status = s.SOLVER_ERROR
+                            break
+                    if time.time() - start_time > time_limit + 5:
+                        status = s.TIME_LIMIT
+                        break
+            if status is not None:
+                break
+
+        if p.is_alive():
+            p.terminate()
+        p.join()
+
+        # Failed step and remaining ones
+        P = instance.qp_problem['P']
+        A = instance.qp_problem['A']
+        for eps in self.tolerances[len(results):]:
+            results.append(pd.DataFrame({
+                'name': [problem],
+                'solver': [solver],
+                'eps_abs': [eps],
+                'eps_rel': [eps / 10.],
+                'status': [status],
+                'run_time': [time_limit],
+                'step_time': [time_limit],
+                'iter': [0],
+                'obj_val': [np.inf],
+                'obj_opt': [OPT_COST_MAP[problem]],
+                'n': [instance.qp_problem["n"]],
+                'm': [instance.qp_problem["m"]],
+                'N': [P.nnz + A.nnz]}))
+
+        return results
+
+    def solve_solver_ladder(self, queue, problem, instance, solver):
+        '''
+        Solve 'instance' with 'solver' at all tolerances and put the
+        results of every step in 'queue'
+        '''
+        P = instance.qp_problem['P']
+        A = instance.qp_problem['A']
+        N = P.nnz + A.nnz
+
+        warm_start = self.warm_start and \
+            solver.split('_')[0] in self.WARM_START_SOLVERS
+
+        # The solver object keeps a reference to the settings which
+        # are updated along the ladder
+        solver_settings = {}
+        solver_object = SOLVER_MAP[solver](solver_settings)
+        ladder_time = 0.
+        for eps in self.tolerances:
+            solver_settings.update(settings_with_tolerance(solver, eps,
+                                                           eps / 10.))
+            step_results = solver_object.solve(instance,
+                                               warm_start=warm_start)
+            status = step_results.status
+
+            # Check optimality at the tolerance of the step
+            if status in s.SOLUTION_PRESENT and \
+                    not is_qp_solution_optimal(instance.qp_problem,
+                                               step_results.x,
+                                               step_results.y,
+                                               eps_abs=eps,
+                                               eps_rel=eps / 10.,
+                                               strict=True):
+                status = s.SOLVER_ERROR
+
+            step_time = step_results.run_time
+            if warm_start and step_time is not None:
+                ladder_time += step_time
+                run_time = ladder_time
+            else:
+                run_time = step_time
+
+            obj = step_results.obj_val
+            if obj is not None:
+                obj += instance.qp_problem["r"]
+
+            queue.put(pd.DataFrame({
+                'name': [problem],
+                'solver': [solver],
+                'eps_abs': [eps],
+                'eps_rel': [eps / 10.],
+                'status': [status],
+                'run_time': [run_time],
+                'step_time': [step_time],
+                'iter': [step_results.niter],
+                'obj_val': [obj],
+                'obj_opt': [OPT_COST_MAP[problem]],
+                'n': [instance.qp_problem["n"]],
+                'm': [instance.qp_problem["m"]],
+                'N': [N]}))
+
+            # Restart cold after a failure
+            if status not in s.SOLUTION_PRESENT:
+                solver_object = SOLVER_MAP[solver](solver_settings)
@@ -0,0 +1,162 @@
+import os
+import time
+from multiprocessing import Pool, cpu_count
+from itertools import product
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from problem_classes.mpc import MPC
+from utils.general import make_sure_path_exists
+
+# Solve modes along the closed loop
+COLD = 'cold'            # new solver object at every step
+WARM_START = 'warmstart'  # new solver object started from the last solution
+UPDATE = 'update'        # same solver object with updated vectors
+MODES = [COLD, WARM_START, UPDATE]
+
+
+class MPCSimulationRunner(object):
+    '''
+    Closed-loop MPC simulation runner
+    '''
+    def __init__(self,
+                 solvers,
+                 settings,
+                 output_folder,
+                 dimensions,
+                 horizon=10,
+                 n_steps=100,
+                 unstable=False,
+                 seed=1):
+        '''
+        Args:
+            solvers: solver names
+            settings: settings dictionary of each solver
+            output_folder: results folder
+            dimensions: numbers of states of the systems
+            horizon: prediction horizon
+            n_steps: number of closed-loop steps T
+            unstable: simulate open-loop unstable systems
+            seed: random seed of the systems and disturbances
+        '''
+        self.solvers = solvers
+        self.settings = settings
+        self.output_folder = output_folder
+        self.dimensions = dimensions
+        self.horizon = horizon
+        self.n_steps = n_steps
+        self.unstable = unstable
+        self.seed = seed
+
+    def solve(self, parallel=True, cores=32):
+        '''
+        Simulate the closed loops of all systems with all solvers and modes
+
+        The results are stored as
+
+            ./results/{self.output_folder}/{solver} {mode}/n{nx}.csv
+
+        using a pandas table with one row per step and fields
+            - 'step': step of the closed loop
+            - 'name': system name
+            - 'solver': solver name
+            - 'mode': solve mode (COLD, WARM_START or UPDATE)
+            - 'status': solver status
+            - 'run_time': execution time of the step
+            - 'iter': number of iterations
+            - 'obj_val': objective value from solver
+            - 'wall_time': wall clock time since the start of the loop,
+              including the problem updates and the simulation
+            - 'n': number of variables
+            - 'm': number of constraints
+            - 'N': nnz dimension (nnz(P) + nnz(A))
+
+        Solvers without update or warm start interface solve every step
+        from scratch.
+        '''
+        print("Simulating closed-loop MPC")
+        print("--------------------------")
+
+        jobs = list(product(self.solvers, MODES, self.dimensions))
+
+        if parallel:
+            pool = Pool(processes=min(cores, cpu_count()))
+            pool.starmap(self.simulate, jobs, 1)
+            pool.close()  # Not accepting any more jobs on this pool
+            pool.join()   # Wait for all processes to finish
+        else:
+            for solver, mode, nx in jobs:
+                self.simulate(solver, mode, nx)
+
+    def simulate(self, solver, mode, nx):
+        '''
+        Simulate the closed loop of the system with nx states using
+        'solver' in 'mode'
+        '''
+        mpc = MPC(nx, horizon=self.horizon, unstable=self.unstable,
+                  seed=self.seed)
+        name = 'n%i' % nx
+        P = mpc.qp_problem['P']
+        A = mpc.qp_problem['A']
+        N = P.nnz + A.nnz
+        settings = self.settings[solver]
+
+        # Same initial state, references and disturbances for all solvers
+        rng = np.random.default_rng(self.seed)
+        x = rng.uniform(-1., 1., nx)
+        phase = rng.uniform(0., 2 * np.pi, nx)
+        W = 0.01 * rng.standard_normal((self.n_steps, nx))
+
+        print(" - Simulating %s with solver %s (%s)" % (name, solver, mode),
+              flush=True)
+
+        solver_object = SOLVER_MAP[solver](settings)
+        initial_guess = None
+        results = []
+        t_start = time.perf_counter()
+        for step in range(self.n_steps):
+            x_ref = 0.5 * np.sin(2 * np.pi * step / 50. + phase)
+            instance = mpc.get_example(x, x_ref)
+            if mode == COLD:
+                solver_object = SOLVER_MAP[solver](settings)
+            elif mode == WARM_START:
+                solver_object = SOLVER_MAP[solver](settings)
+                instance.initial_guess = initial_guess
+            step_results = solver_object.solve(instance,
+                                               warm_start=(mode == UPDATE))
+
+            if step_results.status in s.SOLUTION_PRESENT:
+                u = step_results.x[mpc.input_index:
+                                   mpc.input_index + mpc.nu]
+                initial_guess = (step_results.x, step_results.y)
+            else:
+                # Apply zero input and restart cold after a failure
+                u = np.zeros(mpc.nu)
+                initial_guess = None
+                solver_object = SOLVER_MAP[solver](settings)
+            x = mpc.Ad.dot(x) + mpc.Bd.dot(u) + W[step]
+
+            results.append(pd.DataFrame({
+                'step': [step],
+                'name': [name],
+                'solver': [solver],
+                'mode': [mode],
+                'status': [step_results.status],
+                'run_time': [step_results.run_time],
+                'iter': [step_results.niter],
+                'obj_val': [step_results.obj_val],
+                'wall_time': [time.perf_counter() - t_start],
+                'n': [mpc.qp_problem['n']],
+                'm': [mpc.qp_problem['m']],
+                'N': [N]}))
+
+        print(" - Simulated %s with solver %s (%s)" % (name, solver, mode),
+              flush=True)
+
+        path = os.path.join('.', 'results', self.output_folder,
+                            '%s %s' % (solver, mode))
+        make_sure_path_exists(path)
+        pd.concat(results).to_csv(os.path.join(path, '%s.csv' % name),
+                                  index=False)
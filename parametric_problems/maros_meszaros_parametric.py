@@ -0,0 +1,303 @@
+import os
+import time
+from multiprocessing import Pipe, Process, cpu_count
+from multiprocessing.pool import ThreadPool
+from itertools import repeat
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from problem_classes.maros_meszaros import MarosMeszaros
+from utils.general import make_sure_path_exists
+
+PROBLEMS_FOLDER = "maros_meszaros_data"
+
+
+class MarosMeszarosParametric(object):
+    '''
+    Sequence of perturbed Maros Meszaros problems
+    '''
+    def __init__(self, problem, n_steps=10, perturbation=1e-03, seed=1):
+        '''
+        Generate the perturbations of the linear cost q and of the
+        bounds l and u of the Maros Meszaros 'problem'
+
+        The perturbations are random walks. Hence, consecutive problems
+        are close to each other as in sequential re-solves.
+        '''
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        self.problem = problem
+        self.example = MarosMeszaros(full_name)
+        self.n_steps = n_steps
+
+        n = self.example.n
+        q = self.example.q
+        q_scale = max(np.linalg.norm(q, np.inf), 1.)
+        x_scale = 1. + np.abs(np.clip(0., self.example.xl, self.example.xu))
+
+        np.random.seed(seed)
+        self.dq = q_scale * perturbation * \
+            np.cumsum(np.random.randn(n_steps, n), axis=0)
+        self.dx = x_scale * perturbation * \
+            np.cumsum(np.random.randn(n_steps, n), axis=0)
+
+        # The first problem of the sequence is the nominal one
+        self.dq[0] = 0.
+        self.dx[0] = 0.
+
+    @staticmethod
+    def name():
+        return 'Maros Meszaros parametric'
+
+    def get_example(self, step):
+        '''
+        Get problem at 'step' of the sequence
+        '''
+        return self.example.perturb(self.dq[step], self.dx[step])
+
+
+class MarosMeszarosParametricRunner(object):
+    '''
+    Parametric examples runner
+    '''
+    def __init__(self,
+                 solvers,
+                 settings,
+                 n_steps=10,
+                 perturbation=1e-03,
+                 seed=1):
+        self.solvers = solvers
+        self.settings = settings
+        self.n_steps = n_steps
+        self.perturbation = perturbation
+        self.seed = seed
+
+        # Get maros problems list
+        problems_dir = os.path.join(".", "problem_classes", PROBLEMS_FOLDER)
+        # List of problems in .mat format
+        lst_probs = [f for f in os.listdir(problems_dir) if \
+            f.endswith('.mat')]
+        self.problems = [f[:-4] for f in lst_probs]   # List of problem names
+
+        # Problem dimensions (filled when solving)
+        self.dimensions = {}
+
+    def solve(self, parallel=True, cores=32):
+        '''
+        Solve the sequences of parametric problems with and without
+        warm starting
+
+        The results are stored as
+
+            ./results/parametric_problems/{solver} {mode}/{problem}/n{n}.csv
+
+        where mode is 'warmstart' or 'no warmstart', using a pandas table
+        with one row per step of the sequence and fields
+            - 'step': step in the sequence
+            - 'name': Maros problem name
+            - 'solver': solver name
+            - 'status': solver status
+            - 'run_time': execution time
+            - 'iter': number of iterations
+            - 'obj_val': objective value from solver
+            - 'n': leading dimension
+            - 'm': number of constraints
+            - 'N': nnz dimension (nnz(P) + nnz(A))
+
+        In warm start mode the solver object is kept across the sequence
+        and only the vectors are updated. Solvers without an update
+        interface are solved from scratch.
+
+        Every sequence runs in a separate process. A step exceeding the
+        time limit of the solver is killed and reported with the remaining
+        steps as TIME_LIMIT, a crash as SOLVER_ERROR.
+        '''
+
+        print("Solving parametric Maros Meszaros problems")
+        print("------------------------------------------")
+
+        if parallel:
+            pool = ThreadPool(processes=min(cores, cpu_count()))
+
+        for solver in self.solvers:
+            settings = self.settings[solver]
+
+            for warm_start in [False, True]:
+                if parallel:
+                    results = pool.starmap(self.solve_parametric_example,
+                                           zip(self.problems,
+                                               repeat(solver),
+                                               repeat(settings),
+                                               repeat(warm_start)), 1)
+                else:
+                    results = []
+                    for problem in self.problems:
+                        results.append(
+                            self.solve_parametric_example(problem,
+                                                          solver,
+                                                          settings,
+                                                          warm_start))
+
+                for problem, n in zip(self.problems, results):
+                    self.dimensions[problem] = [n]
+
+        if parallel:
+            pool.close()  # Not accepting any more jobs on this pool
+            pool.join()   # Wait for all processes to finish
+
+    def solve_parametric_example(self, problem, solver, settings,
+                                 warm_start):
+        '''
+        Solve sequence of parametric Maros Meszaros 'problem' with 'solver'
+
+        Args:
+            problem: Maros problem name
+            solver: solver name
+            settings: settings dictionary for the solver
+            warm_start: warm start the solver along the sequence
+
+        Returns:
+            leading dimension of the problem
+        '''
+        parametric = MarosMeszarosParametric(problem,
+                                             n_steps=self.n_steps,
+                                             perturbation=self.perturbation,
+                                             seed=self.seed)
+        n = parametric.example.n
+
+        # Results file
+        mode = 'warmstart' if warm_start else 'no warmstart'
+        path = os.path.join('.', 'results', 'parametric_problems',
+                            '%s %s' % (solver, mode), problem)
+        make_sure_path_exists(path)
+        results_file_name = os.path.join(path, 'n%i.csv' % n)
+
+        # Check if file name already exists
+        if os.path.isfile(results_file_name):
+            return n
+
+        print(" - Solving %s with solver %s (%s)" % (problem, solver, mode),
+              flush=True)
+
+        results = self.solve_sequence_with_timeout(parametric, solver,
+                                                   settings, warm_start)
+
+        print(" - Solved %s with solver %s (%s)" % (problem, solver, mode),
+              flush=True)
+
+        # Store results
+        df = pd.concat(results)
+        df.to_csv(results_file_name, index=False)
+
+        return n
+
+    def solve_sequence_with_timeout(self, parametric, solver, settings,
+                                    warm_start):
+        '''
+        Solve the sequence 'parametric' in a new process which sends the
+        results of every step through a pipe. Unlike a queue, the pipe
+        sends synchronously, hence the steps solved before a crash are
+        kept.
+
+        Returns:
+            list of pandas dataframes, one per step
+        '''
+        receiver, sender = Pipe(duplex=False)
+        p = Process(target=self.solve_sequence,
+                    args=(sender, parametric, solver, settings, warm_start))
+        p.start()
+        sender.close()
+
+        results = []
+        status = None
+        for step in range(parametric.n_steps):
+            start_time = time.time()
+            while True:
+                try:
+                    if receiver.poll(1.0):
+                        results.append(receiver.recv())
+                        break
+                    # Processes forked meanwhile by other threads might
+                    # hold the pipe open, hence the exit is also checked
+                    if not p.is_alive() and not receiver.poll(1.0):
+                        raise EOFError
+                except EOFError:
+                    # The process exited without sending this step
+                    status = s.SOLVER_ERROR
+                    break
+                if time.time() - start_time > settings['time_limit'] + 5:
+                    status = s.TIME_LIMIT
+                    break
+            if status is not None:
+                break
+
+        if p.is_alive():
+            p.terminate()
+        p.join()
+        receiver.close()
+
+        # Failed step and remaining ones
+        example = parametric.example
+        P = example.qp_problem['P']
+        A = example.qp_problem['A']
+        for step in range(len(results), parametric.n_steps):
+            results.append(pd.DataFrame({
+                'step': [step],
+                'name': [parametric.problem],
+                'solver': [solver],
+                'status': [status],
+                'run_time': [settings['time_limit']],
+                'iter': [0],
+                'obj_val': [np.inf],
+                'n': [example.n],
+                'm': [example.qp_problem["m"]],
+                'N': [P.nnz + A.nnz]}))
+
+        return results
+
+    @staticmethod
+    def solve_sequence(sender, parametric, solver, settings, warm_start):
+        '''
+        Solve the sequence 'parametric' with 'solver' and send the results
+        of every step through the connection 'sender'
+        '''
+        problem = parametric.problem
+        n = parametric.example.n
+        P = parametric.example.qp_problem['P']
+        A = parametric.example.qp_problem['A']
+        N = P.nnz + A.nnz
+
+        # Keep the same solver object along the sequence
+        solver_object = SOLVER_MAP[solver](settings)
+
+        for step in range(parametric.n_steps):
+            instance = parametric.get_example(step)
+            step_results = solver_object.solve(instance,
+                                               warm_start=warm_start)
+
+            obj = step_results.obj_val
+            if obj is not None:
+                obj += instance.qp_problem["r"]
+
+            solution_dict = {'step': [step],
+                             'name': [problem],
+                             'solver': [solver],
+                             'status': [step_results.status],
+                             'run_time': [step_results.run_time],
+                             'iter': [step_results.niter],
+                             'obj_val': [obj],
+                             'n': [n],
+                             'm': [instance.qp_problem["m"]],
+                             'N': [N]}
+
+            for key in ['setup_time', 'solve_time', 'update_time']:
+                if hasattr(step_results, key):
+                    solution_dict[key] = [getattr(step_results, key)]
+
+            sender.send(pd.DataFrame(solution_dict))
+
+            # Restart cold after a failure
+            if step_results.status not in s.SOLUTION_PRESENT:
+                solver_object = SOLVER_MAP[solver](settings)
@@ -0,0 +1,68 @@
+import numpy as np
+import scipy.sparse as spa
+from problem_classes.maros_meszaros import MarosMeszaros
+
+
+class Huber(MarosMeszaros):
+    '''
+    Huber fitting
+    '''
+    def __init__(self, n, m_ratio=100, density=0.15, seed=1,
+                 create_cvxpy_problem=False):
+        '''
+        Generate Huber fitting problem
+
+            minimize    sum_i huber(ad_i' x - bd_i)
+
+        with n features and m = m_ratio * n samples as the QP
+
+            minimize    u' u + 2 1' (r + s)
+            subject to  Ad x - u - r + s = bd
+                        r >= 0, s >= 0
+
+        in the variables (x, u, r, s)
+
+        Args:
+            n: number of features
+            m_ratio: number of samples per feature
+            density: density of the data matrix Ad
+            seed: random seed
+        '''
+        self.P, self.q, self.r, self.A, self.l, self.u, self.n, self.m = \
+            self._generate_huber(n, int(m_ratio * n), density, seed)
+
+        self.qp_problem = self._generate_qp_problem()
+
+        if create_cvxpy_problem:
+            self.cvxpy_problem = self._generate_cvxpy_problem()
+
+    @staticmethod
+    def _generate_huber(n, m, density, seed):
+        rng = np.random.default_rng(seed)
+
+        # Data with 5% outliers
+        Ad = spa.random(m, n, density=density, format='csc',
+                        random_state=rng, data_rvs=rng.standard_normal)
+        x_true = rng.standard_normal(n) / np.sqrt(n)
+        outliers = rng.uniform(size=m) < 0.05
+        noise = np.where(outliers, 10. * rng.standard_normal(m),
+                         0.5 * rng.standard_normal(m))
+        bd = Ad.dot(x_true) + noise
+
+        Im = spa.eye(m)
+        P = spa.block_diag([spa.csc_matrix((n, n)), 2 * Im,
+                            spa.csc_matrix((2 * m, 2 * m))], format='csc')
+        q = np.hstack([np.zeros(n + m), 2 * np.ones(2 * m)])
+        r = 0.
+
+        C = spa.hstack([Ad, -Im, -Im, Im], format='csc')
+        n_var = n + 3 * m
+        xl = np.hstack([-np.inf * np.ones(n + m), np.zeros(2 * m)])
+        A, l, u = Huber._stack_variable_bounds(C, bd, bd, xl,
+                                               np.inf * np.ones(n_var))
+
+        return P, q, r, A, l, u, n_var, A.shape[0]
+
+    @staticmethod
+    def name():
+        return 'Huber'
@@ -0,0 +1,74 @@
+import numpy as np
+import scipy.sparse as spa
+from problem_classes.maros_meszaros import MarosMeszaros
+
+
+class Lasso(MarosMeszaros):
+    '''
+    Lasso regression
+    '''
+    def __init__(self, n, m_ratio=100, density=0.15, seed=1,
+                 create_cvxpy_problem=False):
+        '''
+        Generate Lasso problem
+
+            minimize    || Ad x - bd ||^2 + lambda || x ||_1
+
+        with n features and m = m_ratio * n samples as the QP
+
+            minimize    y' y + lambda 1' t
+            subject to  y = Ad x - bd
+                        -t <= x <= t
+
+        in the variables (x, y, t)
+
+        Args:
+            n: number of features
+            m_ratio: number of samples per feature
+            density: density of the data matrix Ad
+            seed: random seed
+        '''
+        self.P, self.q, self.r, self.A, self.l, self.u, self.n, self.m = \
+            self._generate_lasso(n, int(m_ratio * n), density, seed)
+
+        self.qp_problem = self._generate_qp_problem()
+
+        if create_cvxpy_problem:
+            self.cvxpy_problem = self._generate_cvxpy_problem()
+
+    @staticmethod
+    def _generate_lasso(n, m, density, seed):
+        rng = np.random.default_rng(seed)
+
+        # Data with a sparse true solution
+        Ad = spa.random(m, n, density=density, format='csc',
+                        random_state=rng, data_rvs=rng.standard_normal)
+        x_true = np.where(rng.uniform(size=n) > 0.5,
+                          rng.standard_normal(n) / np.sqrt(n), 0.)
+        bd = Ad.dot(x_true) + rng.standard_normal(m)
+        lambda_max = np.linalg.norm(Ad.T.dot(bd), np.inf)
+        lambda_param = (1. / 5.) * lambda_max
+
+        In = spa.eye(n)
+        Onm = spa.csc_matrix((n, m))
+        P = spa.block_diag([spa.csc_matrix((n, n)), 2 * spa.eye(m),
+                            spa.csc_matrix((n, n))], format='csc')
+        q = np.hstack([np.zeros(n + m), lambda_param * np.ones(n)])
+        r = 0.
+
+        C = spa.vstack([spa.hstack([Ad, -spa.eye(m), spa.csc_matrix((m, n))]),
+                        spa.hstack([In, Onm, -In]),
+                        spa.hstack([In, Onm, In])], format='csc')
+        cl = np.hstack([bd, -np.inf * np.ones(n), np.zeros(n)])
+        cu = np.hstack([bd, np.zeros(n), np.inf * np.ones(n)])
+
+        n_var = 2 * n + m
+        A, l, u = Lasso._stack_variable_bounds(C, cl, cu,
+                                               -np.inf * np.ones(n_var),
+                                               np.inf * np.ones(n_var))
+
+        return P, q, r, A, l, u, n_var, A.shape[0]
+
+    @staticmethod
+    def name():
+        return 'Lasso'
@@ -1,3 +1,4 @@
+import copy
 import numpy as np
 import scipy.sparse as spa
 import scipy.io as spio
@@ -44,6 +45,17 @@ class MarosMeszaros(object):
     def name():
         return 'Maros Meszaros'
 
+    @staticmethod
+    def _stack_variable_bounds(C, cl, cu, xl, xu):
+        '''
+        Stack the constraints cl <= Cx <= cu and the variable bounds
+        xl <= x <= xu as A = vstack([C, I]), l and u
+        '''
+        A = spa.vstack([C, spa.eye(C.shape[1])], format='csc')
+        l = np.hstack([cl, xl])
+        u = np.hstack([cu, xu])
+        return A, l, u
+
     def _generate_qp_problem(self):
         '''
         Generate QP problem
@@ -110,38 +122,201 @@ class MarosMeszaros(object):
 
         return A, b, G, h, eq_rows, ineq_rows_l, ineq_rows_u
 
+    def perturb(self, dq, dx):
+        '''
+        Get a copy of the problem with linear cost q + dq and constraint
+        bounds translated by A * dx
+
+        NB. Translating the bounds moves the feasible set by dx. Hence,
+        feasibility, the sparsity pattern and the equality/inequality
+        structure of the problem are preserved.
+        '''
+        Adx = self.A.dot(dx)
+        return self.update_vectors(self.q + dq, self.l + Adx, self.u + Adx)
+
+    def update_vectors(self, q, l, u):
+        '''
+        Get a copy of the problem with linear cost q and constraint bounds
+        l and u
+
+        NB. The equality rows of the problem must stay equalities and the
+        inequality rows inequalities.
+        '''
+        example = copy.copy(self)
+        example.q = q
+        example.l = l
+        example.u = u
+
+        # Reuse the row partition of the nominal problem
+        n_con = self.m - self.n
+        problem = self.qp_problem.copy()
+        problem['q'] = example.q
+        problem['l'] = example.l
+        problem['u'] = example.u
+        problem['b'] = example.u[:n_con][self.eq_rows]
+        problem['h'] = np.hstack([example.u[:n_con][self.ineq_rows_l],
+                                  -example.l[:n_con][self.ineq_rows_u]])
+        problem['xl'] = example.l[-self.n:]
+        problem['xu'] = example.u[-self.n:]
+        example.b = problem['b']
+        example.h = problem['h']
+        example.xl = problem['xl']
+        example.xu = problem['xu']
+        example.qp_problem = problem
+
+        return example
+
+    def permute(self, row_perm, col_perm):
+        '''
+        Get a copy of the problem with the constraint rows in the order
+        row_perm and the variables in the order col_perm, i.e., with the
+        matrices P[col_perm][:, col_perm] and C[row_perm][:, col_perm]
+
+        NB. The variable bounds stay in the last n rows of A in the order
+        of the variables. The solution of the original problem is
+        recovered with unpermute_solution.
+        '''
+        n_con = self.m - self.n
+        rows = np.hstack([row_perm, n_con + col_perm])
+
+        example = copy.copy(self)
+        example.P = self.P[col_perm][:, col_perm].tocsc()
+        example.q = self.q[col_perm]
+        example.A = self.A[rows][:, col_perm].tocsc()
+        example.l = self.l[rows]
+        example.u = self.u[rows]
+        example.row_perm = rows
+        example.col_perm = col_perm
+        example.qp_problem = example._generate_qp_problem()
+
+        return example
+
+    def unpermute_solution(self, x, y):
+        '''
+        Map the solution of the permuted problem back to the original one
+        '''
+        x_original = np.zeros_like(x)
+        x_original[self.col_perm] = x
+        y_original = np.zeros_like(y)
+        y_original[self.row_perm] = y
+        return x_original, y_original
+
+    def scale(self, row_scale, col_scale, cost_scale):
+        '''
+        Get a copy of the problem in the scaled variables x = D x_s with the
+        constraint rows scaled by E and the objective by c, i.e.,
+
+            minimize    1/2 x_s' (c D P D) x_s + c (D q)' x_s + c r
+            subject to  E l <= E C D x_s <= E u
+                        D^-1 xl <= x_s <= D^-1 xu
+
+        with D = diag(col_scale), E = diag(row_scale) and c = cost_scale
+        (all positive). The solution of the original problem is recovered
+        with unscale_solution.
+        '''
+        n_con = self.m - self.n
+        D = spa.diags(col_scale)
+        C = spa.csr_matrix(self.A[:n_con].multiply(row_scale[:, None]))
+        bound_scale = np.hstack([row_scale, 1. / col_scale])
+
+        example = copy.copy(self)
+        example.P = (cost_scale * D.dot(self.P).dot(D)).tocsc()
+        example.q = cost_scale * col_scale * self.q
+        example.r = cost_scale * self.r
+        example.A = spa.vstack([C.dot(D), spa.eye(self.n)], format='csc')
+        example.l = bound_scale * self.l
+        example.u = bound_scale * self.u
+        example.row_scale = row_scale
+        example.col_scale = col_scale
+        example.cost_scale = cost_scale
+        example.qp_problem = example._generate_qp_problem()
+
+        return example
+
+    def unscale_solution(self, x, y):
+        '''
+        Map the solution of the scaled problem back to the original one
+        '''
+        n_con = self.m - self.n
+        x_original = self.col_scale * x
+        y_original = np.hstack([self.row_scale * y[:n_con],
+                                y[n_con:] / self.col_scale]) / self.cost_scale
+        return x_original, y_original
+
     def _generate_cvxpy_problem(self):
         '''
         Generate QP problem
+
+        The vectors are cvxpy parameters (DPP). Hence, after changing their
+        values the problem is recompiled reusing the cached
+        canonicalization. Only the finite variable bounds are included.
         '''
         x_var = cvxpy.Variable(self.n)
-        objective = .5 * cvxpy.quad_form(x_var, self.P) + self.q * x_var + \
-            self.r
-        # constraints = [self.A * x_var <= self.u, self.A * x_var >= self.l]
-        constraints = [self.A_eq * x_var == self.b,
-                       self.G * x_var <= self.h,
-                       x_var <= self.xu, x_var >= self.xl]
+        self.xu_finite = np.flatnonzero(self.xu < np.inf)
+        self.xl_finite = np.flatnonzero(self.xl > -np.inf)
+
+        self.cvxpy_param = {'q': cvxpy.Parameter(self.n),
+                            'b': cvxpy.Parameter(self.b.shape[0]),
+                            'h': cvxpy.Parameter(self.h.shape[0]),
+                            'xu': cvxpy.Parameter(len(self.xu_finite)),
+                            'xl': cvxpy.Parameter(len(self.xl_finite))}
+        self.set_cvxpy_parameters()
+
+        objective = .5 * cvxpy.quad_form(x_var, self.P, assume_PSD=True) + \
+            self.cvxpy_param['q'] @ x_var + self.r
+
+        # Keep track of the constraints since empty ones are skipped
+        param = self.cvxpy_param
+        self.cvxpy_constraints = {}
+        if param['b'].size > 0:
+            self.cvxpy_constraints['b'] = self.A_eq @ x_var == param['b']
+        if param['h'].size > 0:
+            self.cvxpy_constraints['h'] = self.G @ x_var <= param['h']
+        if param['xu'].size > 0:
+            self.cvxpy_constraints['xu'] = \
+                x_var[self.xu_finite] <= param['xu']
+        if param['xl'].size > 0:
+            self.cvxpy_constraints['xl'] = \
+                x_var[self.xl_finite] >= param['xl']
+        constraints = list(self.cvxpy_constraints.values())
         problem = cvxpy.Problem(cvxpy.Minimize(objective), constraints)
 
         return problem
 
+    def set_cvxpy_parameters(self):
+        '''
+        Set values of the cvxpy parameters from the problem vectors
+        '''
+        self.cvxpy_param['q'].value = self.q
+        self.cvxpy_param['b'].value = self.b
+        self.cvxpy_param['h'].value = self.h
+        self.cvxpy_param['xu'].value = self.xu[self.xu_finite]
+        self.cvxpy_param['xl'].value = self.xl[self.xl_finite]
+
     def revert_cvxpy_solution(self):
         '''
         Get QP primal and duar variables from cvxpy solution
         '''
 
         variables = self.cvxpy_problem.variables()
-        constraints = self.cvxpy_problem.constraints
+        constraints = self.cvxpy_constraints
 
         # primal solution
         x = variables[0].value
 
         # dual solution
-        # y = constraints[0].dual_value - constraints[1].dual_value
         y = np.zeros(self.m)
-        y[self.eq_rows] = constraints[0].dual_value
-        y[self.ineq_rows_l] = constraints[1].dual_value[:self.ineq_rows_l.shape[0]]
-        y[self.ineq_rows_u] -= constraints[1].dual_value[self.ineq_rows_l.shape[0]:]
-        y[-self.n:] = constraints[2].dual_value - constraints[3].dual_value
+        if 'b' in constraints:
+            y[self.eq_rows] = constraints['b'].dual_value
+        if 'h' in constraints:
+            y_ineq = constraints['h'].dual_value
+            y[self.ineq_rows_l] = y_ineq[:self.ineq_rows_l.shape[0]]
+            y[self.ineq_rows_u] -= y_ineq[self.ineq_rows_l.shape[0]:]
+        y_bounds = np.zeros(self.n)
+        if 'xu' in constraints:
+            y_bounds[self.xu_finite] += constraints['xu'].dual_value
+        if 'xl' in constraints:
+            y_bounds[self.xl_finite] -= constraints['xl'].dual_value
+        y[-self.n:] = y_bounds
 
         return x, y
@@ -0,0 +1,350 @@
+import numpy as np
+import scipy.sparse as spa
+from scipy.special import comb
+from problem_classes.maros_meszaros import MarosMeszaros
+
+# Families of scalable Maros Meszaros problems
+CVXQP1 = 'CVXQP1'
+CVXQP2 = 'CVXQP2'
+CVXQP3 = 'CVXQP3'
+LISWET = 'LISWET'
+AUG2D = 'AUG2D'
+AUG2DC = 'AUG2DC'
+AUG3D = 'AUG3D'
+AUG3DC = 'AUG3DC'
+AUG2DQP = 'AUG2DQP'
+AUG2DCQP = 'AUG2DCQP'
+AUG3DQP = 'AUG3DQP'
+AUG3DCQP = 'AUG3DCQP'
+CONT = 'CONT'
+FAMILIES = [CVXQP1, CVXQP2, CVXQP3, LISWET, AUG2D, AUG2DC, AUG3D, AUG3DC,
+            AUG2DQP, AUG2DCQP, AUG3DQP, AUG3DCQP, CONT]
+
+# Shipped instances: (family, size, variant)
+SHIPPED_SIZES = {
+    'CVXQP1_S': (CVXQP1, 100, 1), 'CVXQP1_M': (CVXQP1, 1000, 1),
+    'CVXQP1_L': (CVXQP1, 10000, 1),
+    'CVXQP2_S': (CVXQP2, 100, 1), 'CVXQP2_M': (CVXQP2, 1000, 1),
+    'CVXQP2_L': (CVXQP2, 10000, 1),
+    'CVXQP3_S': (CVXQP3, 100, 1), 'CVXQP3_M': (CVXQP3, 1000, 1),
+    'CVXQP3_L': (CVXQP3, 10000, 1),
+    'AUG2D': (AUG2D, 100, 1), 'AUG2DC': (AUG2DC, 100, 1),
+    'AUG3D': (AUG3D, 10, 1), 'AUG3DC': (AUG3DC, 10, 1),
+    'AUG2DQP': (AUG2DQP, 100, 1), 'AUG2DCQP': (AUG2DCQP, 100, 1),
+    'AUG3DQP': (AUG3DQP, 10, 1), 'AUG3DCQP': (AUG3DCQP, 10, 1),
+    'CONT-050': (CONT, 50, 1), 'CONT-100': (CONT, 100, 1),
+    'CONT-200': (CONT, 200, 1)}
+SHIPPED_SIZES.update({'LISWET%i' % variant: (LISWET, 10000, variant)
+                      for variant in range(1, 13)})
+
+# The data of the shipped instances is stored with 6 significant digits
+CHECK_TOL = 1e-05
+
+
+class MarosMeszarosFamily(MarosMeszaros):
+    '''
+    Scalable Maros Meszaros family
+    '''
+    def __init__(self, size, family=CVXQP1, variant=1, seed=1,
+                 create_cvxpy_problem=False):
+        '''
+        Generate the problem of 'family' with discretization 'size'
+
+            - CVXQP1, CVXQP2, CVXQP3: size variables (S = 100, M = 1000,
+              L = 10000)
+            - LISWET: size data points fitted by a convex function, i.e.,
+              nonnegative second differences. The variant (1 to 12)
+              selects the function of the data.
+            - AUG2D, AUG2DC: expanded formulation of the Laplace equation
+              on a grid with size x size nodes, one flow variable per edge
+              and boundary node
+            - AUG3D, AUG3DC: same on a size x size x size grid
+            - AUG2DQP, AUG2DCQP, AUG3DQP, AUG3DCQP: same with nonnegative
+              flows
+            - CONT: boundary control of the Laplace equation on a
+              (size + 1) x (size + 1) grid (CONT-050, CONT-100, CONT-200)
+
+        The families follow the CUTEst definitions and reproduce the shipped
+        instances, see compare_with_shipped. CONT-300, CONT-101 and
+        CONT-201 are different formulations and are not generated.
+
+        The seed is not used, the families are deterministic.
+        '''
+        self.family = family
+        self.size = size
+
+        generators = {CVXQP1: self._generate_cvxqp,
+                      CVXQP2: self._generate_cvxqp,
+                      CVXQP3: self._generate_cvxqp,
+                      LISWET: self._generate_liswet,
+                      AUG2D: self._generate_aug,
+                      AUG2DC: self._generate_aug,
+                      AUG3D: self._generate_aug,
+                      AUG3DC: self._generate_aug,
+                      AUG2DQP: self._generate_aug,
+                      AUG2DCQP: self._generate_aug,
+                      AUG3DQP: self._generate_aug,
+                      AUG3DCQP: self._generate_aug,
+                      CONT: self._generate_cont}
+        if family not in generators:
+            raise ValueError('Unknown Maros Meszaros family %s' % family)
+        P, q, r, C, cl, cu, xl, xu = generators[family](size, family,
+                                                         variant)
+        A, l, u = self._stack_variable_bounds(C, cl, cu, xl, xu)
+        self.P, self.q, self.r, self.A, self.l, self.u = P, q, r, A, l, u
+        self.n, self.m = A.shape[1], A.shape[0]
+
+        self.qp_problem = self._generate_qp_problem()
+
+        if create_cvxpy_problem:
+            self.cvxpy_problem = self._generate_cvxpy_problem()
+
+    @staticmethod
+    def _generate_cvxqp(n, family, variant):
+        '''
+        minimize    sum_i i / 2 (x_i + x_{mod(2i-1,n)+1} + x_{mod(3i-1,n)+1})^2
+        subject to  x_i + 2 x_{mod(4i-1,n)+1} + 3 x_{mod(5i-1,n)+1} = 6,
+                    i = 1, ..., m
+                    0.1 <= x <= 10
+
+        with m = n / 2 (CVXQP1), n / 4 (CVXQP2) or 3 n / 4 (CVXQP3)
+        '''
+        m = {CVXQP1: n // 2, CVXQP2: n // 4, CVXQP3: 3 * n // 4}[family]
+
+        # Zero-based indices of the elements
+        i = np.arange(1, n + 1)
+        E = np.stack([i - 1, np.mod(2 * i - 1, n), np.mod(3 * i - 1, n)])
+        rows = np.repeat(E, 3, axis=0).ravel()
+        cols = np.tile(E, (3, 1)).ravel()
+        data = np.tile(i.astype(float), 9)
+        P = spa.csc_matrix((data, (rows, cols)), shape=(n, n))
+
+        j = np.arange(1, m + 1)
+        cols = np.hstack([j - 1, np.mod(4 * j - 1, n), np.mod(5 * j - 1, n)])
+        rows = np.tile(np.arange(m), 3)
+        data = np.repeat([1., 2., 3.], m)
+        C = spa.csc_matrix((data, (rows, cols)), shape=(m, n))
+
+        return P, np.zeros(n), 0., C, 6. * np.ones(m), 6. * np.ones(m), \
+            0.1 * np.ones(n), 10. * np.ones(n)
+
+    @staticmethod
+    def _generate_liswet(N, family, variant, K=2):
+        '''
+        minimize    1 / 2 || x - c ||^2
+        subject to  sum_j (-1)^j binom(K, j) x_{i+j} >= 0, i = 1, ..., N
+
+        with N + K points t_i = (i - 1) / (N + K - 1) and data
+        c_i = f(t_i) + 0.1 sin(i). The variant selects the function f as in
+        CUTEst: sqrt(t), t, t^2, t^3, exp(t), exp(-t), sin(pi t),
+        sin(2 pi t), sin(4 pi t), cos(pi t), cos(2 pi t), cos(4 pi t).
+        '''
+        n = N + K
+        i = np.arange(1, n + 1)
+        t = (i - 1.) / (n - 1.)
+        functions = [np.sqrt, lambda t: t, lambda t: t ** 2,
+                     lambda t: t ** 3, np.exp, lambda t: np.exp(-t),
+                     lambda t: np.sin(np.pi * t),
+                     lambda t: np.sin(2. * np.pi * t),
+                     lambda t: np.sin(4. * np.pi * t),
+                     lambda t: np.cos(np.pi * t),
+                     lambda t: np.cos(2. * np.pi * t),
+                     lambda t: np.cos(4. * np.pi * t)]
+        c = functions[variant - 1](t) + 0.1 * np.sin(i)
+
+        C = spa.diags([(-1.) ** j * comb(K, j) * np.ones(N)
+                       for j in range(K + 1)],
+                      list(range(K + 1)), shape=(N, n), format='csc')
+
+        return spa.eye(n, format='csc'), -c, 0.5 * c.dot(c), C, \
+            np.zeros(N), np.inf * np.ones(N), \
+            -np.inf * np.ones(n), np.inf * np.ones(n)
+
+    @staticmethod
+    def _grid_nodes(N, dim, fixed, size):
+        '''
+        Indices of the nodes of the grid with N nodes in each dimension
+        whose coordinates along the axes in 'fixed' are the given values
+        and whose other coordinates run through 0, ..., size - 1, the
+        first coordinate being the fastest
+        '''
+        free = [axis for axis in range(dim) if axis not in fixed]
+        grids = np.meshgrid(*[np.arange(size)] * len(free), indexing='ij')
+        nodes = sum(value * N ** axis for axis, value in fixed.items())
+        for axis, grid in zip(reversed(free), grids):
+            nodes = nodes + grid.ravel() * N ** axis
+        return nodes
+
+    @staticmethod
+    def _generate_aug(N, family, variant):
+        '''
+        minimize    1 / 2 sum_e w_e (x_e - 1)^2
+        subject to  D x = 1
+
+        where x are the flows along the edges of a grid with N nodes in
+        each dimension, plus one (2D) or two (3D) boundary flows per
+        boundary node and face, and D is the divergence at the nodes.
+        The weights w are 1 on the edges and 0 (AUG2D, AUG3D) or
+        1 (AUG2DC, AUG3DC) on the boundary flows. The variables are
+        ordered as in CUTEst.
+
+        The QP variants have the bounds x >= 0, except x >= 1 on the edges
+        leaving the nodes of the last layers, i.e., the edge blocks after
+        the first one. As in CUTEst, AUG2DCQP only bounds the first of
+        these blocks by 1.
+        '''
+        bounded = family in [AUG2DQP, AUG2DCQP, AUG3DQP, AUG3DCQP]
+        dim = 2 if family in [AUG2D, AUG2DC, AUG2DQP, AUG2DCQP] else 3
+        M = N - 1
+        if dim == 2:
+            # (fixed coordinates, axes of the edges leaving the nodes)
+            edge_blocks = [({}, [0, 1]), ({1: M}, [0]), ({0: M}, [1])]
+            boundary_axes = [1, 0]
+        else:
+            edge_blocks = [({}, [0, 1, 2]), ({0: M}, [1, 2]),
+                           ({1: M}, [0, 2]), ({2: M}, [0, 1])]
+            boundary_axes = [0, 1, 2]
+
+        tails = []
+        heads = []
+        block_ends = []
+        for fixed, axes in edge_blocks:
+            nodes = MarosMeszarosFamily._grid_nodes(N, dim, fixed, M)
+            tails.append(np.repeat(nodes, len(axes)))
+            heads.append((nodes[:, None] +
+                          N ** np.array(axes)[None, :]).ravel())
+            block_ends.append(sum(len(t) for t in tails))
+        tails = np.hstack(tails)
+        heads = np.hstack(heads)
+        n_edges = tails.shape[0]
+
+        boundary = []
+        for axis in boundary_axes:
+            faces = [MarosMeszarosFamily._grid_nodes(N, dim, {axis: value},
+                                                     N)
+                     for value in [0, M]]
+            boundary.append(np.repeat(np.stack(faces, axis=1), dim - 1,
+                                      axis=1).ravel())
+        boundary = np.hstack(boundary)
+        n = n_edges + boundary.shape[0]
+
+        rows = np.hstack([tails, heads, boundary])
+        cols = np.hstack([np.arange(n_edges), np.arange(n_edges),
+                          np.arange(n_edges, n)])
+        data = np.hstack([np.ones(n_edges), -np.ones(n_edges),
+                          np.ones(n - n_edges)])
+        C = spa.csc_matrix((data, (rows, cols)), shape=(N ** dim, n))
+
+        weights = np.ones(n)
+        if family in [AUG2D, AUG3D, AUG2DQP, AUG3DQP]:
+            weights[n_edges:] = 0.
+        P = spa.diags(weights, format='csc')
+        P.eliminate_zeros()
+
+        if bounded:
+            xl = np.zeros(n)
+            last = block_ends[1] if family == AUG2DCQP else n_edges
+            xl[block_ends[0]:last] = 1.
+        else:
+            xl = -np.inf * np.ones(n)
+
+        return P, -weights, 0.5 * np.sum(weights), C, \
+            np.ones(N ** dim), np.ones(N ** dim), xl, np.inf * np.ones(n)
+
+    @staticmethod
+    def _generate_cont(N, family, variant):
+        '''
+        minimize    1 / 2 h^2 sum_interior y^2 - h^2 sum_interior y_d y +
+                    1 / 2 alpha h sum_boundary u^2
+        subject to  4 y_ij - sum of the 4 neighbours = 20 h^2 at the
+                    interior points
+                    0 <= y <= 3.5, 0 <= u <= 10
+
+        on the (N + 1) x (N + 1) grid without the corners with h = 1 / N,
+        alpha = 0.01 and y_d = 3 + 5 x1 (x1 - 1) x2 (x2 - 1). The constant
+        1 / 2 h^2 sum y_d^2 is dropped as in the shipped instances. The
+        interior states come first, then the controls u on the left,
+        bottom, right and (reversed) top boundaries.
+        '''
+        h = 1. / N
+        alpha = 1e-02
+        M = N - 1
+        k = np.arange(M)
+
+        # Variable index of the grid points
+        grid = np.full((N + 1, N + 1), -1)
+        I, J = np.meshgrid(np.arange(1, N), np.arange(1, N), indexing='xy')
+        I = I.ravel()
+        J = J.ravel()
+        m = I.shape[0]
+        grid[I, J] = np.arange(m)
+        grid[0, 1 + k] = m + k
+        grid[1 + k, 0] = m + M + k
+        grid[N, 1 + k] = m + 2 * M + k
+        grid[M - k, N] = m + 3 * M + k
+        n = m + 4 * M
+
+        # Laplace equation at the interior points
+        rows = np.tile(np.arange(m), 5)
+        cols = np.hstack([grid[I, J], grid[I - 1, J], grid[I + 1, J],
+                          grid[I, J - 1], grid[I, J + 1]])
+        data = np.repeat([4., -1., -1., -1., -1.], m)
+        C = spa.csc_matrix((data, (rows, cols)), shape=(m, n))
+
+        # Target state
+        x1 = I * h
+        x2 = J * h
+        y_d = 3. + 5. * x1 * (x1 - 1.) * x2 * (x2 - 1.)
+        P = spa.diags(np.hstack([h ** 2 * np.ones(m),
+                                 alpha * h * np.ones(4 * M)]), format='csc')
+        q = np.hstack([-h ** 2 * y_d, np.zeros(4 * M)])
+
+        xl = np.zeros(n)
+        xu = np.hstack([3.5 * np.ones(m), 10. * np.ones(4 * M)])
+
+        return P, q, 0., C, 20. * h ** 2 * np.ones(m), \
+            20. * h ** 2 * np.ones(m), xl, xu
+
+    @staticmethod
+    def name():
+        return 'Maros Meszaros families'
+
+
+def compare_with_shipped(shipped, file_name):
+    '''
+    Compare the generated problem with the shipped instance 'shipped'
+
+    Returns:
+        dictionary with the dimensions of both problems and the maximum
+        absolute differences of the matrices and vectors if the dimensions
+        match
+    '''
+    family, size, variant = SHIPPED_SIZES[shipped]
+    generated = MarosMeszarosFamily(size, family=family, variant=variant)
+    reference = MarosMeszaros(file_name)
+
+    comparison = {'name': shipped, 'family': family, 'size': size}
+    for key, value in [('n', lambda p: p.n), ('m', lambda p: p.m),
+                       ('nnz_P', lambda p: p.P.nnz),
+                       ('nnz_A', lambda p: p.A.nnz)]:
+        comparison[key] = value(reference)
+        comparison[key + '_generated'] = value(generated)
+
+    if generated.n == reference.n and generated.m == reference.m:
+        for key in ['P', 'A']:
+            comparison[key + '_diff'] = abs(getattr(generated, key) -
+                                            getattr(reference, key)).max()
+        for key in ['q', 'l', 'u']:
+            g = getattr(generated, key)
+            r = getattr(reference, key)
+            finite = np.isfinite(g) | np.isfinite(r)
+            comparison[key + '_diff'] = np.max(np.abs(g[finite] - r[finite]),
+                                               initial=0.) \
+                if np.all(np.isfinite(g[finite]) == np.isfinite(r[finite])) \
+                else np.inf
+        comparison['match'] = all(comparison[key + '_diff'] < CHECK_TOL
+                                  for key in ['P', 'A', 'q', 'l', 'u'])
+    else:
+        comparison['match'] = False
+
+    return comparison
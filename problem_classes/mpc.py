@@ -0,0 +1,105 @@
+import numpy as np
+import scipy.sparse as spa
+from problem_classes.maros_meszaros import MarosMeszaros
+
+
+class MPC(MarosMeszaros):
+    '''
+    Model predictive control
+    '''
+    def __init__(self, nx, nu_ratio=0.5, horizon=10, unstable=False,
+                 seed=1, create_cvxpy_problem=False):
+        '''
+        Generate MPC problem of a random linear system
+        x_{k+1} = Ad x_k + Bd u_k
+
+            minimize    sum_{k=0}^{N-1} (x_k - x_ref)' Q (x_k - x_ref) +
+                                        u_k' R u_k +
+                        (x_N - x_ref)' Q (x_N - x_ref)
+            subject to  x_{k+1} = Ad x_k + Bd u_k
+                        x_0 = x_init
+                        x_min <= x_k <= x_max
+                        u_min <= u_k <= u_max
+
+        in the variables (x_0, ..., x_N, u_0, ..., u_{N-1}). The nominal
+        problem has x_init = x_ref = 0, see get_example for other values.
+
+        Args:
+            nx: number of states
+            nu_ratio: number of inputs per state
+            horizon: prediction horizon N
+            unstable: spectral radius of Ad 1.05 instead of 0.95
+            seed: random seed
+        '''
+        nu = max(int(round(nu_ratio * nx)), 1)
+        self.nx = nx
+        self.nu = nu
+        self.horizon = horizon
+
+        rng = np.random.default_rng(seed)
+        Ad = rng.standard_normal((nx, nx))
+        rho = 1.05 if unstable else 0.95
+        self.Ad = Ad * rho / np.max(np.abs(np.linalg.eigvals(Ad)))
+        self.Bd = rng.standard_normal((nx, nu)) / np.sqrt(nu)
+        self.Q = spa.diags(rng.uniform(0., 10., nx))
+        self.R = 0.1 * spa.eye(nu)
+        self.x_max = 10. * np.ones(nx)
+        self.u_max = np.ones(nu)
+
+        # Index of the first input in the variables
+        self.input_index = (horizon + 1) * nx
+
+        self.P, self.q, self.r, self.A, self.l, self.u, self.n, self.m = \
+            self._generate_mpc()
+
+        self.qp_problem = self._generate_qp_problem()
+
+        if create_cvxpy_problem:
+            self.cvxpy_problem = self._generate_cvxpy_problem()
+
+    def _generate_mpc(self):
+        nx, nu, N = self.nx, self.nu, self.horizon
+
+        P = 2 * spa.block_diag([spa.kron(spa.eye(N + 1), self.Q),
+                                spa.kron(spa.eye(N), self.R)], format='csc')
+        q, l, u = self._vectors(np.zeros(nx), np.zeros(nx))
+        r = 0.
+
+        # Dynamics
+        Ax = spa.kron(spa.eye(N + 1), -spa.eye(nx)) + \
+            spa.kron(spa.eye(N + 1, k=-1), spa.csc_matrix(self.Ad))
+        Bu = spa.kron(spa.vstack([spa.csc_matrix((1, N)), spa.eye(N)]),
+                      spa.csc_matrix(self.Bd))
+        C = spa.hstack([Ax, Bu], format='csc')
+
+        A, _, _ = self._stack_variable_bounds(C, l[:C.shape[0]],
+                                              u[:C.shape[0]],
+                                              l[C.shape[0]:],
+                                              u[C.shape[0]:])
+
+        return P, q, r, A, l, u, A.shape[1], A.shape[0]
+
+    def _vectors(self, x_init, x_ref):
+        '''
+        Linear cost and bounds for the initial state x_init and the
+        reference x_ref
+        '''
+        nx, nu, N = self.nx, self.nu, self.horizon
+        q = np.hstack([np.kron(np.ones(N + 1), -2 * self.Q.dot(x_ref)),
+                       np.zeros(N * nu)])
+        b = np.hstack([-x_init, np.zeros(N * nx)])
+        xl = np.hstack([np.kron(np.ones(N + 1), -self.x_max),
+                        np.kron(np.ones(N), -self.u_max)])
+        xu = np.hstack([np.kron(np.ones(N + 1), self.x_max),
+                        np.kron(np.ones(N), self.u_max)])
+        return q, np.hstack([b, xl]), np.hstack([b, xu])
+
+    def get_example(self, x_init, x_ref):
+        '''
+        Get problem for the initial state x_init and the reference x_ref
+        '''
+        return self.update_vectors(*self._vectors(x_init, x_ref))
+
+    @staticmethod
+    def name():
+        return 'MPC'
@@ -0,0 +1,93 @@
+import numpy as np
+import scipy.sparse as spa
+from problem_classes.maros_meszaros import MarosMeszaros
+
+# Formulations of the covariance
+DENSE = 'dense'
+SPARSE = 'sparse'
+
+
+class Portfolio(MarosMeszaros):
+    '''
+    Portfolio optimization
+    '''
+    def __init__(self, n, factor_ratio=0.1, density=0.5, gamma=1.,
+                 formulation=SPARSE, seed=1, create_cvxpy_problem=False):
+        '''
+        Generate portfolio optimization problem with factor model
+        covariance Sigma = F F' + D
+
+            minimize    x' Sigma x - 1 / gamma mu' x
+            subject to  1' x = 1
+                        0 <= x <= 1
+
+        The formulation DENSE uses the dense matrix Sigma. The formulation
+        SPARSE lifts the factor exposures y = F' x, i.e.,
+
+            minimize    x' D x + y' y - 1 / gamma mu' x
+            subject to  y = F' x
+                        1' x = 1
+                        0 <= x <= 1
+
+        in the variables (x, y). Both formulations have the same factor
+        model for the same seed.
+
+        Args:
+            n: number of assets
+            factor_ratio: number of factors per asset
+            density: density of the factor loading matrix F
+            gamma: risk aversion parameter
+            formulation: DENSE or SPARSE
+            seed: random seed
+        '''
+        self.formulation = formulation
+        k = max(int(round(factor_ratio * n)), 1)
+        self.P, self.q, self.r, self.A, self.l, self.u, self.n, self.m = \
+            self._generate_portfolio(n, k, density, gamma, formulation,
+                                     seed)
+
+        self.qp_problem = self._generate_qp_problem()
+
+        if create_cvxpy_problem:
+            self.cvxpy_problem = self._generate_cvxpy_problem()
+
+    @staticmethod
+    def _generate_portfolio(n, k, density, gamma, formulation, seed):
+        rng = np.random.default_rng(seed)
+
+        # Factor model
+        F = spa.random(n, k, density=density, format='csc',
+                       random_state=rng, data_rvs=rng.standard_normal)
+        D = spa.diags(rng.uniform(0., np.sqrt(k), n))
+        mu = rng.standard_normal(n)
+        r = 0.
+
+        if formulation == DENSE:
+            P = spa.csc_matrix(2 * (F.dot(F.T).toarray() + D.toarray()))
+            q = -mu / gamma
+            C = spa.csc_matrix(np.ones((1, n)))
+            cl = np.ones(1)
+            cu = np.ones(1)
+            xl = np.zeros(n)
+            xu = np.ones(n)
+        elif formulation == SPARSE:
+            P = spa.block_diag([2 * D, 2 * spa.eye(k)], format='csc')
+            q = np.hstack([-mu / gamma, np.zeros(k)])
+            C = spa.vstack([spa.hstack([F.T, -spa.eye(k)]),
+                            spa.hstack([spa.csc_matrix(np.ones((1, n))),
+                                        spa.csc_matrix((1, k))])],
+                           format='csc')
+            cl = np.hstack([np.zeros(k), 1.])
+            cu = np.hstack([np.zeros(k), 1.])
+            xl = np.hstack([np.zeros(n), -np.inf * np.ones(k)])
+            xu = np.hstack([np.ones(n), np.inf * np.ones(k)])
+        else:
+            raise ValueError('Unknown portfolio formulation %s' % formulation)
+
+        A, l, u = Portfolio._stack_variable_bounds(C, cl, cu, xl, xu)
+
+        return P, q, r, A, l, u, A.shape[1], A.shape[0]
+
+    @staticmethod
+    def name():
+        return 'Portfolio'
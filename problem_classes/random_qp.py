@@ -0,0 +1,110 @@
+import numpy as np
+import scipy.sparse as spa
+import scipy.sparse.linalg as sla
+from problem_classes.maros_meszaros import MarosMeszaros
+
+
+class RandomQP(MarosMeszaros):
+    '''
+    Random sparse QP
+    '''
+    def __init__(self, n, m=None, m_ratio=1., density=0.01,
+                 condition_number=1e2, eq_fraction=0.2, seed=1,
+                 create_cvxpy_problem=False):
+        '''
+        Generate random QP in the format of the Maros Meszaros problems,
+        i.e., with the variable bounds in the last n rows of A
+
+        Args:
+            n: number of variables
+            m: number of constraints (without the variable bounds),
+               m_ratio * n if None
+            m_ratio: number of constraints per variable
+            density: density of the constraint matrix and approximate
+                     density of the off-diagonal part of P. Every row of
+                     the constraint matrix has at least one nonzero.
+            condition_number: condition number of P (n >= 2)
+            eq_fraction: fraction of equality constraints
+            seed: random seed
+
+        The problem is feasible and P is positive definite. The same
+        arguments always generate the same problem.
+        '''
+        if m is None:
+            m = max(int(round(m_ratio * n)), 1)
+
+        self.P, self.q, self.r, self.A, self.l, self.u, self.n, self.m = \
+            self._generate_random_qp(n, m, density, condition_number,
+                                     eq_fraction, seed)
+
+        self.qp_problem = self._generate_qp_problem()
+
+        if create_cvxpy_problem:
+            self.cvxpy_problem = self._generate_cvxpy_problem()
+
+    @staticmethod
+    def _sparse_random(m, n, density, rng):
+        '''
+        Sparse random matrix with standard normal entries and at least one
+        nonzero per row
+        '''
+        M = spa.random(m, n, density=density, format='coo',
+                       random_state=rng, data_rvs=rng.standard_normal)
+        # One more entry per row, summed with duplicate entries
+        rows = np.hstack([M.row, np.arange(m)])
+        cols = np.hstack([M.col, rng.integers(0, n, m)])
+        data = np.hstack([M.data, rng.standard_normal(m)])
+        return spa.csc_matrix((data, (rows, cols)), shape=(m, n))
+
+    @staticmethod
+    def _generate_random_qp(n, m, density, condition_number, eq_fraction,
+                            seed):
+        rng = np.random.default_rng(seed)
+
+        # P = M M' + sigma I where M has n / 2 columns, i.e., M M' is
+        # singular, and about density * n^2 nonzeros. Its eigenvalues lie
+        # in [0, lambda_max], hence the shift sigma = lambda_max / (cond - 1)
+        # gives the condition number exactly.
+        r = n // 2
+        M = spa.random(n, r, density=min(np.sqrt(density / max(r, 1)), 1.),
+                       format='csc', random_state=rng,
+                       data_rvs=rng.standard_normal)
+        G = M.dot(M.T).tocsc()
+        if n <= 100:
+            lambda_max = np.linalg.eigvalsh(G.toarray())[-1]
+        else:
+            lambda_max = sla.eigsh(G, k=1, which='LA', v0=np.ones(n),
+                                   return_eigenvectors=False)[0]
+        if lambda_max > 0:
+            sigma = lambda_max / (condition_number - 1.)
+        else:
+            sigma = 1.
+        P = (G + sigma * spa.eye(n)).tocsc()
+        q = rng.standard_normal(n)
+        r = 0.
+
+        # Constraints feasible at x0
+        C = RandomQP._sparse_random(m, n, density, rng)
+        x0 = rng.standard_normal(n)
+        z = C.dot(x0)
+        cl = z - rng.uniform(0., 1., m)
+        cu = z + rng.uniform(0., 1., m)
+        rows = rng.permutation(m)
+        n_eq = int(round(eq_fraction * m))
+        cl[rows[:n_eq]] = z[rows[:n_eq]]
+        cu[rows[:n_eq]] = z[rows[:n_eq]]
+        # Half of the inequalities are one-sided
+        one_sided = rows[n_eq:][rng.uniform(size=m - n_eq) < 0.5]
+        cl[one_sided] = -np.inf
+
+        # Variable bounds around x0
+        xl = x0 - rng.uniform(1., 2., n)
+        xu = x0 + rng.uniform(1., 2., n)
+
+        A, l, u = RandomQP._stack_variable_bounds(C, cl, cu, xl, xu)
+
+        return P, q, r, A, l, u, n, m + n
+
+    @staticmethod
+    def name():
+        return 'Random QP'
@@ -0,0 +1,90 @@
+import numpy as np
+import scipy.sparse as spa
+from problem_classes.maros_meszaros import MarosMeszaros
+
+
+class ReplicatedMarosMeszaros(MarosMeszaros):
+    '''
+    Block-diagonal replication of a Maros Meszaros problem
+    '''
+    def __init__(self, file_name, k, n_linking=0, seed=1,
+                 create_cvxpy_problem=False):
+        '''
+        Generate the problem with k independent copies of the Maros
+        Meszaros problem in 'file_name' and n_linking sparse rows linking
+        the copies
+
+        Every linking row is the sum of two inequality rows of different
+        copies with the sum of their upper bounds. Hence, it is implied by
+        the other constraints and the optimal objective is k times the one
+        of the original problem.
+
+        NB. The matrices are assembled directly in compressed format
+        without dense or COO temporaries.
+        '''
+        P, q, r, A, l, u, n, m = self._load_maros_meszaros_problem(file_name)
+        self.k = k
+
+        self.P, self.q, self.r, self.A, self.l, self.u, self.n, self.m = \
+            self._replicate(P, q, r, A, l, u, n, k, n_linking, seed)
+
+        self.qp_problem = self._generate_qp_problem()
+
+        if create_cvxpy_problem:
+            self.cvxpy_problem = self._generate_cvxpy_problem()
+
+    @staticmethod
+    def _block_diagonal(M, k):
+        '''
+        Block-diagonal matrix with k copies of the CSC or CSR matrix M
+        '''
+        major, minor = (M.shape[1], M.shape[0]) if M.format == 'csc' \
+            else (M.shape[0], M.shape[1])
+        index_dtype = np.int64 if k * max(M.nnz, minor) >= 2 ** 31 \
+            else np.int32
+        copies = np.arange(k, dtype=index_dtype)
+        indices = (M.indices.astype(index_dtype)[None, :] +
+                   copies[:, None] * minor).ravel()
+        indptr = np.hstack([(M.indptr[:-1].astype(index_dtype)[None, :] +
+                             copies[:, None] * M.nnz).ravel(),
+                            index_dtype(k * M.nnz)])
+        data = np.tile(M.data, k)
+        return type(M)((data, indices, indptr),
+                       shape=(k * M.shape[0], k * M.shape[1]))
+
+    @staticmethod
+    def _replicate(P, q, r, A, l, u, n, k, n_linking, seed):
+        rng = np.random.default_rng(seed)
+
+        # A == vstack([C, spa.eye(n)])
+        C = A[:-n].tocsr()
+        cl = l[:-n]
+        cu = u[:-n]
+        m_c = C.shape[0]
+
+        C_k = ReplicatedMarosMeszaros._block_diagonal(C, k)
+        cl_k = np.tile(cl, k)
+        cu_k = np.tile(cu, k)
+
+        # Linking rows from inequality rows with finite upper bound
+        candidates = np.flatnonzero((cu - cl >= 1e-10) & (cu < 9e19))
+        if k > 1 and n_linking > 0 and candidates.shape[0] > 0:
+            rows = rng.choice(candidates, (n_linking, 2))
+            first = rng.integers(0, k, n_linking)
+            second = (first + rng.integers(1, k, n_linking)) % k
+            L = C_k[rows[:, 0] + first * m_c] + C_k[rows[:, 1] + second * m_c]
+            C_k = spa.vstack([C_k, L], format='csr')
+            cl_k = np.hstack([cl_k, -np.inf * np.ones(n_linking)])
+            cu_k = np.hstack([cu_k, cu[rows[:, 0]] + cu[rows[:, 1]]])
+
+        P_k = ReplicatedMarosMeszaros._block_diagonal(P.tocsc(), k)
+        A_k = spa.vstack([C_k, spa.eye(k * n, format='csr')],
+                         format='csr').tocsc()
+        l_k = np.hstack([cl_k, np.tile(l[-n:], k)])
+        u_k = np.hstack([cu_k, np.tile(u[-n:], k)])
+
+        return P_k, np.tile(q, k), k * r, A_k, l_k, u_k, k * n, A_k.shape[0]
+
+    @staticmethod
+    def name():
+        return 'Replicated Maros Meszaros'
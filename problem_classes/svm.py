@@ -0,0 +1,72 @@
+import numpy as np
+import scipy.sparse as spa
+from problem_classes.maros_meszaros import MarosMeszaros
+
+
+class SVM(MarosMeszaros):
+    '''
+    Support vector machine
+    '''
+    def __init__(self, n, m_ratio=100, density=0.15, seed=1,
+                 create_cvxpy_problem=False):
+        '''
+        Generate SVM problem
+
+            minimize    x' x + lambda sum_i max(0, bd_i ad_i' x + 1)
+
+        with n features and m = m_ratio * n samples as the QP
+
+            minimize    x' x + lambda 1' t
+            subject to  t >= diag(bd) Ad x + 1
+                        t >= 0
+
+        in the variables (x, t)
+
+        Args:
+            n: number of features
+            m_ratio: number of samples per feature
+            density: density of the data matrix Ad
+            seed: random seed
+        '''
+        self.P, self.q, self.r, self.A, self.l, self.u, self.n, self.m = \
+            self._generate_svm(n, int(m_ratio * n), density, seed)
+
+        self.qp_problem = self._generate_qp_problem()
+
+        if create_cvxpy_problem:
+            self.cvxpy_problem = self._generate_cvxpy_problem()
+
+    @staticmethod
+    def _generate_svm(n, m, density, seed):
+        rng = np.random.default_rng(seed)
+
+        # Two classes with shifted means
+        m_upper = m // 2
+        m_lower = m - m_upper
+        bd = np.hstack([np.ones(m_upper), -np.ones(m_lower)])
+        A_upper = spa.random(m_upper, n, density=density, format='csr',
+                             random_state=rng,
+                             data_rvs=lambda k: rng.normal(1. / n, 1. / n, k))
+        A_lower = spa.random(m_lower, n, density=density, format='csr',
+                             random_state=rng,
+                             data_rvs=lambda k: rng.normal(-1. / n, 1. / n, k))
+        Ad = spa.vstack([A_upper, A_lower], format='csc')
+        lambda_param = 1.
+
+        P = spa.block_diag([2 * spa.eye(n), spa.csc_matrix((m, m))],
+                           format='csc')
+        q = np.hstack([np.zeros(n), lambda_param * np.ones(m)])
+        r = 0.
+
+        C = spa.hstack([spa.diags(bd).dot(Ad), -spa.eye(m)], format='csc')
+        n_var = n + m
+        xl = np.hstack([-np.inf * np.ones(n), np.zeros(m)])
+        A, l, u = SVM._stack_variable_bounds(C, -np.inf * np.ones(m),
+                                             -np.ones(m), xl,
+                                             np.inf * np.ones(n_var))
+
+        return P, q, r, A, l, u, n_var, A.shape[0]
+
+    @staticmethod
+    def name():
+        return 'SVM'
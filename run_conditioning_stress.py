@@ -0,0 +1,64 @@
+from maros_meszaros_problems.maros_meszaros_conditioning import MarosMeszarosConditioningRunner
+import solvers.solvers as s
+from utils.benchmark import compute_conditioning_degradation
+import argparse
+
+
+def main():
+    '''
+    Run Maros-Meszaros problems with increasingly badly scaled rows,
+    columns and objective
+
+    The scaling factors 10^(t U(-1/2, 1/2)) add s decades to the
+    coefficient range of each problem at the stress level s. The solutions
+    are mapped back and verified on the original problems.
+    '''
+    parser = argparse.ArgumentParser(description='Scaling stress Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--levels', help='Stress levels, i.e., decades added to the coefficient ranges', nargs='+',
+                        default=[0, 2, 4, 6, 8], type=int)
+    parser.add_argument('--seed', help='Random seed of the scaling factors',
+                        default=1, type=int)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+    print('levels', args.levels)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        OUTPUT_FOLDER = 'maros_meszaros_problems_conditioning_high_accuracy'
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        OUTPUT_FOLDER = 'maros_meszaros_problems_conditioning'
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    conditioning_runner = MarosMeszarosConditioningRunner(solvers,
+                                                          s.settings,
+                                                          OUTPUT_FOLDER,
+                                                          levels=args.levels,
+                                                          seed=args.seed)
+
+    conditioning_runner.solve(parallel=parallel, cores=8)
+
+    # Compute results statistics
+    compute_conditioning_degradation(solvers, OUTPUT_FOLDER, args.levels)
+
+
+if __name__ == '__main__':
+    main()
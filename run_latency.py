@@ -0,0 +1,50 @@
+from maros_meszaros_problems.maros_meszaros_latency import MarosMeszarosLatencyRunner, SMALL_PROBLEMS
+import solvers.solvers as s
+import argparse
+
+
+def main():
+    '''
+    Measure the per-call latency of the solvers on the smallest
+    Maros-Meszaros problems
+
+    Every problem is solved thousands of times in the same process. The
+    wall time of the call is compared with the run time reported by the
+    solver to show the overhead of the interfaces.
+    '''
+    parser = argparse.ArgumentParser(description='Latency Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--problems', help='Maros Meszaros problems', nargs='+',
+                        default=SMALL_PROBLEMS)
+    parser.add_argument('--runs', help='Number of timed solves of each problem',
+                        default=1000, type=int)
+    parser.add_argument('--warmup', help='Number of solves before the timed ones',
+                        default=10, type=int)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+
+    print('high_accuracy', high_accuracy)
+    print('runs', args.runs)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        OUTPUT_FOLDER = 'maros_meszaros_problems_latency_high_accuracy'
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        OUTPUT_FOLDER = 'maros_meszaros_problems_latency'
+
+    latency_runner = MarosMeszarosLatencyRunner(solvers,
+                                                s.settings,
+                                                OUTPUT_FOLDER,
+                                                problems=args.problems,
+                                                n_runs=args.runs,
+                                                n_warmup=args.warmup)
+
+    latency_runner.solve()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+from scaling_problems.scaling_problem import ScalingRunner
+from problem_classes.maros_meszaros_families import MarosMeszarosFamily, \
+    FAMILIES, SHIPPED_SIZES, compare_with_shipped
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+import solvers.solvers as s
+from utils.general import gen_int_log_space, make_sure_path_exists
+from utils.benchmark import compute_stats_info, compute_scaling_curves, \
+    compute_complexity_fits
+import argparse
+import os
+import pandas as pd
+
+# Default ranges of the discretization sizes
+SIZE_RANGES = {'CVXQP1': (100, 20000), 'CVXQP2': (100, 20000),
+               'CVXQP3': (100, 20000), 'LISWET': (100, 50000),
+               'AUG2D': (10, 300), 'AUG2DC': (10, 300),
+               'AUG3D': (5, 40), 'AUG3DC': (5, 40),
+               'AUG2DQP': (10, 300), 'AUG2DCQP': (10, 300),
+               'AUG3DQP': (5, 40), 'AUG3DCQP': (5, 40),
+               'CONT': (10, 400)}
+
+
+def check_families():
+    '''
+    Compare the generators with the shipped instances of the families
+    '''
+    row_list = []
+    for shipped in sorted(SHIPPED_SIZES):
+        print(" - Comparing %s" % shipped, flush=True)
+        row_list.append(compare_with_shipped(
+            shipped, os.path.join(".", "problem_classes", PROBLEMS_FOLDER,
+                                  shipped)))
+
+    path = os.path.join('.', 'results', 'maros_meszaros_families')
+    make_sure_path_exists(path)
+    check_file = os.path.join(path, 'check.csv')
+    print("Saving comparison to %s" % check_file)
+    pd.DataFrame(row_list).to_csv(check_file, index=False)
+
+
+def main():
+    '''
+    Run the scalable Maros-Meszaros families (CVXQP, LISWET, AUG2D/AUG3D
+    and CONT) at arbitrary sizes and fit the empirical complexity of the
+    solvers
+    '''
+    parser = argparse.ArgumentParser(description='Maros Meszaros families Runner')
+    parser.add_argument('--families', help='Problem families', nargs='+',
+                        default=FAMILIES, choices=FAMILIES)
+    parser.add_argument('--check', help='Compare the generators with the shipped instances',
+                        default=False, action='store_true')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--n_dimensions', help='Number of sizes of each family',
+                        default=10, type=int)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+
+    if args.check:
+        check_families()
+        return
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    for family in args.families:
+        OUTPUT_FOLDER = os.path.join('maros_meszaros_families',
+                                     family.lower())
+        if high_accuracy:
+            OUTPUT_FOLDER += '_high_accuracy'
+
+        size_min, size_max = SIZE_RANGES[family]
+        dimensions = gen_int_log_space(size_min, size_max - size_min + 1,
+                                       args.n_dimensions)
+
+        # The families are deterministic: one instance per size
+        runner = ScalingRunner(solvers,
+                               s.settings,
+                               OUTPUT_FOLDER,
+                               MarosMeszarosFamily,
+                               dimensions,
+                               n_instances=1,
+                               problem_args={'family': family})
+
+        runner.solve(parallel=parallel, cores=8)
+
+        # Compute results statistics
+        compute_stats_info(solvers, OUTPUT_FOLDER,
+                           high_accuracy=high_accuracy,
+                           solve_iters=False)
+        compute_scaling_curves(solvers, OUTPUT_FOLDER)
+        compute_complexity_fits(solvers, OUTPUT_FOLDER)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,11 @@
-from maros_meszaros_problems.maros_meszaros_problem import MarosMeszarosRunner
+from maros_meszaros_problems.maros_meszaros_problem import MarosMeszarosRunner, race_name
+from maros_meszaros_problems.maros_meszaros_cvxpy_problem import MarosMeszarosCVXPYRunner
 import solvers.solvers as s
-from utils.benchmark import compute_stats_info
+from solvers.piqp import PIQPSolver
+from utils.benchmark import compute_stats_info, fit_piqp_backend_crossover, \
+    load_piqp_backend_crossover, compute_cvxpy_overhead, compute_time_to_tolerance
 import argparse
+import numpy as np
 
 def main():
     '''
@@ -23,14 +27,42 @@ def main():
                         action='store_true')
     parser.add_argument('--parallel', help='Parallel solution', default=False,
                         action='store_true')
+    parser.add_argument('--piqp_backends', help='Compare the PIQP backends', default=False,
+                        action='store_true')
+    parser.add_argument('--piqp_crossover', help='Results folder of a fitted PIQP backend crossover used by PIQP_auto',
+                        default=None)
+    parser.add_argument('--cvxpy', help='Solve through CVXPY', default=False,
+                        action='store_true')
+    parser.add_argument('--trace', help='Record per-iteration convergence traces',
+                        default=False, action='store_true')
+    parser.add_argument('--store_solutions', help='Store the primal-dual solutions',
+                        default=False, action='store_true')
+    parser.add_argument('--race', help='Race solvers on every problem (default PIQP GUROBI MOSEK)',
+                        nargs='*', default=None)
+    parser.add_argument('--strict_optimality', help='Fail solutions violating the KKT conditions',
+                        default=False, action='store_true')
     args = parser.parse_args()
     high_accuracy = args.high_accuracy
     verbose = args.verbose
     parallel = args.parallel
+    piqp_backends = args.piqp_backends
+    piqp_crossover = args.piqp_crossover
+    cvxpy = args.cvxpy
+    trace = args.trace
+    strict_optimality = args.strict_optimality
+    store_solutions = args.store_solutions
+    race_solvers = args.race
 
     print('high_accuracy', high_accuracy)
     print('verbose', verbose)
     print('parallel', parallel)
+    print('piqp_backends', piqp_backends)
+    print('piqp_crossover', piqp_crossover)
+    print('cvxpy', cvxpy)
+    print('trace', trace)
+    print('strict_optimality', strict_optimality)
+    print('store_solutions', store_solutions)
+    print('race', race_solvers)
 
     # Add high accuracy solvers when accuracy
     if high_accuracy:
@@ -44,25 +76,107 @@ def main():
         # solvers = [s.PIQP, s.OSQP, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
         OUTPUT_FOLDER = 'maros_meszaros_problems'
 
+    # The fitted crossover is evaluated in the comparison of the backends
+    if piqp_crossover is not None:
+        piqp_backends = True
+
+    # Compare the dense and sparse backends and KKT solvers of PIQP
+    if piqp_backends:
+        name_high = '_high' if high_accuracy else ''
+        backends = []
+        for key, backend_settings in s.PIQP_BACKENDS.items():
+            if PIQPSolver.kkt_solver_available(
+                    backend_settings['backend'],
+                    backend_settings.get('kkt_solver')):
+                backends.append(key + name_high)
+            else:
+                print('Skipping %s: PIQP KKT solver %s is not available'
+                      % (key, backend_settings.get('kkt_solver')))
+        solvers = [s.PIQP + name_high] + backends
+        OUTPUT_FOLDER += '_piqp_backends'
+
+    # Dispatch PIQP_auto with a fitted crossover instead of the untuned
+    # default one
+    if piqp_crossover is not None:
+        crossover = load_piqp_backend_crossover(piqp_crossover)
+        if crossover is None:
+            raise ValueError('No PIQP backend crossover fitted in %s'
+                             % piqp_crossover)
+        s.settings[s.PIQP_auto].update(crossover)
+        s.settings[s.PIQP_auto_high].update(crossover)
+        OUTPUT_FOLDER += '_crossover'
+
+    # Measure the modeling-layer overhead with all the solvers
+    # installed in CVXPY
+    if cvxpy:
+        name_high = '_high' if high_accuracy else ''
+        solvers = MarosMeszarosCVXPYRunner.supported_solvers(
+            [solver + name_high for solver in
+             [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK,
+              s.CLARABEL, s.ECOS]])
+        OUTPUT_FOLDER += '_cvxpy'
+
+    # Record convergence traces (the logs of some solvers are parsed,
+    # which slows them down: store the results separately)
+    if trace:
+        for key in s.settings:
+            s.settings[key]['trace'] = True
+        OUTPUT_FOLDER += '_trace'
+
+    # Race solvers against each other and compare with the single solvers
+    if race_solvers is not None:
+        name_high = '_high' if high_accuracy else ''
+        if not race_solvers:
+            race_solvers = [s.PIQP + name_high, s.GUROBI + name_high,
+                            s.MOSEK + name_high]
+
+    # Report solutions which do not satisfy the KKT conditions at the
+    # tolerance as solver errors
+    if strict_optimality:
+        for key in s.settings:
+            s.settings[key]['strict_optimality'] = True
+        OUTPUT_FOLDER += '_strict'
+
     # Shut up solvers
     if verbose:
         for key in s.settings:
             s.settings[key]['verbose'] = True
 
     # Run all examples
-    maros_meszaros_runner = MarosMeszarosRunner(solvers,
-                                                s.settings,
-                                                OUTPUT_FOLDER)
+    if cvxpy:
+        maros_meszaros_runner = MarosMeszarosCVXPYRunner(solvers,
+                                                         s.settings,
+                                                         OUTPUT_FOLDER)
+    else:
+        maros_meszaros_runner = MarosMeszarosRunner(solvers,
+                                                    s.settings,
+                                                    OUTPUT_FOLDER,
+                                                    store_solutions=store_solutions,
+                                                    race_solvers=race_solvers)
 
     # DEBUG only: Choose only 2 problems
     # maros_meszaros_runner.problems = ["STADAT1", "BOYD1"]
 
     maros_meszaros_runner.solve(parallel=parallel, cores=8)
 
+    if race_solvers and not cvxpy:
+        solvers = solvers + [race_name(race_solvers)]
+
     # Compute results statistics
     compute_stats_info(solvers, OUTPUT_FOLDER,
                     high_accuracy=high_accuracy)
 
+    if cvxpy:
+        compute_cvxpy_overhead(solvers, OUTPUT_FOLDER)
+
+    if trace:
+        compute_time_to_tolerance(solvers, OUTPUT_FOLDER,
+                                  np.logspace(-1, -9, 9))
+
+    if piqp_backends:
+        fit_piqp_backend_crossover(OUTPUT_FOLDER, solvers[0],
+                                   s.PIQP_dense + name_high)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,96 @@
+from scaling_problems.scaling_problem import ScalingRunner
+from problem_classes.lasso import Lasso
+from problem_classes.huber import Huber
+from problem_classes.svm import SVM
+import solvers.solvers as s
+from utils.general import gen_int_log_space
+from utils.benchmark import compute_stats_info, compute_scaling_curves
+import argparse
+
+PROBLEM_CLASSES = {Lasso.name(): Lasso,
+                   Huber.name(): Huber,
+                   SVM.name(): SVM}
+
+
+def main():
+    '''
+    Run machine learning problems (Lasso, Huber fitting and SVM) of
+    increasing size
+
+    The number of features is swept over a log-spaced grid with several
+    random instances per dimension. The number of samples is m_ratio times
+    the number of features.
+    '''
+    parser = argparse.ArgumentParser(description='Machine learning problems Runner')
+    parser.add_argument('--problems', help='Problem classes', nargs='+',
+                        default=list(PROBLEM_CLASSES.keys()),
+                        choices=list(PROBLEM_CLASSES.keys()))
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--n_min', help='Smallest number of features',
+                        default=10, type=int)
+    parser.add_argument('--n_max', help='Largest number of features',
+                        default=500, type=int)
+    parser.add_argument('--n_dimensions', help='Number of dimensions',
+                        default=10, type=int)
+    parser.add_argument('--n_instances', help='Number of instances per dimension',
+                        default=5, type=int)
+    parser.add_argument('--m_ratio', help='Number of samples per feature',
+                        default=100, type=int)
+    parser.add_argument('--density', help='Density of the data matrix',
+                        default=0.15, type=float)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    dimensions = gen_int_log_space(args.n_min,
+                                   args.n_max - args.n_min + 1,
+                                   args.n_dimensions)
+
+    for problem in args.problems:
+        OUTPUT_FOLDER = '%s_problems' % problem.lower()
+        if high_accuracy:
+            OUTPUT_FOLDER += '_high_accuracy'
+
+        # Run all examples
+        runner = ScalingRunner(solvers,
+                               s.settings,
+                               OUTPUT_FOLDER,
+                               PROBLEM_CLASSES[problem],
+                               dimensions,
+                               n_instances=args.n_instances,
+                               problem_args={'m_ratio': args.m_ratio,
+                                             'density': args.density})
+
+        runner.solve(parallel=parallel, cores=8)
+
+        # Compute results statistics
+        compute_stats_info(solvers, OUTPUT_FOLDER,
+                           high_accuracy=high_accuracy,
+                           solve_iters=False)
+        compute_scaling_curves(solvers, OUTPUT_FOLDER)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+from mpc_problems.mpc_simulation import MPCSimulationRunner, MODES
+import solvers.solvers as s
+from utils.general import gen_int_log_space
+from utils.mpc import compute_mpc_latency
+import argparse
+
+
+def main():
+    '''
+    Run closed-loop MPC simulations
+
+    Every solver solves T consecutive MPC problems of random linear
+    systems, whose initial state and reference change along the loop, from
+    scratch (cold), warm started from the previous solution (warmstart) and
+    by updating the vectors of the previous problem (update).
+    '''
+    parser = argparse.ArgumentParser(description='Closed-loop MPC Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--nx_min', help='Smallest number of states',
+                        default=2, type=int)
+    parser.add_argument('--nx_max', help='Largest number of states',
+                        default=100, type=int)
+    parser.add_argument('--n_dimensions', help='Number of dimensions',
+                        default=5, type=int)
+    parser.add_argument('--horizon', help='Prediction horizon',
+                        default=10, type=int)
+    parser.add_argument('--steps', help='Number of closed-loop steps',
+                        default=100, type=int)
+    parser.add_argument('--unstable', help='Open-loop unstable systems',
+                        default=False, action='store_true')
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+    print('horizon', args.horizon)
+    print('steps', args.steps)
+    print('unstable', args.unstable)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        OUTPUT_FOLDER = 'mpc_problems_high_accuracy'
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        OUTPUT_FOLDER = 'mpc_problems'
+    if args.unstable:
+        OUTPUT_FOLDER += '_unstable'
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    dimensions = gen_int_log_space(args.nx_min,
+                                   args.nx_max - args.nx_min + 1,
+                                   args.n_dimensions)
+
+    # Run all examples
+    mpc_runner = MPCSimulationRunner(solvers,
+                                     s.settings,
+                                     OUTPUT_FOLDER,
+                                     dimensions,
+                                     horizon=args.horizon,
+                                     n_steps=args.steps,
+                                     unstable=args.unstable)
+
+    mpc_runner.solve(parallel=parallel, cores=8)
+
+    # Compute results statistics
+    compute_mpc_latency(solvers, MODES, dimensions, OUTPUT_FOLDER)
+
+
+if __name__ == '__main__':
+    main()
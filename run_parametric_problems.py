@@ -0,0 +1,74 @@
+from parametric_problems.maros_meszaros_parametric import MarosMeszarosParametricRunner
+import solvers.solvers as s
+from utils.parametric import compute_results_parametric
+import argparse
+
+def main():
+    '''
+    Run parametric Maros-Meszaros problems
+
+    Each problem is solved along a sequence of perturbed linear costs and
+    bounds with and without warm starting the solvers:
+        - PIQP
+        - OSQP
+        - SCS
+        - PROXQP
+        - QPALM
+        - GUROBI
+        - MOSEK
+
+    '''
+    parser = argparse.ArgumentParser(description='Parametric Maros Meszaros Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--steps', help='Number of problems in each sequence', default=10,
+                        type=int)
+    parser.add_argument('--perturbation', help='Relative size of the perturbations', default=1e-03,
+                        type=float)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+    print('steps', args.steps)
+    print('perturbation', args.perturbation)
+
+    # Add high accuracy solvers when accuracy
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    # Run all examples
+    parametric_runner = MarosMeszarosParametricRunner(solvers,
+                                                      s.settings,
+                                                      n_steps=args.steps,
+                                                      perturbation=args.perturbation)
+
+    # DEBUG only: Choose only 2 problems
+    # parametric_runner.problems = ["HS21", "QAFIRO"]
+
+    parametric_runner.solve(parallel=parallel, cores=8)
+
+    # Compute results statistics
+    compute_results_parametric(parametric_runner.problems,
+                               parametric_runner.dimensions,
+                               solvers)
+
+
+if __name__ == '__main__':
+    main()
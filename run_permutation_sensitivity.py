@@ -0,0 +1,63 @@
+from maros_meszaros_problems.maros_meszaros_permutation import MarosMeszarosPermutationRunner
+import solvers.solvers as s
+from utils.benchmark import compute_permutation_spread
+import argparse
+
+
+def main():
+    '''
+    Run Maros-Meszaros problems with random row and column permutations
+
+    The solutions of the permuted problems are mapped back and verified on
+    the original problems. The spread of the run times over the
+    permutations shows how sensitive the solvers are to the ordering.
+    '''
+    parser = argparse.ArgumentParser(description='Permutation sensitivity Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--permutations', help='Number of random permutations of each problem',
+                        default=5, type=int)
+    parser.add_argument('--seed', help='Random seed of the permutations',
+                        default=1, type=int)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+    print('permutations', args.permutations)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        OUTPUT_FOLDER = 'maros_meszaros_problems_permutation_high_accuracy'
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        OUTPUT_FOLDER = 'maros_meszaros_problems_permutation'
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    permutation_runner = MarosMeszarosPermutationRunner(solvers,
+                                                        s.settings,
+                                                        OUTPUT_FOLDER,
+                                                        n_permutations=args.permutations,
+                                                        seed=args.seed)
+
+    permutation_runner.solve(parallel=parallel, cores=8)
+
+    # Compute results statistics
+    compute_permutation_spread(solvers, OUTPUT_FOLDER)
+
+
+if __name__ == '__main__':
+    main()
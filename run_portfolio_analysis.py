@@ -0,0 +1,39 @@
+from utils.portfolio import compute_portfolio_analysis
+import argparse
+import os
+
+
+def main():
+    '''
+    Analyze the complementarity of the solvers of a benchmark run, i.e.,
+    the virtual best solver, the marginal contribution of each solver, the
+    best solver portfolios and the best sequential fallback chains
+    '''
+    parser = argparse.ArgumentParser(description='Solver portfolio analysis')
+    parser.add_argument('--input', help='Results folder',
+                        default='maros_meszaros_problems')
+    parser.add_argument('--solvers', help='Solvers to analyze (default all)',
+                        nargs='+', default=None)
+    parser.add_argument('--max_portfolio_size', help='Largest portfolio',
+                        default=3, type=int)
+    parser.add_argument('--max_chain_length', help='Longest fallback chain',
+                        default=2, type=int)
+    args = parser.parse_args()
+    input_folder = args.input
+
+    print('input', input_folder)
+
+    solvers = args.solvers
+    if solvers is None:
+        input_dir = os.path.join('.', 'results', input_folder)
+        solvers = sorted(solver for solver in os.listdir(input_dir)
+                         if os.path.isfile(os.path.join(input_dir, solver,
+                                                        'results.csv')))
+
+    compute_portfolio_analysis(solvers, input_folder,
+                               max_portfolio_size=args.max_portfolio_size,
+                               max_chain_length=args.max_chain_length)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+from scaling_problems.scaling_problem import ScalingRunner
+from problem_classes.portfolio import Portfolio, DENSE, SPARSE
+import solvers.solvers as s
+from utils.general import gen_int_log_space
+from utils.benchmark import compute_stats_info, compute_scaling_curves, \
+    compute_formulation_comparison
+import argparse
+
+
+def main():
+    '''
+    Run portfolio optimization problems of increasing size in the dense and
+    the sparse (lifted factor) formulation
+
+    The number of assets is swept over a log-spaced grid with several
+    random instances per dimension. The number of factors is factor_ratio
+    times the number of assets.
+    '''
+    parser = argparse.ArgumentParser(description='Portfolio problems Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--n_min', help='Smallest number of assets',
+                        default=10, type=int)
+    parser.add_argument('--n_max', help='Largest number of assets',
+                        default=5000, type=int)
+    parser.add_argument('--n_dimensions', help='Number of dimensions',
+                        default=10, type=int)
+    parser.add_argument('--n_instances', help='Number of instances per dimension',
+                        default=5, type=int)
+    parser.add_argument('--factor_ratio', help='Number of factors per asset',
+                        default=0.1, type=float)
+    parser.add_argument('--density', help='Density of the factor loading matrix',
+                        default=0.5, type=float)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        OUTPUT_FOLDER = 'portfolio_problems_high_accuracy'
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        OUTPUT_FOLDER = 'portfolio_problems'
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    dimensions = gen_int_log_space(args.n_min,
+                                   args.n_max - args.n_min + 1,
+                                   args.n_dimensions)
+
+    formulations = {}
+    for formulation in [DENSE, SPARSE]:
+        formulations[formulation] = OUTPUT_FOLDER + '_' + formulation
+
+        # Run all examples
+        runner = ScalingRunner(solvers,
+                               s.settings,
+                               formulations[formulation],
+                               Portfolio,
+                               dimensions,
+                               n_instances=args.n_instances,
+                               problem_args={'factor_ratio': args.factor_ratio,
+                                             'density': args.density,
+                                             'formulation': formulation})
+
+        runner.solve(parallel=parallel, cores=8)
+
+        # Compute results statistics
+        compute_stats_info(solvers, formulations[formulation],
+                           high_accuracy=high_accuracy,
+                           solve_iters=False)
+        compute_scaling_curves(solvers, formulations[formulation])
+
+    # Fastest formulation of each solver and dimension
+    compute_formulation_comparison(solvers, formulations, OUTPUT_FOLDER)
+
+
+if __name__ == '__main__':
+    main()
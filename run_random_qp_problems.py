@@ -0,0 +1,88 @@
+from scaling_problems.scaling_problem import ScalingRunner
+from problem_classes.random_qp import RandomQP
+import solvers.solvers as s
+from utils.general import gen_int_log_space
+from utils.benchmark import compute_stats_info, compute_scaling_curves
+import argparse
+
+
+def main():
+    '''
+    Run random sparse QPs of increasing size
+
+    The number of variables is swept over a log-spaced grid with several
+    random instances per dimension.
+    '''
+    parser = argparse.ArgumentParser(description='Random QP Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--n_min', help='Smallest number of variables',
+                        default=10, type=int)
+    parser.add_argument('--n_max', help='Largest number of variables',
+                        default=10000, type=int)
+    parser.add_argument('--n_dimensions', help='Number of dimensions',
+                        default=10, type=int)
+    parser.add_argument('--n_instances', help='Number of instances per dimension',
+                        default=5, type=int)
+    parser.add_argument('--m_ratio', help='Number of constraints per variable',
+                        default=1.0, type=float)
+    parser.add_argument('--density', help='Density of the matrices',
+                        default=1e-03, type=float)
+    parser.add_argument('--condition_number', help='Condition number of P',
+                        default=1e2, type=float)
+    parser.add_argument('--eq_fraction', help='Fraction of equality constraints',
+                        default=0.2, type=float)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        OUTPUT_FOLDER = 'random_qp_problems_high_accuracy'
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        OUTPUT_FOLDER = 'random_qp_problems'
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    dimensions = gen_int_log_space(args.n_min,
+                                   args.n_max - args.n_min + 1,
+                                   args.n_dimensions)
+
+    # Run all examples
+    runner = ScalingRunner(solvers,
+                           s.settings,
+                           OUTPUT_FOLDER,
+                           RandomQP,
+                           dimensions,
+                           n_instances=args.n_instances,
+                           problem_args={'m_ratio': args.m_ratio,
+                                         'density': args.density,
+                                         'condition_number': args.condition_number,
+                                         'eq_fraction': args.eq_fraction})
+
+    runner.solve(parallel=parallel, cores=8)
+
+    # Compute results statistics
+    compute_stats_info(solvers, OUTPUT_FOLDER,
+                       high_accuracy=high_accuracy,
+                       solve_iters=False)
+    compute_scaling_curves(solvers, OUTPUT_FOLDER)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+from maros_meszaros_problems.maros_meszaros_reference import MarosMeszarosReference
+import solvers.solvers as s
+import argparse
+
+
+def main():
+    '''
+    Compute high-accuracy reference solutions of the Maros-Meszaros problems
+
+    Each problem is solved with the candidate solvers at a very tight
+    tolerance and the solution with the smallest KKT residuals is kept.
+    '''
+    parser = argparse.ArgumentParser(description='Maros Meszaros reference solutions')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--eps', help='Absolute and relative tolerance',
+                        default=1e-10, type=float)
+    parser.add_argument('--overwrite', help='Recompute existing reference solutions',
+                        default=False, action='store_true')
+    args = parser.parse_args()
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('verbose', verbose)
+    print('parallel', parallel)
+    print('eps', args.eps)
+
+    solvers = [s.PIQP_high, s.GUROBI_high, s.MOSEK_high, s.CLARABEL_high]
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    reference = MarosMeszarosReference(solvers,
+                                       eps=args.eps,
+                                       overwrite=args.overwrite)
+    reference.solve(parallel=parallel, cores=8)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+from maros_meszaros_problems.maros_meszaros_regrade import MarosMeszarosRegrader
+import solvers.solvers as s
+from utils.benchmark import compute_stats_info
+import argparse
+import os
+
+
+def main():
+    '''
+    Regrade stored Maros-Meszaros solutions at another tolerance
+
+    The solutions have to be stored with
+        python run_maros_meszaros_problems.py --store_solutions
+    '''
+    parser = argparse.ArgumentParser(description='Maros Meszaros Regrader')
+    parser.add_argument('--input', help='Results folder with the stored solutions',
+                        default='maros_meszaros_problems')
+    parser.add_argument('--solvers', help='Solvers to regrade (default all stored)',
+                        nargs='+', default=None)
+    parser.add_argument('--eps_abs', help='Absolute tolerance',
+                        default=s.eps_abs_low, type=float)
+    parser.add_argument('--eps_rel', help='Relative tolerance',
+                        default=s.eps_rel_low, type=float)
+    parser.add_argument('--parallel', help='Parallel regrading', default=False,
+                        action='store_true')
+    args = parser.parse_args()
+    input_folder = args.input
+    eps_abs = args.eps_abs
+    eps_rel = args.eps_rel
+    parallel = args.parallel
+
+    print('input', input_folder)
+    print('eps_abs', eps_abs)
+    print('eps_rel', eps_rel)
+    print('parallel', parallel)
+
+    solvers = args.solvers
+    if solvers is None:
+        input_dir = os.path.join('.', 'results', input_folder)
+        solvers = sorted(solver for solver in os.listdir(input_dir)
+                         if os.path.isdir(os.path.join(input_dir, solver,
+                                                       'solutions')))
+
+    OUTPUT_FOLDER = '%s_regrade_eps_abs_%.0e_eps_rel_%.0e' % \
+        (input_folder, eps_abs, eps_rel)
+
+    # Regrade all solutions
+    regrader = MarosMeszarosRegrader(solvers,
+                                     input_folder,
+                                     OUTPUT_FOLDER,
+                                     eps_abs,
+                                     eps_rel)
+
+    regrader.regrade(parallel=parallel, cores=8)
+
+    # Compute results statistics
+    compute_stats_info(solvers, OUTPUT_FOLDER)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+from maros_meszaros_problems.maros_meszaros_replicated import MarosMeszarosReplicatedRunner
+import solvers.solvers as s
+from utils.benchmark import compute_scaling_curves
+import argparse
+
+
+def main():
+    '''
+    Run block-diagonal replications of Maros-Meszaros problems
+
+    The problems are replicated k times, optionally with sparse rows
+    linking the copies, to reach tens of millions of nonzeros. The run
+    time and the peak memory of every solve are stored.
+    '''
+    parser = argparse.ArgumentParser(description='Replicated Maros Meszaros Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--problems', help='Maros Meszaros problems', nargs='+',
+                        default=['CONT-300', 'BOYD1', 'AUG2DC'])
+    parser.add_argument('--factors', help='Replication factors', nargs='+',
+                        default=[1, 10, 100], type=int)
+    parser.add_argument('--linking_rows', help='Number of rows linking the copies',
+                        default=0, type=int)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('factors', args.factors)
+    print('linking_rows', args.linking_rows)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        OUTPUT_FOLDER = 'maros_meszaros_problems_replicated_high_accuracy'
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        OUTPUT_FOLDER = 'maros_meszaros_problems_replicated'
+    if args.linking_rows > 0:
+        OUTPUT_FOLDER += '_linked'
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    replicated_runner = MarosMeszarosReplicatedRunner(solvers,
+                                                      s.settings,
+                                                      OUTPUT_FOLDER,
+                                                      args.problems,
+                                                      args.factors,
+                                                      n_linking=args.linking_rows)
+
+    replicated_runner.solve()
+
+    # Run time versus nnz over the replication factors of each problem
+    compute_scaling_curves(solvers, OUTPUT_FOLDER, by_problem=True)
+
+
+if __name__ == '__main__':
+    main()
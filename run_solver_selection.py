@@ -0,0 +1,46 @@
+import solvers.solvers as s
+from utils.solver_selection import train_solver_selection
+from utils.benchmark import compute_stats_info
+import argparse
+
+
+def main():
+    '''
+    Train the automatic solver selection (solver AUTO) on the Maros-Meszaros
+    results and evaluate it with leave-one-out over the problems
+
+    The results of the solvers have to be computed first with
+        python run_maros_meszaros_problems.py
+    '''
+    parser = argparse.ArgumentParser(description='Solver selection')
+    parser.add_argument('--high_accuracy', help='Train on the high accuracy results', default=False,
+                        action='store_true')
+    parser.add_argument('--reg', help='Ridge regularization', default=1.0,
+                        type=float)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+
+    print('high_accuracy', high_accuracy)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        INPUT_FOLDER = 'maros_meszaros_problems_high_accuracy'
+        auto_solver = s.AUTO_high
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        INPUT_FOLDER = 'maros_meszaros_problems'
+        auto_solver = s.AUTO
+    OUTPUT_FOLDER = INPUT_FOLDER + '_solver_selection'
+
+    train_solver_selection(solvers, INPUT_FOLDER, OUTPUT_FOLDER,
+                           auto_solver, reg=args.reg)
+
+    # Compare the leave-one-out selection with the solvers
+    compute_stats_info(solvers + [auto_solver], OUTPUT_FOLDER,
+                       high_accuracy=high_accuracy,
+                       solve_times=False,
+                       solve_iters=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+from maros_meszaros_problems.maros_meszaros_sweep import MarosMeszarosSweep
+import solvers.solvers as s
+import argparse
+import json
+import os
+
+# Default search spaces
+SEARCH_SPACES = {
+    s.PIQP: {'rho_init': [1e-08, 1e-06, 1e-04],
+             'delta_init': [1e-06, 1e-04, 1e-02],
+             'reg_lower_limit': [1e-10, 1e-08]},
+    s.OSQP: {'rho': [1e-02, 1e-01, 1.],
+             'sigma': [1e-06, 1e-04],
+             'adaptive_rho_interval': [0, 25, 100]},
+}
+
+
+def main():
+    '''
+    Sweep the settings of a solver on the Maros-Meszaros problems with
+    successive halving
+    '''
+    parser = argparse.ArgumentParser(description='Settings sweep')
+    parser.add_argument('--solver', help='Solver to sweep', default=s.PIQP,
+                        choices=list(SEARCH_SPACES))
+    parser.add_argument('--space', help='JSON file with the search space, '
+                        'i.e., a list of values for each setting', default=None)
+    parser.add_argument('--eta', help='Pruning factor', default=3, type=int)
+    parser.add_argument('--min_problems', help='Problems in the first rung',
+                        default=10, type=int)
+    parser.add_argument('--max_problems', help='Problems in the last rung',
+                        default=None, type=int)
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+    verbose = args.verbose
+    parallel = args.parallel
+
+    print('solver', args.solver)
+    print('high_accuracy', high_accuracy)
+    print('verbose', verbose)
+    print('parallel', parallel)
+
+    if args.space is not None:
+        with open(args.space) as f:
+            search_space = json.load(f)
+    else:
+        search_space = SEARCH_SPACES[args.solver]
+
+    # Sweep the high accuracy settings when accuracy
+    if high_accuracy:
+        solver = args.solver + '_high'
+        OUTPUT_FOLDER = 'maros_meszaros_problems_sweep_high_accuracy'
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solver = args.solver
+        OUTPUT_FOLDER = 'maros_meszaros_problems_sweep'
+    OUTPUT_FOLDER = os.path.join(OUTPUT_FOLDER, solver)
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    sweep = MarosMeszarosSweep(solver,
+                               search_space,
+                               s.settings,
+                               OUTPUT_FOLDER,
+                               eta=args.eta,
+                               min_problems=args.min_problems,
+                               max_problems=args.max_problems)
+    ranking = sweep.solve(parallel=parallel, cores=8)
+
+    print(ranking.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
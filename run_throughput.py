@@ -0,0 +1,54 @@
+from throughput_problems.throughput_benchmark import ThroughputRunner, MAROS, RANDOM
+import solvers.solvers as s
+import argparse
+
+
+def main():
+    '''
+    Measure the throughput of the solvers on a stream of independent small
+    problems with 1 to N workers
+
+    The execution models are a thread pool, a process pool with one
+    problem per task and a process pool with one batch of problems per
+    worker.
+    '''
+    parser = argparse.ArgumentParser(description='Throughput Runner')
+    parser.add_argument('--high_accuracy', help='Test with high accuracy', default=False,
+                        action='store_true')
+    parser.add_argument('--source', help='Problems of the stream', default=MAROS,
+                        choices=[MAROS, RANDOM])
+    parser.add_argument('--solves', help='Length of the stream',
+                        default=1000, type=int)
+    parser.add_argument('--max_workers', help='Largest number of workers (default: number of cores)',
+                        default=None, type=int)
+    parser.add_argument('--n', help='Number of variables of the random problems',
+                        default=10, type=int)
+    args = parser.parse_args()
+    high_accuracy = args.high_accuracy
+
+    print('high_accuracy', high_accuracy)
+    print('source', args.source)
+    print('solves', args.solves)
+
+    if high_accuracy:
+        solvers = [s.PIQP_high, s.OSQP_high, s.QPALM_high, s.SCS_high, s.PROXQP_high, s.GUROBI_high, s.MOSEK_high]
+        OUTPUT_FOLDER = 'throughput_%s_high_accuracy' % args.source
+        for key in s.settings:
+            s.settings[key]['high_accuracy'] = True
+    else:
+        solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+        OUTPUT_FOLDER = 'throughput_%s' % args.source
+
+    throughput_runner = ThroughputRunner(solvers,
+                                         s.settings,
+                                         OUTPUT_FOLDER,
+                                         source=args.source,
+                                         n_solves=args.solves,
+                                         max_workers=args.max_workers,
+                                         n=args.n)
+
+    throughput_runner.solve()
+
+
+if __name__ == '__main__':
+    main()
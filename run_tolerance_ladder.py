@@ -0,0 +1,63 @@
+from maros_meszaros_problems.maros_meszaros_tolerance import MarosMeszarosToleranceRunner
+import solvers.solvers as s
+from utils.benchmark import compute_tolerance_ladder
+import argparse
+import numpy as np
+
+
+def main():
+    '''
+    Run Maros-Meszaros problems with a ladder of tolerances
+
+    The absolute tolerances go from 1e-02 down to 1e-10 and the relative
+    tolerances are 10 times smaller.
+    '''
+    parser = argparse.ArgumentParser(description='Tolerance ladder Runner')
+    parser.add_argument('--verbose', help='Verbose solvers', default=False,
+                        action='store_true')
+    parser.add_argument('--parallel', help='Parallel solution', default=False,
+                        action='store_true')
+    parser.add_argument('--no_warm_start', help='Solve each tolerance from scratch',
+                        default=False, action='store_true')
+    parser.add_argument('--eps_max', help='Loosest absolute tolerance',
+                        default=1e-02, type=float)
+    parser.add_argument('--eps_min', help='Tightest absolute tolerance',
+                        default=1e-10, type=float)
+    args = parser.parse_args()
+    verbose = args.verbose
+    parallel = args.parallel
+    warm_start = not args.no_warm_start
+
+    print('verbose', verbose)
+    print('parallel', parallel)
+    print('warm_start', warm_start)
+
+    solvers = [s.PIQP, s.OSQP, s.QPALM, s.SCS, s.PROXQP, s.GUROBI, s.MOSEK]
+    OUTPUT_FOLDER = 'maros_meszaros_problems_tolerance_ladder'
+    if not warm_start:
+        OUTPUT_FOLDER += '_no_warm_start'
+
+    n_tolerances = int(round(np.log10(args.eps_max / args.eps_min))) + 1
+    tolerances = [float('%.1e' % eps) for eps in
+                  np.logspace(np.log10(args.eps_max),
+                              np.log10(args.eps_min), n_tolerances)]
+
+    # Shut up solvers
+    if verbose:
+        for key in s.settings:
+            s.settings[key]['verbose'] = True
+
+    # Run all examples
+    tolerance_runner = MarosMeszarosToleranceRunner(solvers,
+                                                    tolerances,
+                                                    OUTPUT_FOLDER,
+                                                    warm_start=warm_start)
+
+    tolerance_runner.solve(parallel=parallel, cores=8)
+
+    # Compute results statistics
+    compute_tolerance_ladder(solvers, OUTPUT_FOLDER, tolerances)
+
+
+if __name__ == '__main__':
+    main()
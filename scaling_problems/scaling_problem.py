@@ -0,0 +1,199 @@
+import os
+import queue
+import time
+from multiprocessing import Queue, Process, cpu_count
+from multiprocessing.pool import ThreadPool
+from itertools import product
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from utils.general import make_sure_path_exists
+
+
+class ScalingRunner(object):
+    '''
+    Scaling examples runner
+    '''
+    def __init__(self,
+                 solvers,
+                 settings,
+                 output_folder,
+                 problem_class,
+                 dimensions,
+                 n_instances=5,
+                 problem_args={}):
+        '''
+        Args:
+            solvers: solver names
+            settings: settings dictionary of each solver
+            output_folder: results folder
+            problem_class: problem class constructed as
+                           problem_class(dimension, seed=seed, **problem_args)
+            dimensions: leading dimensions of the problems, e.g., from
+                        gen_int_log_space
+            n_instances: number of random instances per dimension
+            problem_args: additional arguments of the problem class
+        '''
+        self.solvers = solvers
+        self.settings = settings
+        self.output_folder = output_folder
+        self.problem_class = problem_class
+        self.dimensions = dimensions
+        self.n_instances = n_instances
+        self.problem_args = problem_args
+
+    def solve(self, parallel=True, cores=32):
+        '''
+        Solve all instances of all dimensions
+
+        The results are stored as
+
+            ./results/{self.output_folder}/{solver}/results.csv
+
+        using a pandas table with fields
+            - 'name': instance name
+            - 'solver': solver name
+            - 'status': solver status
+            - 'run_time': execution time
+            - 'iter': number of iterations
+            - 'obj_val': objective value from solver
+            - 'dimension': leading dimension of the generator
+            - 'instance': instance number, i.e., the random seed
+            - 'n': number of variables
+            - 'm': number of constraints
+            - 'N': nnz dimension (nnz(P) + nnz(A))
+
+        Every instance is generated and solved in a new process which is
+        killed after the time limit. The results of each solver are stored
+        as soon as the solver is done.
+        '''
+        print("Solving %s problems" % self.problem_class.name())
+        print("-------------------" + "-" * len(self.problem_class.name()))
+
+        instances = list(product(self.dimensions, range(self.n_instances)))
+
+        if parallel:
+            pool = ThreadPool(processes=min(cores, cpu_count()))
+
+        for solver in self.solvers:
+            settings = self.settings[solver]
+            if parallel:
+                results = pool.starmap(self.solve_instance_with_timeout,
+                                       [(dimension, instance, solver, settings)
+                                        for dimension, instance in instances],
+                                       1)
+            else:
+                results = [self.solve_instance_with_timeout(dimension,
+                                                            instance,
+                                                            solver, settings)
+                           for dimension, instance in instances]
+
+            path = os.path.join('.', 'results', self.output_folder, solver)
+            make_sure_path_exists(path)
+            pd.concat(results).to_csv(os.path.join(path, 'results.csv'),
+                                      index=False)
+
+        if parallel:
+            pool.close()  # Not accepting any more jobs on this pool
+            pool.join()   # Wait for all processes to finish
+
+    def solve_instance_with_timeout(self, dimension, instance, solver,
+                                    settings):
+        '''
+        Solve instance 'instance' of dimension 'dimension' with 'solver' in
+        a new process
+
+        The process puts the problem size in the queue once the instance is
+        generated and then the results. A process exceeding the time limit
+        is killed and reported as TIME_LIMIT, a process terminated without
+        results as SOLVER_ERROR.
+        '''
+        q = Queue()
+        p = Process(target=self.solve_instance_in_queue,
+                    args=(q, dimension, instance, solver, settings))
+        p.start()
+
+        size = {'n': [np.nan], 'm': [np.nan], 'N': [np.nan]}
+        status = None
+        start_time = time.time()
+        while True:
+            try:
+                entry = q.get(timeout=1.0)
+            except queue.Empty:
+                if not p.is_alive():
+                    # The results might have been queued just before
+                    # exiting
+                    try:
+                        entry = q.get(timeout=1.0)
+                    except queue.Empty:
+                        status = s.SOLVER_ERROR
+                        break
+                elif time.time() - start_time > settings['time_limit'] + 5:
+                    status = s.TIME_LIMIT
+                    break
+                else:
+                    continue
+            if isinstance(entry, pd.DataFrame):
+                p.join()
+                return entry
+            size = entry
+
+        if p.is_alive():
+            p.terminate()
+        p.join()
+
+        row = {'name': ['n%i_i%i' % (dimension, instance)],
+               'solver': [solver],
+               'status': [status],
+               'run_time': [settings['time_limit']],
+               'iter': [0],
+               'obj_val': [np.inf],
+               'dimension': [dimension],
+               'instance': [instance]}
+        row.update(size)
+        return pd.DataFrame(row)
+
+    def solve_instance_in_queue(self, queue, dimension, instance, solver,
+                                settings):
+        example = self.problem_class(dimension, seed=instance,
+                                     **self.problem_args)
+        P = example.qp_problem['P']
+        A = example.qp_problem['A']
+        queue.put({'n': [example.qp_problem["n"]],
+                   'm': [example.qp_problem["m"]],
+                   'N': [P.nnz + A.nnz]})
+        queue.put(self.solve_instance(example, dimension, instance, solver,
+                                      settings))
+
+    def solve_instance(self, example, dimension, instance, solver, settings):
+        '''
+        Solve instance 'instance' of dimension 'dimension' with 'solver'
+
+        Returns:
+            pandas dataframe with one row
+        '''
+        name = 'n%i_i%i' % (dimension, instance)
+        P = example.qp_problem['P']
+        A = example.qp_problem['A']
+        N = P.nnz + A.nnz
+
+        print(" - Solving %s with solver %s" % (name, solver), flush=True)
+        solver_results = SOLVER_MAP[solver](settings).solve(example)
+
+        obj = solver_results.obj_val
+        if obj is not None:
+            obj += example.qp_problem["r"]
+
+        return pd.DataFrame({'name': [name],
+                             'solver': [solver],
+                             'status': [solver_results.status],
+                             'run_time': [solver_results.run_time],
+                             'iter': [solver_results.niter],
+                             'obj_val': [obj],
+                             'dimension': [dimension],
+                             'instance': [instance],
+                             'n': [example.qp_problem["n"]],
+                             'm': [example.qp_problem["m"]],
+                             'N': [N]})
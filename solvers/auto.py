@@ -0,0 +1,80 @@
+import os
+import time
+from . import statuses as s
+from .results import Results
+
+
+class AUTOSolver(object):
+    '''
+    Dispatch to the solver with the smallest predicted run time, see
+    utils/solver_selection.py
+    '''
+
+    # Loaded selection models by file name
+    _models = {}
+
+    def __init__(self, settings={}):
+        '''
+        Initialize solver object by setting require settings and loading
+        the selection model, once per process
+        '''
+        # NB. Imported here since the selection model depends on the solvers
+        from utils.solver_selection import load_model
+
+        self._settings = settings
+        self._model = None
+        model_file = settings.get('model_file')
+        if model_file is not None and os.path.isfile(model_file):
+            if model_file not in self._models:
+                self._models[model_file] = load_model(model_file)
+            self._model = self._models[model_file]
+
+    @property
+    def settings(self):
+        """Solver settings"""
+        return self._settings
+
+    def solve(self, example, warm_start=False):
+        '''
+        Solve problem
+
+        Args:
+            example: example object
+            warm_start: passed to the selected solver
+
+        Returns:
+            Results structure of the selected solver
+        '''
+        # NB. Imported here since the selection model depends on the solvers
+        from solvers.solvers import SOLVER_MAP, settings
+        from utils.solver_selection import problem_features, \
+            predict_log_run_times
+
+        if self._model is None:
+            if self._settings.get('verbose'):
+                print("Solver selection model %s not found\n" %
+                      self._settings.get('model_file'))
+            return Results(s.SOLVER_ERROR, None, None, None, None, None)
+
+        # The selection time, i.e., the feature extraction and the
+        # prediction, is part of the run time
+        t_start = time.perf_counter()
+        model, solvers = self._model
+        log_run_times = predict_log_run_times(
+            model, problem_features(example.qp_problem))
+        solver = solvers[log_run_times.argmin()]
+        selection_time = time.perf_counter() - t_start
+
+        solver_settings = settings[solver].copy()
+        for param in ['verbose', 'high_accuracy', 'strict_optimality',
+                      'trace']:
+            if param in self._settings:
+                solver_settings[param] = self._settings[param]
+
+        results = SOLVER_MAP[solver](solver_settings).solve(
+            example, warm_start=warm_start)
+        results.selected_solver = solver
+        if results.run_time is not None:
+            results.run_time += selection_time
+
+        return results
@@ -5,6 +5,7 @@ import clarabel
 from . import statuses as s
 from .results import Results
 from utils.general import is_qp_solution_optimal
+from utils.trace import stdout_captured, parse_clarabel_log
 
 
 class ClarabelSolver(object):
@@ -25,12 +26,13 @@ class ClarabelSolver(object):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             problem: problem structure with QP matrices
+            warm_start: ignored, the problem is always solved from scratch
 
         Returns:
             Results structure
@@ -38,6 +40,11 @@ class ClarabelSolver(object):
         problem = example.qp_problem
         settings = self._settings.copy()
         high_accuracy = settings.pop('high_accuracy', None)
+        strict_optimality = settings.pop('strict_optimality', False)
+        trace = settings.pop('trace', False)
+        if trace:
+            # The iterations are parsed from the log
+            settings['verbose'] = True
 
         # Setup PIQP
         c_settings = clarabel.DefaultSettings();
@@ -77,7 +84,11 @@ class ClarabelSolver(object):
         solver = clarabel.DefaultSolver(problem['P'], problem['q'], cA, cb, cones, c_settings);
 
         # Solve
-        sol = solver.solve()
+        if trace:
+            with stdout_captured() as log:
+                sol = solver.solve()
+        else:
+            sol = solver.solve()
         status = self.STATUS_MAP.get(sol.status, s.SOLVER_ERROR)
 
         y = np.zeros(problem['m'])
@@ -89,7 +100,8 @@ class ClarabelSolver(object):
             if not is_qp_solution_optimal(problem,
                                           np.array(sol.x),
                                           y,
-                                          high_accuracy=high_accuracy):
+                                          high_accuracy=high_accuracy,
+                                          strict=strict_optimality):
                 status = s.SOLVER_ERROR
 
         # Verify solver time
@@ -103,5 +115,7 @@ class ClarabelSolver(object):
                                  y,
                                  sol.solve_time,
                                  sol.iterations)
+        if trace:
+            return_results.trace = parse_clarabel_log(log[0], sol.solve_time)
 
         return return_results
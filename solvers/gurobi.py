@@ -1,8 +1,10 @@
+import time
 import gurobipy as grb
 import numpy as np
 from . import statuses as s
 from .results import Results
 from utils.general import is_qp_solution_optimal
+from utils.trace import make_trace
 
 
 class GUROBISolver(object):
@@ -31,12 +33,13 @@ class GUROBISolver(object):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             example: example object
+            warm_start: ignored, the problem is always solved from scratch
 
         Returns:
             Results structure
@@ -133,21 +136,43 @@ class GUROBISolver(object):
                 model.setParam("OutputFlag", 0)
 
         for param, value in self._settings.items():  # Set other parameters
-            if (param != "verbose") and (param != "time_limit") \
-                    and (param != "high_accuracy"):
+            if param not in ["verbose", "time_limit", "high_accuracy",
+                             "strict_optimality", "trace"]:
                 model.setParam(param, value)
 
         # Update model
         model.update()
 
+        # Record the residuals of the barrier and simplex iterations
+        trace_rows = []
+
+        def trace_callback(model, where):
+            if where == grb.GRB.Callback.BARRIER:
+                trace_rows.append([
+                    model.cbGet(grb.GRB.Callback.RUNTIME),
+                    model.cbGet(grb.GRB.Callback.BARRIER_PRIMINF),
+                    model.cbGet(grb.GRB.Callback.BARRIER_DUALINF),
+                    abs(model.cbGet(grb.GRB.Callback.BARRIER_PRIMOBJ) -
+                        model.cbGet(grb.GRB.Callback.BARRIER_DUALOBJ))])
+            elif where == grb.GRB.Callback.SIMPLEX:
+                trace_rows.append([
+                    model.cbGet(grb.GRB.Callback.RUNTIME),
+                    model.cbGet(grb.GRB.Callback.SPX_PRIMINF),
+                    model.cbGet(grb.GRB.Callback.SPX_DUALINF),
+                    np.nan])
+
         # Solve problem
         try:
-            model.optimize()
+            if self._settings.get('trace'):
+                model.optimize(trace_callback)
+            else:
+                model.optimize()
         except:  # Error in the solution
             if self._settings['verbose']:
                 print("Error in GUROBI solution\n")
             run_time = model.Runtime
             return Results(s.SOLVER_ERROR, None, None, None, run_time, None)
+        t_solved = time.perf_counter()
 
         # Get status
         status = self.STATUS_MAP.get(model.Status, s.SOLVER_ERROR)
@@ -170,7 +195,8 @@ class GUROBISolver(object):
             y = -np.array([constrs[i].Pi for i in range(m)])
 
             if not is_qp_solution_optimal(p, x, y,
-                                          high_accuracy=self._settings.get('high_accuracy')):
+                                          high_accuracy=self._settings.get('high_accuracy'),
+                                          strict=self._settings.get('strict_optimality', False)):
                 status = s.SOLVER_ERROR
 
             # Validate execution time (do not trust commercial solvers)
@@ -178,8 +204,14 @@ class GUROBISolver(object):
                 if run_time > self._settings['time_limit']:
                     status = s.TIME_LIMIT
 
-            return Results(status, objval, x, y,
-                           run_time, niter)
+            results = Results(status, objval, x, y,
+                              run_time, niter)
         else:
-            return Results(status, None, None, None,
-                           run_time, niter)
+            results = Results(status, None, None, None,
+                              run_time, niter)
+
+        if self._settings.get('trace'):
+            results.trace = make_trace(trace_rows)
+        results.extraction_time = time.perf_counter() - t_solved
+
+        return results
@@ -0,0 +1,118 @@
+import numpy as np
+import scipy.sparse as spa
+import highspy
+from . import statuses as s
+from .results import Results
+from utils.general import is_qp_solution_optimal
+
+
+class HiGHSSolver(object):
+
+    STATUS_MAP = {highspy.HighsModelStatus.kOptimal: s.OPTIMAL,
+                  highspy.HighsModelStatus.kInfeasible: s.PRIMAL_INFEASIBLE,
+                  highspy.HighsModelStatus.kUnbounded: s.DUAL_INFEASIBLE,
+                  highspy.HighsModelStatus.kUnboundedOrInfeasible:
+                  s.PRIMAL_OR_DUAL_INFEASIBLE,
+                  highspy.HighsModelStatus.kIterationLimit: s.MAX_ITER_REACHED,
+                  highspy.HighsModelStatus.kTimeLimit: s.TIME_LIMIT,
+                  highspy.HighsModelStatus.kMemoryLimit: s.MEMORY_LIMIT}
+
+    def __init__(self, settings={}):
+        '''
+        Initialize solver object by setting require settings
+        '''
+        self._settings = settings
+
+    @property
+    def settings(self):
+        """Solver settings"""
+        return self._settings
+
+    def solve(self, example, warm_start=False):
+        '''
+        Solve problem
+
+        Args:
+            example: example object
+            warm_start: ignored, the problem is always solved from scratch
+
+        Returns:
+            Results structure
+        '''
+        problem = example.qp_problem
+        settings = self._settings.copy()
+        high_accuracy = settings.pop('high_accuracy', None)
+        strict_optimality = settings.pop('strict_optimality', False)
+        verbose = settings.pop('verbose', False)
+        settings.pop('trace', None)
+        n = problem['n']
+
+        h = highspy.Highs()
+        h.setOptionValue('output_flag', bool(verbose))
+        for param, value in settings.items():
+            h.setOptionValue(param, value)
+
+        # Constraints without the variable bounds,
+        # i.e., A == vstack([C, spa.eye(n)])
+        C = problem['A'][:-n].tocsc()
+        inf = highspy.kHighsInf
+
+        model = highspy.HighsModel()
+        lp = model.lp_
+        lp.num_col_ = n
+        lp.num_row_ = C.shape[0]
+        lp.col_cost_ = problem['q']
+        lp.col_lower_ = np.maximum(problem['xl'], -inf)
+        lp.col_upper_ = np.minimum(problem['xu'], inf)
+        lp.row_lower_ = np.maximum(problem['l'][:-n], -inf)
+        lp.row_upper_ = np.minimum(problem['u'][:-n], inf)
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.start_ = C.indptr
+        lp.a_matrix_.index_ = C.indices
+        lp.a_matrix_.value_ = C.data
+
+        # Hessian as lower triangular part in csc format
+        if problem['P'].nnz > 0:
+            P_tril = spa.tril(problem['P'], format='csc')
+            hessian = model.hessian_
+            hessian.dim_ = n
+            hessian.format_ = highspy.HessianFormat.kTriangular
+            hessian.start_ = P_tril.indptr
+            hessian.index_ = P_tril.indices
+            hessian.value_ = P_tril.data
+
+        h.passModel(model)
+
+        # Solve
+        h.run()
+
+        status = self.STATUS_MAP.get(h.getModelStatus(), s.SOLVER_ERROR)
+        info = h.getInfo()
+        run_time = h.getRunTime()
+        niter = info.qp_iteration_count + info.simplex_iteration_count + \
+            info.ipm_iteration_count
+
+        if status in s.SOLUTION_PRESENT:
+            solution = h.getSolution()
+            x = np.array(solution.col_value)
+            obj_val = info.objective_function_value
+
+            # HiGHS duals are positive for active lower bounds
+            y = -np.concatenate((np.array(solution.row_dual),
+                                 np.array(solution.col_dual)))
+
+            if not is_qp_solution_optimal(problem, x, y,
+                                          high_accuracy=high_accuracy,
+                                          strict=strict_optimality):
+                status = s.SOLVER_ERROR
+
+            # Verify solver time
+            if 'time_limit' in settings:
+                if run_time > settings['time_limit']:
+                    status = s.TIME_LIMIT
+
+            return Results(status, obj_val, x, y,
+                           run_time, niter)
+        else:
+            return Results(status, None, None, None,
+                           run_time, niter)
@@ -1,9 +1,11 @@
+import time
 import mosek
 import numpy as np
 import scipy.sparse as spa
 from . import statuses as s
 from .results import Results
 from utils.general import is_qp_solution_optimal
+from utils.trace import make_trace
 
 
 class MOSEKSolver(object):
@@ -27,12 +29,13 @@ class MOSEKSolver(object):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             example: example object
+            warm_start: ignored, the problem is always solved from scratch
 
         Returns:
             Results structure
@@ -117,12 +120,29 @@ class MOSEKSolver(object):
             if param == 'verbose':
                 if value is False:
                     self._handle_str_param(task, 'MSK_IPAR_LOG'.strip(), 0)
-            elif param != 'time_limit' and param != 'high_accuracy':
+            elif param not in ['time_limit', 'high_accuracy',
+                               'strict_optimality', 'trace']:
                 if isinstance(param, str):
                     self._handle_str_param(task, param.strip(), value)
                 else:
                     self._handle_enum_param(task, param, value)
 
+        # Record the residuals of the interior point iterations
+        trace_rows = []
+
+        def trace_callback(code, douinf, intinf, lintinf):
+            if code == mosek.callbackcode.intpnt:
+                trace_rows.append([
+                    douinf[mosek.dinfitem.optimizer_time],
+                    douinf[mosek.dinfitem.intpnt_primal_feas],
+                    douinf[mosek.dinfitem.intpnt_dual_feas],
+                    abs(douinf[mosek.dinfitem.intpnt_primal_obj] -
+                        douinf[mosek.dinfitem.intpnt_dual_obj])])
+            return 0
+
+        if self._settings.get('trace'):
+            task.set_InfoCallback(trace_callback)
+
         '''
         Solve problem
         '''
@@ -134,6 +154,7 @@ class MOSEKSolver(object):
                 print("Error in MOSEK solution\n")
             return Results(s.SOLVER_ERROR, None, None, None,
                            None, None)
+        t_solved = time.perf_counter()
 
         if 'verbose' in self._settings:  # if verbose is null, suppress it
             if self._settings['verbose']:
@@ -174,7 +195,8 @@ class MOSEKSolver(object):
             y = -y
 
             if not is_qp_solution_optimal(p, x, y,
-                                          high_accuracy=self._settings.get('high_accuracy')):
+                                          high_accuracy=self._settings.get('high_accuracy'),
+                                          strict=self._settings.get('strict_optimality', False)):
                 status = s.SOLVER_ERROR
 
             # Validate execution time (do not trust commercial solvers)
@@ -182,11 +204,17 @@ class MOSEKSolver(object):
                 if cputime > self._settings['time_limit']:
                     status = s.TIME_LIMIT
 
-            return Results(status, objval, x, y,
-                           cputime, total_iter)
+            results = Results(status, objval, x, y,
+                              cputime, total_iter)
         else:
-            return Results(status, None, None, None,
-                           cputime, None)
+            results = Results(status, None, None, None,
+                              cputime, None)
+
+        if self._settings.get('trace'):
+            results.trace = make_trace(trace_rows)
+        results.extraction_time = time.perf_counter() - t_solved
+
+        return results
 
     # def choose_solution(self, task):
     #     """Chooses between the basic, interior point solution or integer solution
@@ -1,7 +1,10 @@
+import time
+from contextlib import nullcontext
 import osqp
 from . import statuses as s
 from .results import Results
 from utils.general import is_qp_solution_optimal
+from utils.trace import stdout_captured, parse_osqp_log
 
 
 class OSQPSolver(object):
@@ -17,18 +20,24 @@ class OSQPSolver(object):
         Initialize solver object by setting require settings
         '''
         self._settings = settings
+        self._model = None
 
     @property
     def settings(self):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             problem: problem structure with QP matrices
+            warm_start: update the vectors of the previously solved
+                        problem and warm start from its solution
+
+        A new problem is warm started from example.initial_guess = (x, y),
+        if the example has one.
 
         Returns:
             Results structure
@@ -36,22 +45,47 @@ class OSQPSolver(object):
         problem = example.qp_problem
         settings = self._settings.copy()
         high_accuracy = settings.pop('high_accuracy', None)
+        strict_optimality = settings.pop('strict_optimality', False)
+        trace = settings.pop('trace', False)
+        if trace:
+            # The iterations are parsed from the log
+            settings['verbose'] = True
+
+        # The setup banner is captured with the iterations
+        with stdout_captured() if trace else nullcontext([]) as log:
+            if warm_start and self._model is not None:
+                # Update OSQP (the previous iterate is kept as warm start)
+                m = self._model
+                m.update(q=problem['q'], l=problem['l'], u=problem['u'])
+                # The tolerances might have changed, e.g., in a tolerance
+                # ladder
+                m.update_settings(**{param: settings[param]
+                                     for param in ['eps_abs', 'eps_rel']
+                                     if param in settings})
+            else:
+                # Setup OSQP
+                m = osqp.OSQP()
+                m.setup(problem['P'], problem['q'], problem['A'],
+                        problem['l'], problem['u'],
+                        **settings)
+                self._model = m
 
-        # Setup OSQP
-        m = osqp.OSQP()
-        m.setup(problem['P'], problem['q'], problem['A'], problem['l'],
-                problem['u'],
-                **settings)
+                # Warm start from the initial guess of the example, if any
+                initial_guess = getattr(example, 'initial_guess', None)
+                if initial_guess is not None:
+                    m.warm_start(x=initial_guess[0], y=initial_guess[1])
 
-        # Solve
-        results = m.solve()
+            # Solve
+            results = m.solve()
+        t_solved = time.perf_counter()
         status = self.STATUS_MAP.get(results.info.status_val, s.SOLVER_ERROR)
 
         if status in s.SOLUTION_PRESENT:
             if not is_qp_solution_optimal(problem,
                                           results.x,
                                           results.y,
-                                          high_accuracy=high_accuracy):
+                                          high_accuracy=high_accuracy,
+                                          strict=strict_optimality):
                 status = s.SOLVER_ERROR
 
         # Verify solver time
@@ -71,5 +105,8 @@ class OSQPSolver(object):
         return_results.solve_time = results.info.solve_time
         return_results.update_time = results.info.update_time
         return_results.rho_updates = results.info.rho_updates
+        if trace:
+            return_results.trace = parse_osqp_log(log[0])
+        return_results.extraction_time = time.perf_counter() - t_solved
 
         return return_results
@@ -1,8 +1,10 @@
+import time
 import numpy as np
 import piqp
 from . import statuses as s
 from .results import Results
-from utils.general import is_qp_solution_optimal
+from utils.general import is_qp_solution_optimal, estimate_dense_memory
+from utils.trace import stdout_captured, parse_piqp_log
 
 
 class PIQPSolver(object):
@@ -12,23 +14,47 @@ class PIQPSolver(object):
                   piqp.PIQP_PRIMAL_INFEASIBLE: s.PRIMAL_INFEASIBLE,
                   piqp.PIQP_DUAL_INFEASIBLE: s.DUAL_INFEASIBLE}
 
+    # Untuned default crossover between the dense and sparse backends.
+    # The settings 'dense_max_n' and 'dense_min_density' override it, e.g.,
+    # with the crossover fitted by fit_piqp_backend_crossover.
+    # The density is nnz(P) + nnz(A) over n * (n + m).
+    DENSE_MAX_N = 1000
+    DENSE_MIN_DENSITY = 0.15
+
+    # KKT solver of each backend in PIQP versions without KKTSolver
+    DEFAULT_KKT_SOLVERS = {'dense': 'dense_cholesky',
+                           'sparse': 'sparse_ldlt'}
+
     def __init__(self, settings={}):
         '''
         Initialize solver object by setting require settings
         '''
         self._settings = settings
+        self._model = None
 
     @property
     def settings(self):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    @staticmethod
+    def kkt_solver_available(backend, kkt_solver):
+        '''
+        Check whether the installed PIQP provides 'kkt_solver', the default
+        solver of each backend (or None) is always available
+        '''
+        return kkt_solver is None or \
+            kkt_solver == PIQPSolver.DEFAULT_KKT_SOLVERS.get(backend) or \
+            hasattr(getattr(piqp, 'KKTSolver', None), kkt_solver)
+
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             problem: problem structure with QP matrices
+            warm_start: update the vectors of the previously solved
+                        problem reusing its symbolic factorization
 
         Returns:
             Results structure
@@ -36,20 +62,74 @@ class PIQPSolver(object):
         problem = example.qp_problem
         settings = self._settings.copy()
         high_accuracy = settings.pop('high_accuracy', None)
-
-        # Setup PIQP
-        m = piqp.SparseSolver()
-        for param, value in settings.items():
-            if hasattr(m.settings, param):
-                setattr(m.settings, param, value)
-
-        m.setup(problem['P'], problem['q'],
-                problem['A_eq'], problem['b'],
-                problem['G'], problem['h'],
-                problem['xl'], problem['xu'])
+        strict_optimality = settings.pop('strict_optimality', False)
+        backend = settings.pop('backend', 'sparse')
+        kkt_solver = settings.pop('kkt_solver', None)
+        dense_memory_limit = settings.pop('dense_memory_limit', None)
+        dense_max_n = settings.pop('dense_max_n', self.DENSE_MAX_N)
+        dense_min_density = settings.pop('dense_min_density',
+                                         self.DENSE_MIN_DENSITY)
+        trace = settings.pop('trace', False)
+        if trace:
+            # The iterations are parsed from the log
+            settings['verbose'] = True
+
+        if backend == 'auto':
+            backend = self.choose_backend(problem, dense_max_n,
+                                          dense_min_density)
+
+        if warm_start and self._model is not None:
+            # Update PIQP
+            m = self._model
+            m.update(c=problem['q'], b=problem['b'], h=problem['h'],
+                     x_lb=problem['xl'], x_ub=problem['xu'])
+            # The settings might have changed, e.g., in a tolerance ladder
+            for param, value in settings.items():
+                if hasattr(m.settings, param):
+                    setattr(m.settings, param, value)
+        else:
+            # Setup PIQP
+            if backend == 'dense':
+                n_con = problem['A_eq'].shape[0] + problem['G'].shape[0]
+                if dense_memory_limit is not None and \
+                        estimate_dense_memory(problem['n'], n_con) > \
+                        dense_memory_limit:
+                    return_results = Results(s.MEMORY_LIMIT, None, None, None,
+                                             None, None)
+                    return_results.backend = backend
+                    return return_results
+                m = piqp.DenseSolver()
+            else:
+                m = piqp.SparseSolver()
+            for param, value in settings.items():
+                if hasattr(m.settings, param):
+                    setattr(m.settings, param, value)
+            if kkt_solver is not None and \
+                    kkt_solver != self.DEFAULT_KKT_SOLVERS[backend]:
+                if not self.kkt_solver_available(backend, kkt_solver):
+                    raise ValueError('PIQP KKT solver %s is not available'
+                                     % kkt_solver)
+                m.settings.kkt_solver = getattr(piqp.KKTSolver, kkt_solver)
+
+            if backend == 'dense':
+                m.setup(problem['P'].toarray(), problem['q'],
+                        problem['A_eq'].toarray(), problem['b'],
+                        problem['G'].toarray(), problem['h'],
+                        problem['xl'], problem['xu'])
+            else:
+                m.setup(problem['P'], problem['q'],
+                        problem['A_eq'], problem['b'],
+                        problem['G'], problem['h'],
+                        problem['xl'], problem['xu'])
+            self._model = m
 
         # Solve
-        m.solve()
+        if trace:
+            with stdout_captured() as log:
+                m.solve()
+        else:
+            m.solve()
+        t_solved = time.perf_counter()
         status = self.STATUS_MAP.get(m.result.info.status, s.SOLVER_ERROR)
 
         y = np.zeros(problem['m'])
@@ -62,7 +142,8 @@ class PIQPSolver(object):
             if not is_qp_solution_optimal(problem,
                                           m.result.x,
                                           y,
-                                          high_accuracy=high_accuracy):
+                                          high_accuracy=high_accuracy,
+                                          strict=strict_optimality):
                 status = s.SOLVER_ERROR
 
         # Verify solver time
@@ -80,5 +161,35 @@ class PIQPSolver(object):
         return_results.setup_time = m.result.info.setup_time
         return_results.solve_time = m.result.info.solve_time
         return_results.update_time = m.result.info.update_time
+        return_results.backend = backend
+        if trace:
+            return_results.trace = parse_piqp_log(log[0],
+                                                  m.result.info.setup_time,
+                                                  m.result.info.run_time)
+        return_results.extraction_time = time.perf_counter() - t_solved
 
         return return_results
+
+    @classmethod
+    def choose_backend(cls, problem, max_n=None, min_density=None):
+        '''
+        Choose between the dense and sparse backend from the problem
+        dimensions and density
+
+        Args:
+            problem: QP problem structure
+            max_n: largest number of variables of the dense backend
+                   (DENSE_MAX_N if None)
+            min_density: smallest density of the dense backend
+                         (DENSE_MIN_DENSITY if None)
+        '''
+        if max_n is None:
+            max_n = cls.DENSE_MAX_N
+        if min_density is None:
+            min_density = cls.DENSE_MIN_DENSITY
+        n = problem['n']
+        m = problem['m']
+        density = (problem['P'].nnz + problem['A'].nnz) / (n * (n + m))
+        if n <= max_n and density >= min_density:
+            return 'dense'
+        return 'sparse'
@@ -1,8 +1,10 @@
+import time
 import numpy as np
 from proxsuite import proxqp
 from . import statuses as s
 from .results import Results
 from utils.general import is_qp_solution_optimal
+from utils.trace import make_trace
 
 
 class PROXQPSolver(object):
@@ -17,18 +19,24 @@ class PROXQPSolver(object):
         Initialize solver object by setting require settings
         '''
         self._settings = settings
+        self._qp = None
 
     @property
     def settings(self):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             problem: problem structure with QP matrices
+            warm_start: update the vectors of the previously solved
+                        problem and warm start from its solution
+
+        A new problem is warm started from example.initial_guess = (x, y),
+        if the example has one.
 
         Returns:
             Results structure
@@ -37,6 +45,9 @@ class PROXQPSolver(object):
         settings = self._settings.copy()
         time_limit = settings.pop('time_limit', None)
         high_accuracy = settings.pop('high_accuracy', None)
+        strict_optimality = settings.pop('strict_optimality', False)
+        # PROXQP neither logs nor reports its iterations
+        trace = settings.pop('trace', False)
 
         l_inf = problem['l']
         u_inf = problem['u']
@@ -56,13 +67,43 @@ class PROXQPSolver(object):
         cl = l_inf[ineq_rows]
         cu = u_inf[ineq_rows]
 
-        result = proxqp.sparse.solve(
-            problem['P'], problem['q'],
-            A, b,
-            C, cl, cu,
-            **settings,
-        )
-        
+        if warm_start:
+            if self._qp is not None:
+                # Update PROXQP and warm start from the previous result
+                qp = self._qp
+                qp.update(g=problem['q'], b=b, l=cl, u=cu)
+                # The settings might have changed, e.g., in a tolerance ladder
+                for param, value in settings.items():
+                    if hasattr(qp.settings, param):
+                        setattr(qp.settings, param, value)
+                qp.settings.initial_guess = \
+                    proxqp.InitialGuess.WARM_START_WITH_PREVIOUS_RESULT
+            else:
+                # Setup PROXQP model to be updated later
+                qp = proxqp.sparse.QP(problem['n'], A.shape[0], C.shape[0])
+                for param, value in settings.items():
+                    if hasattr(qp.settings, param):
+                        setattr(qp.settings, param, value)
+                qp.init(problem['P'], problem['q'], A, b, C, cl, cu)
+                self._qp = qp
+            qp.solve()
+            result = qp.results
+        else:
+            # Warm start from the initial guess of the example, if any
+            initial_guess = getattr(example, 'initial_guess', None)
+            if initial_guess is not None:
+                settings['x'] = initial_guess[0]
+                settings['y'] = initial_guess[1][eq_rows]
+                settings['z'] = initial_guess[1][ineq_rows]
+                settings['initial_guess'] = proxqp.InitialGuess.WARM_START
+            result = proxqp.sparse.solve(
+                problem['P'], problem['q'],
+                A, b,
+                C, cl, cu,
+                **settings,
+            )
+
+        t_solved = time.perf_counter()
         status = self.STATUS_MAP.get(result.info.status, s.SOLVER_ERROR)
 
         y = np.zeros(problem['m'])
@@ -73,7 +114,8 @@ class PROXQPSolver(object):
             if not is_qp_solution_optimal(problem,
                                           result.x,
                                           y,
-                                          high_accuracy=high_accuracy):
+                                          high_accuracy=high_accuracy,
+                                          strict=strict_optimality):
                 status = s.SOLVER_ERROR
 
         # Verify solver time
@@ -90,5 +132,8 @@ class PROXQPSolver(object):
 
         return_results.setup_time = result.info.setup_time * 1e-6
         return_results.solve_time = result.info.solve_time * 1e-6
+        if trace:
+            return_results.trace = make_trace([])
+        return_results.extraction_time = time.perf_counter() - t_solved
 
         return return_results
@@ -1,3 +1,4 @@
+import time
 import qpalm
 from . import statuses as s
 from .results import Results
@@ -17,18 +18,24 @@ class QPALMSolver(object):
         Initialize solver object by setting require settings
         '''
         self._settings = settings
+        self._solver = None
 
     @property
     def settings(self):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             problem: problem structure with QP matrices
+            warm_start: update the vectors of the previously solved
+                        problem and warm start from its solution
+
+        A new problem is warm started from example.initial_guess = (x, y),
+        if the example has one.
 
         Returns:
             Results structure
@@ -36,29 +43,50 @@ class QPALMSolver(object):
         problem = example.qp_problem
         settings = self._settings.copy()
         high_accuracy = settings.pop('high_accuracy', None)
-
-        # Setup QPALM
-        data = qpalm.Data(problem['P'].shape[0], problem['A'].shape[0])
-        data.Q = problem['P']
-        data.q = problem['q']
-        data.A = problem['A']
-        data.bmin = problem['l']
-        data.bmax = problem['u']
+        strict_optimality = settings.pop('strict_optimality', False)
 
         qpalm_settings = qpalm.Settings()
         for param, value in settings.items():
             if hasattr(qpalm_settings, param):
                 setattr(qpalm_settings, param, value)
 
-        solver = qpalm.Solver(data, qpalm_settings)
+        if warm_start and self._solver is not None:
+            # Update QPALM
+            solver = self._solver
+            x = solver.solution.x.copy()
+            y = solver.solution.y.copy()
+            # The settings might have changed, e.g., in a tolerance ladder
+            solver.update_settings(qpalm_settings)
+            solver.update_q(problem['q'])
+            solver.update_bounds(bmin=problem['l'], bmax=problem['u'])
+            solver.warm_start(x, y)
+        else:
+            # Setup QPALM
+            data = qpalm.Data(problem['P'].shape[0], problem['A'].shape[0])
+            data.Q = problem['P']
+            data.q = problem['q']
+            data.A = problem['A']
+            data.bmin = problem['l']
+            data.bmax = problem['u']
+
+            solver = qpalm.Solver(data, qpalm_settings)
+            self._solver = solver
+
+            # Warm start from the initial guess of the example, if any
+            initial_guess = getattr(example, 'initial_guess', None)
+            if initial_guess is not None:
+                solver.warm_start(initial_guess[0], initial_guess[1])
+
         solver.solve()
+        t_solved = time.perf_counter()
         status = self.STATUS_MAP.get(solver.info.status, s.SOLVER_ERROR)
 
         if status in s.SOLUTION_PRESENT:
             if not is_qp_solution_optimal(problem,
                                           solver.solution.x,
                                           solver.solution.y,
-                                          high_accuracy=high_accuracy):
+                                          high_accuracy=high_accuracy,
+                                          strict=strict_optimality):
                 status = s.SOLVER_ERROR
 
         # Verify solver time
@@ -75,5 +103,6 @@ class QPALMSolver(object):
 
         return_results.setup_time = solver.info.setup_time
         return_results.solve_time = solver.info.solve_time
+        return_results.extraction_time = time.perf_counter() - t_solved
 
         return return_results
@@ -2,7 +2,8 @@ import qpoases
 import numpy as np
 from . import statuses as s
 from .results import Results
-from utils.general import is_qp_solution_optimal, stdout_redirected
+from utils.general import is_qp_solution_optimal, stdout_redirected, \
+    estimate_dense_memory
 
 
 class qpOASESSolver(object):
@@ -13,27 +14,37 @@ class qpOASESSolver(object):
                   _PyReturnValue.INIT_FAILED_INFEASIBILITY:
                   s.PRIMAL_INFEASIBLE,
                   _PyReturnValue.INIT_FAILED_UNBOUNDEDNESS: s.DUAL_INFEASIBLE,
+                  _PyReturnValue.HOTSTART_STOPPED_INFEASIBILITY:
+                  s.PRIMAL_INFEASIBLE,
+                  _PyReturnValue.HOTSTART_STOPPED_UNBOUNDEDNESS:
+                  s.DUAL_INFEASIBLE,
                   _PyReturnValue.MAX_NWSR_REACHED: s.MAX_ITER_REACHED,
                   _PyReturnValue.INIT_FAILED: s.SOLVER_ERROR
                   }
 
+    # qpOASES infinity
+    INFTY = 1e20
+
     def __init__(self, settings={}):
         '''
         Initialize solver object by setting require settings
         '''
         self._settings = settings
+        self._qpoases_m = None
 
     @property
     def settings(self):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             example: example object
+            warm_start: hotstart from the active set of the previously
+                        solved problem
 
         Returns:
             Results structure
@@ -41,89 +52,74 @@ class qpOASESSolver(object):
         p = example.qp_problem
         n, m = p['n'], p['m']
 
-        # Get number of nonzeros to check if problem is too big
-        N = 0
-        if p['P'] is not None:
-            N += p['P'].nnz
-        if p['A'] is not None:
-            N += p['A'].nnz
-
-
-        # Too large for qpOASES crashing the server (it reaches anyway the time-limit way before!)
-        if example.name == 'Huber' and N > 250000:
-            return Results(s.MAX_ITER_REACHED, None, None, None,
-                           1000.0, 1000)
-
-        if p['P'] is not None:
-            P = np.ascontiguousarray(p['P'].todense())
-
-        if 'A_nobounds' in p:
-            A = np.ascontiguousarray(p['A_nobounds'].todense())
-            m = A.shape[0]
-        elif p['A'] is not None:
-            A = np.ascontiguousarray(p['A'].todense())
-
-        # Define contiguous array vectors
+        # Constraints without the variable bounds,
+        # i.e., A == vstack([C, spa.eye(n)])
+        C = p['A'][:-n]
+        m_C = C.shape[0]
+
+        # Check memory of the dense matrices before converting them
+        # (the python interface of qpOASES only takes dense matrices)
+        dense_memory_limit = self._settings.get('dense_memory_limit')
+        if dense_memory_limit is not None and \
+                estimate_dense_memory(n, m_C) > dense_memory_limit:
+            if self._settings.get('verbose'):
+                print("Dense qpOASES matrices exceed the memory limit\n")
+            return Results(s.MEMORY_LIMIT, None, None, None,
+                           None, None)
+
+        P = np.ascontiguousarray(p['P'].toarray())
+        A = np.ascontiguousarray(C.toarray())
+
+        # Define contiguous array vectors with qpOASES infinity
         q = np.ascontiguousarray(p['q'])
+        l = np.ascontiguousarray(np.clip(p['l'][:-n], -self.INFTY, self.INFTY))
+        u = np.ascontiguousarray(np.clip(p['u'][:-n], -self.INFTY, self.INFTY))
+        lx = np.ascontiguousarray(np.clip(p['xl'], -self.INFTY, self.INFTY))
+        ux = np.ascontiguousarray(np.clip(p['xu'], -self.INFTY, self.INFTY))
 
-        if 'l_nobounds' in p:
-            l = np.ascontiguousarray(p['l_nobounds'])
+        if 'time_limit' in self._settings:
+            qpoases_cpu_time = np.array([self._settings['time_limit']])
         else:
-            l = np.ascontiguousarray(p['l'])
+            # Set default to max 10 seconds in runtime
+            qpoases_cpu_time = np.array([10.])
 
-        if 'u_nobounds' in p:
-            u = np.ascontiguousarray(p['u_nobounds'])
+        if 'nWSR' in self._settings:
+            qpoases_nWSR = np.array([self._settings['nWSR']])
         else:
-            u = np.ascontiguousarray(p['u'])
+            # Set default to max 1000000 working set recalculations
+            qpoases_nWSR = np.array([1000000])
 
-        if 'lx' in p:
-            lx = np.ascontiguousarray(p['lx'])
+        if warm_start and self._qpoases_m is not None:
+            # Hotstart from the previous active set
+            qpoases_m = self._qpoases_m
+            status = qpoases_m.hotstart(P, q, A, lx, ux, l, u,
+                                        qpoases_nWSR, qpoases_cpu_time)
         else:
-            lx = np.ascontiguousarray(-np.inf * np.ones(n))
+            # Redirect output if verbose is False
+            if self._settings.get('verbose'):
+                qpoases_m = qpoases.PySQProblem(n, m_C)
+            else:
+                # Suppress output also if we do not specify verbose
+                with stdout_redirected():
+                    qpoases_m = qpoases.PySQProblem(n, m_C)
 
-        if 'ux' in p:
-            ux = np.ascontiguousarray(p['ux'])
-        else:
-            ux = np.ascontiguousarray(np.inf * np.ones(n))
+            options = qpoases.PyOptions()
 
-        # Redirect output if verbose is False
-        if 'verbose' in self._settings:
-            if self._settings['verbose'] is False:
-                with stdout_redirected():
-                    qpoases_m = qpoases.PyQProblem(n, m)
-            else:
-                qpoases_m = qpoases.PyQProblem(n, m)
-        else:
-            # Suppress output also if we do not specify verbose
-            with stdout_redirected():
-                qpoases_m = qpoases.PyQProblem(n, m)
-
-        options = qpoases.PyOptions()
-
-        for param, value in self._settings.items():
-            if param == 'verbose':
-                if value is False:
-                    options.printLevel = qpoases.PyPrintLevel.NONE
-            elif param == 'time_limit':
-                qpoases_cpu_time = np.array([value])
-            elif param == 'nWSR':
-                qpoases_nWSR = np.array([value])
-            elif param != "high_accuracy":
-                exec("options.%s = %s" % (param, value))
-
-        qpoases_m.setOptions(options)
-
-        if 'time_limit' not in self._settings:
-            # Set default to max 10 seconds in runtime
-            qpoases_cpu_time = np.array([10.])
+            for param, value in self._settings.items():
+                if param == 'verbose':
+                    if value is False:
+                        options.printLevel = qpoases.PyPrintLevel.NONE
+                elif param not in ['time_limit', 'nWSR', 'high_accuracy',
+                                   'strict_optimality', 'dense_memory_limit',
+                                   'trace']:
+                    exec("options.%s = %s" % (param, value))
 
-        if 'nWSR' not in self._settings:
-            # Set default to max 1000000 working set recalculations
-            qpoases_nWSR = np.array([1000000])
+            qpoases_m.setOptions(options)
 
-        # Solve problem
-        status = qpoases_m.init(P, q, A, lx, ux, l, u,
-                                qpoases_nWSR, qpoases_cpu_time)
+            # Solve problem
+            status = qpoases_m.init(P, q, A, lx, ux, l, u,
+                                    qpoases_nWSR, qpoases_cpu_time)
+            self._qpoases_m = qpoases_m
 
         # Check status
         status = self.STATUS_MAP.get(status, s.SOLVER_ERROR)
@@ -136,29 +132,29 @@ class qpOASESSolver(object):
 
         if status in s.SOLUTION_PRESENT:
             x = np.zeros(n)
-            y_temp = np.zeros(n + m)
+            y_temp = np.zeros(n + m_C)
             obj_val = qpoases_m.getObjVal()
             qpoases_m.getPrimalSolution(x)
             qpoases_m.getDualSolution(y_temp)
 
-            # Change sign
-            y = -y_temp[n:]
+            # Change sign and reconstruct the dual variables of the
+            # constraints followed by the ones of the variable bounds
+            y = -np.concatenate((y_temp[n:], y_temp[:n]))
 
-            if 'A_nobounds' in p:
-                # If explicit bounds provided, reconstruct dual variable
-                # Bounds on all the variables
-                y_bounds = -y_temp[:n]
-                # Limit to only the actual bounds
-                y_bounds = y_bounds[p['bounds_idx']]
-
-                y = np.concatenate((y, y_bounds))
-
-            if not is_qp_solution_optimal(p, x, y, self._settings.get('high_accuracy')):
+            if not is_qp_solution_optimal(p, x, y,
+                                          high_accuracy=self._settings.get('high_accuracy'),
+                                          strict=self._settings.get('strict_optimality', False)):
                 status = s.SOLVER_ERROR
 
+            # Verify solver time
+            if 'time_limit' in self._settings:
+                if run_time > self._settings['time_limit']:
+                    status = s.TIME_LIMIT
+
             return Results(status, obj_val,
                            x, y,
                            run_time, niter)
         else:
+            self._qpoases_m = None
             return Results(status, None, None, None,
                            run_time, niter)
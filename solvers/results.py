@@ -9,3 +9,8 @@ class Results(object):
         self.y = y
         self.run_time = run_time
         self.niter = niter
+        # Convergence trace, see utils/trace.py
+        self.trace = None
+        # Time from the return of the solver to the return of the wrapper,
+        # i.e., extraction of the results and optimality check
+        self.extraction_time = None
@@ -1,10 +1,13 @@
+import time
+from contextlib import nullcontext
 import numpy as np
 import scipy.sparse as spa
 from scipy.sparse import csc_matrix
-from scs import solve
+from scs import solve, SCS
 from . import statuses as s
 from .results import Results
 from utils.general import is_qp_solution_optimal
+from utils.trace import stdout_captured, parse_scs_log
 
 
 class SCSSolver(object):
@@ -18,18 +21,21 @@ class SCSSolver(object):
         Initialize solver object by setting require settings
         '''
         self._settings = settings
+        self._result = None
 
     @property
     def settings(self):
         """Solver settings"""
         return self._settings
 
-    def solve(self, example):
+    def solve(self, example, warm_start=False):
         '''
         Solve problem
 
         Args:
             problem: problem structure with QP matrices
+            warm_start: warm start from the solution of the previously
+                        solved problem
 
         Returns:
             Results structure
@@ -39,6 +45,11 @@ class SCSSolver(object):
         settings['time_limit_secs'] = settings['time_limit']
         time_limit = settings.pop('time_limit', None)
         high_accuracy = settings.pop('high_accuracy', None)
+        strict_optimality = settings.pop('strict_optimality', False)
+        trace = settings.pop('trace', False)
+        if trace:
+            # The iterations are parsed from the log
+            settings['verbose'] = True
 
         l_inf = problem['l']
         u_inf = problem['u']
@@ -69,8 +80,19 @@ class SCSSolver(object):
         cone['bl'] = cl
         cone['bu'] = cu
 
-        result = solve(data, cone, **settings)
-        
+        with stdout_captured() if trace else nullcontext([]) as log:
+            if warm_start and self._result is not None:
+                # The box cone bounds cannot be updated: setup SCS again
+                result = SCS(data, cone, **settings).solve(
+                    warm_start=True,
+                    x=self._result['x'],
+                    y=self._result['y'],
+                    s=self._result['s'])
+            else:
+                result = solve(data, cone, **settings)
+        t_solved = time.perf_counter()
+        self._result = result
+
         status = self.STATUS_MAP.get(result['info']['status_val'], s.SOLVER_ERROR)
 
         y = np.zeros(problem['m'])
@@ -81,7 +103,8 @@ class SCSSolver(object):
             if not is_qp_solution_optimal(problem,
                                           result['x'],
                                           y,
-                                          high_accuracy=high_accuracy):
+                                          high_accuracy=high_accuracy,
+                                          strict=strict_optimality):
                 status = s.SOLVER_ERROR
 
         run_time = result['info']['setup_time'] * 1e-3 + result['info']['solve_time'] * 1e-3
@@ -100,5 +123,9 @@ class SCSSolver(object):
 
         return_results.setup_time = result['info']['setup_time'] * 1e-3
         return_results.solve_time = result['info']['solve_time'] * 1e-3
+        if trace:
+            return_results.trace = parse_scs_log(log[0],
+                                                 return_results.setup_time)
+        return_results.extraction_time = time.perf_counter() - t_solved
 
         return return_results
@@ -1,35 +1,63 @@
+import os
+from solvers.auto import AUTOSolver
 from solvers.clarabel import ClarabelSolver
 from solvers.ecos import ECOSSolver
 from solvers.gurobi import GUROBISolver
+from solvers.highs import HiGHSSolver
 from solvers.mosek import MOSEKSolver
 from solvers.osqp import OSQPSolver
 from solvers.piqp import PIQPSolver
 from solvers.proxqp import PROXQPSolver
 from solvers.qpalm import QPALMSolver
 from solvers.scs import SCSSolver
+try:
+    # qpOASES is built from source and might not be available
+    from solvers.qpoases import qpOASESSolver
+except ImportError:
+    qpOASESSolver = None
 
+AUTO = 'AUTO'
+AUTO_high = AUTO + '_high'
 CLARABEL = 'CLARABEL'
 CLARABEL_high = CLARABEL + "_high"
 ECOS = 'ECOS'
 ECOS_high = ECOS + "_high"
 GUROBI = 'GUROBI'
 GUROBI_high = GUROBI + "_high"
+HIGHS = 'HIGHS'
+HIGHS_high = HIGHS + "_high"
 OSQP = 'OSQP'
 OSQP_high = OSQP + '_high'
 OSQP_polish = OSQP + '_polish'
 OSQP_polish_high = OSQP_polish + '_high'
 PIQP = 'PIQP'
 PIQP_high = PIQP + '_high'
+PIQP_dense = PIQP + '_dense'
+PIQP_dense_high = PIQP_dense + '_high'
+PIQP_sparse_ldlt_eq_cond = PIQP + '_sparse_ldlt_eq_cond'
+PIQP_sparse_ldlt_eq_cond_high = PIQP_sparse_ldlt_eq_cond + '_high'
+PIQP_sparse_ldlt_ineq_cond = PIQP + '_sparse_ldlt_ineq_cond'
+PIQP_sparse_ldlt_ineq_cond_high = PIQP_sparse_ldlt_ineq_cond + '_high'
+PIQP_sparse_ldlt_cond = PIQP + '_sparse_ldlt_cond'
+PIQP_sparse_ldlt_cond_high = PIQP_sparse_ldlt_cond + '_high'
+PIQP_sparse_multistage = PIQP + '_sparse_multistage'
+PIQP_sparse_multistage_high = PIQP_sparse_multistage + '_high'
+PIQP_auto = PIQP + '_auto'
+PIQP_auto_high = PIQP_auto + '_high'
 PROXQP = 'PROXQP'
 PROXQP_high = PROXQP + '_high'
 QPALM = 'QPALM'
 QPALM_high = QPALM + '_high'
+QPOASES = 'qpOASES'
+QPOASES_high = QPOASES + '_high'
 SCS = 'SCS'
 SCS_high = SCS + '_high'
 MOSEK = 'MOSEK'
 MOSEK_high = MOSEK + "_high"
 
-SOLVER_MAP = {CLARABEL: ClarabelSolver,
+SOLVER_MAP = {AUTO: AUTOSolver,
+              AUTO_high: AUTOSolver,
+              CLARABEL: ClarabelSolver,
               CLARABEL_high: ClarabelSolver,
               OSQP: OSQPSolver,
               OSQP_high: OSQPSolver,
@@ -37,6 +65,18 @@ SOLVER_MAP = {CLARABEL: ClarabelSolver,
               OSQP_polish_high: OSQPSolver,
               PIQP: PIQPSolver,
               PIQP_high: PIQPSolver,
+              PIQP_dense: PIQPSolver,
+              PIQP_dense_high: PIQPSolver,
+              PIQP_sparse_ldlt_eq_cond: PIQPSolver,
+              PIQP_sparse_ldlt_eq_cond_high: PIQPSolver,
+              PIQP_sparse_ldlt_ineq_cond: PIQPSolver,
+              PIQP_sparse_ldlt_ineq_cond_high: PIQPSolver,
+              PIQP_sparse_ldlt_cond: PIQPSolver,
+              PIQP_sparse_ldlt_cond_high: PIQPSolver,
+              PIQP_sparse_multistage: PIQPSolver,
+              PIQP_sparse_multistage_high: PIQPSolver,
+              PIQP_auto: PIQPSolver,
+              PIQP_auto_high: PIQPSolver,
               PROXQP: PROXQPSolver,
               PROXQP_high: PROXQPSolver,
               QPALM: QPALMSolver,
@@ -45,13 +85,20 @@ SOLVER_MAP = {CLARABEL: ClarabelSolver,
               SCS_high: SCSSolver,
               GUROBI: GUROBISolver,
               GUROBI_high: GUROBISolver,
+              HIGHS: HiGHSSolver,
+              HIGHS_high: HiGHSSolver,
               MOSEK: MOSEKSolver,
               MOSEK_high: MOSEKSolver,
               ECOS: ECOSSolver,
               ECOS_high: ECOSSolver
              }
 
+if qpOASESSolver is not None:
+    SOLVER_MAP[QPOASES] = qpOASESSolver
+    SOLVER_MAP[QPOASES_high] = qpOASESSolver
+
 time_limit = 1000. # Seconds
+dense_memory_limit = 2e09 # Bytes
 eps_abs_low = 1e-03
 eps_rel_low = 1e-04
 eps_abs_high = 1e-08
@@ -59,6 +106,13 @@ eps_rel_high = 1e-09
 
 # Solver settings
 settings = {
+    # Trained with run_solver_selection.py
+    AUTO: {'model_file': os.path.join('.', 'results',
+                                      'maros_meszaros_problems',
+                                      'solver_selection_model.npz')},
+    AUTO_high: {'model_file': os.path.join('.', 'results',
+                                           'maros_meszaros_problems_high_accuracy',
+                                           'solver_selection_model.npz')},
     CLARABEL: {'time_limit': time_limit,
                'tol_feas': eps_abs_low,
                'tol_gap_abs': eps_abs_low,
@@ -165,6 +219,14 @@ settings = {
                   'FeasibilityTol': eps_abs_high,
                   'OptimalityTol': eps_abs_high,
                   },
+    HIGHS: {'threads': 1,
+            'primal_feasibility_tolerance': eps_abs_low,
+            'dual_feasibility_tolerance': eps_abs_low,
+            },
+    HIGHS_high: {'threads': 1,
+                 'primal_feasibility_tolerance': eps_abs_high,
+                 'dual_feasibility_tolerance': eps_abs_high,
+                 },
     MOSEK: {'MSK_IPAR_NUM_THREADS': 1,
             'MSK_DPAR_OPTIMIZER_MAX_TIME': time_limit,
             'MSK_DPAR_INTPNT_CO_TOL_PFEAS': eps_abs_low,   # Primal feasibility tolerance
@@ -176,11 +238,86 @@ settings = {
                  'MSK_DPAR_INTPNT_CO_TOL_DFEAS': eps_abs_high,   # Dual feasibility tolerance
                 },
     ECOS: {'abstol': eps_abs_low,
-           'reltol': eps_rel_low},
+           'reltol': eps_rel_low,
+           'dense_memory_limit': dense_memory_limit},
     ECOS_high: {'abstol': eps_abs_high,
-                'reltol': eps_rel_high}
+                'reltol': eps_rel_high,
+                'dense_memory_limit': dense_memory_limit},
+    QPOASES: {'nWSR': int(1e06),
+              'dense_memory_limit': dense_memory_limit},
+    QPOASES_high: {'nWSR': int(1e06),
+                   'terminationTolerance': eps_abs_high,
+                   'dense_memory_limit': dense_memory_limit}
+}
+
+# PIQP backend and KKT solver variants
+PIQP_BACKENDS = {
+    PIQP_dense: {'backend': 'dense',
+                 'kkt_solver': 'dense_cholesky'},
+    PIQP_sparse_ldlt_eq_cond: {'backend': 'sparse',
+                               'kkt_solver': 'sparse_ldlt_eq_cond'},
+    PIQP_sparse_ldlt_ineq_cond: {'backend': 'sparse',
+                                 'kkt_solver': 'sparse_ldlt_ineq_cond'},
+    PIQP_sparse_ldlt_cond: {'backend': 'sparse',
+                            'kkt_solver': 'sparse_ldlt_cond'},
+    PIQP_sparse_multistage: {'backend': 'sparse',
+                             'kkt_solver': 'sparse_multistage'},
+    PIQP_auto: {'backend': 'auto'},
 }
+for key, backend_settings in PIQP_BACKENDS.items():
+    settings[key] = dict(settings[PIQP], **backend_settings)
+    settings[key + '_high'] = dict(settings[PIQP_high], **backend_settings)
+
+for key in settings:
+    if key.startswith(PIQP):
+        settings[key]['dense_memory_limit'] = dense_memory_limit
 
 for key in settings:
     settings[key]['verbose'] = False
     settings[key]['time_limit'] = time_limit
+
+# Tolerance settings of each solver, i.e., absolute ('abs') or relative
+# ('rel') tolerance
+TOLERANCE_SETTINGS = {
+    CLARABEL: {'tol_feas': 'abs', 'tol_gap_abs': 'abs', 'tol_gap_rel': 'rel'},
+    ECOS: {'feastol': 'abs', 'abstol': 'abs', 'reltol': 'rel'},
+    GUROBI: {'FeasibilityTol': 'abs', 'OptimalityTol': 'abs'},
+    HIGHS: {'primal_feasibility_tolerance': 'abs',
+            'dual_feasibility_tolerance': 'abs'},
+    MOSEK: {'MSK_DPAR_INTPNT_CO_TOL_PFEAS': 'abs',
+            'MSK_DPAR_INTPNT_CO_TOL_DFEAS': 'abs'},
+    OSQP: {'eps_abs': 'abs', 'eps_rel': 'rel'},
+    PIQP: {'eps_abs': 'abs', 'eps_rel': 'rel',
+           'eps_duality_gap_abs': 'abs', 'eps_duality_gap_rel': 'rel'},
+    PROXQP: {'eps_abs': 'abs', 'eps_rel': 'rel',
+             'eps_duality_gap_abs': 'abs', 'eps_duality_gap_rel': 'rel'},
+    QPALM: {'eps_abs': 'abs', 'eps_rel': 'rel'},
+    QPOASES: {'terminationTolerance': 'abs'},
+    SCS: {'eps_abs': 'abs', 'eps_rel': 'rel'},
+}
+
+# Smallest tolerance accepted by GUROBI
+GUROBI_MIN_TOL = 1e-09
+
+
+def settings_with_tolerance(solver, eps_abs, eps_rel):
+    '''
+    Get a copy of the settings of 'solver' with the tolerances eps_abs
+    and eps_rel
+
+    Args:
+        solver: solver name, e.g., OSQP or OSQP_polish_high
+        eps_abs: absolute tolerance
+        eps_rel: relative tolerance
+
+    Returns:
+        settings dictionary
+    '''
+    solver_settings = settings[solver].copy()
+    tolerances = TOLERANCE_SETTINGS[solver.split('_')[0]]
+    for param, kind in tolerances.items():
+        eps = eps_abs if kind == 'abs' else eps_rel
+        if solver.startswith(GUROBI):
+            eps = max(eps, GUROBI_MIN_TOL)
+        solver_settings[param] = eps
+    return solver_settings
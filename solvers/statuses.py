@@ -9,6 +9,7 @@ PRIMAL_OR_DUAL_INFEASIBLE = "primal or dual infeasible"
 SOLVER_ERROR = "solver_error"
 MAX_ITER_REACHED = "max_iter_reached"
 TIME_LIMIT = "time_limit"
+MEMORY_LIMIT = "memory_limit"
 
 #SOLUTION_PRESENT = [OPTIMAL, OPTIMAL_INACCURATE]
 SOLUTION_PRESENT = [OPTIMAL, OPTIMAL]
@@ -0,0 +1,184 @@
+import os
+import time
+from multiprocessing import Pool, cpu_count
+from multiprocessing.pool import ThreadPool
+import numpy as np
+import pandas as pd
+
+from solvers.solvers import SOLVER_MAP
+import solvers.statuses as s
+from problem_classes.maros_meszaros import MarosMeszaros
+from problem_classes.random_qp import RandomQP
+from maros_meszaros_problems.maros_meszaros_problem import PROBLEMS_FOLDER
+from maros_meszaros_problems.maros_meszaros_latency import SMALL_PROBLEMS
+from utils.general import make_sure_path_exists
+
+# Execution models
+THREAD = 'thread'    # thread pool, one problem per task
+PROCESS = 'process'  # process pool, one problem per task
+BATCH = 'batch'      # process pool, one batch of problems per worker
+MODELS = [THREAD, PROCESS, BATCH]
+
+# Sources of the problem stream
+MAROS = 'maros'
+RANDOM = 'random'
+
+# Problems of the worker, set by init_worker
+_problems = None
+
+
+def init_worker(problems):
+    global _problems
+    _problems = problems
+
+
+def solve_stream(solver, settings, indices):
+    '''
+    Solve the problems 'indices' of the worker one after another
+
+    Returns:
+        number of successful solves
+    '''
+    n_solved = 0
+    for i in indices:
+        results = SOLVER_MAP[solver](settings).solve(_problems[i])
+        n_solved += results.status in s.SOLUTION_PRESENT
+    return n_solved
+
+
+class ThroughputRunner(object):
+    '''
+    Throughput runner for streams of small problems
+    '''
+    def __init__(self,
+                 solvers,
+                 settings,
+                 output_folder,
+                 source=MAROS,
+                 n_solves=1000,
+                 max_workers=None,
+                 n=10,
+                 n_instances=100):
+        '''
+        Args:
+            solvers: solver names
+            settings: settings dictionary of each solver
+            output_folder: results folder
+            source: MAROS for the small Maros Meszaros problems or RANDOM
+                    for RandomQP instances
+            n_solves: length of the stream of problems
+            max_workers: largest number of workers, the number of cores
+                         if None
+            n: number of variables of the RandomQP instances
+            n_instances: number of RandomQP instances
+        '''
+        self.solvers = solvers
+        self.settings = settings
+        self.output_folder = output_folder
+        self.n_solves = n_solves
+        self.max_workers = max_workers or cpu_count()
+
+        if source == MAROS:
+            self.problems = [
+                MarosMeszaros(os.path.join(".", "problem_classes",
+                                           PROBLEMS_FOLDER, problem))
+                for problem in SMALL_PROBLEMS]
+        else:
+            self.problems = [RandomQP(n, seed=seed)
+                             for seed in range(n_instances)]
+
+        # Numbers of workers: powers of two up to max_workers
+        self.workers = [2 ** k for k in
+                        range(int(np.log2(self.max_workers)) + 1)]
+        if self.workers[-1] != self.max_workers:
+            self.workers.append(self.max_workers)
+
+    def solve(self):
+        '''
+        Solve the stream of problems with every solver, execution model and
+        number of workers
+
+        The results are stored in
+
+            ./results/{self.output_folder}/throughput.csv
+
+        with fields
+            - 'solver': solver name
+            - 'model': execution model (THREAD, PROCESS or BATCH)
+            - 'workers': number of workers
+            - 'wall_time': time to solve the stream
+            - 'solves_per_second': throughput
+            - 'efficiency': throughput divided by the number of workers
+              times the throughput of one worker of the same model
+            - 'failure_rate': percentage of failed solves
+
+        NB. The thread pool only scales for solvers releasing the GIL.
+        '''
+        print("Measuring throughput of streams of small problems")
+        print("-------------------------------------------------")
+
+        stream = np.arange(self.n_solves) % len(self.problems)
+        row_list = []
+        for solver in self.solvers:
+            settings = self.settings[solver]
+            for model in MODELS:
+                throughput_single = None
+                for workers in self.workers:
+                    print(" - Solving stream with solver %s (%s, %i workers)"
+                          % (solver, model, workers), flush=True)
+                    wall_time, n_solved = self.solve_stream(
+                        solver, settings, model, workers, stream)
+                    throughput = self.n_solves / wall_time
+                    if throughput_single is None:
+                        throughput_single = throughput
+                    row_list.append({
+                        'solver': solver,
+                        'model': model,
+                        'workers': workers,
+                        'wall_time': wall_time,
+                        'solves_per_second': throughput,
+                        'efficiency': throughput /
+                        (workers * throughput_single),
+                        'failure_rate': 100 * (1 - n_solved / self.n_solves)})
+
+        path = os.path.join('.', 'results', self.output_folder)
+        make_sure_path_exists(path)
+        throughput_file = os.path.join(path, 'throughput.csv')
+        print("Saving throughput statistics to %s" % throughput_file)
+        pd.DataFrame(row_list).to_csv(throughput_file, index=False)
+
+    def solve_stream(self, solver, settings, model, workers, stream):
+        '''
+        Solve the problems of 'stream' with 'workers' workers
+
+        The pool is started and warmed up before the timing.
+
+        Returns:
+            wall time, number of successful solves
+        '''
+        if model == THREAD:
+            init_worker(self.problems)
+            pool = ThreadPool(processes=workers)
+        else:
+            pool = Pool(processes=workers, initializer=init_worker,
+                        initargs=(self.problems,))
+
+        if model == BATCH:
+            tasks = np.array_split(stream, workers)
+        else:
+            tasks = [[i] for i in stream]
+
+        pool.starmap(solve_stream, [(solver, settings,
+                                     [i % len(self.problems)])
+                                    for i in range(workers)])
+
+        t_start = time.perf_counter()
+        n_solved = pool.starmap(solve_stream,
+                                [(solver, settings, task) for task in tasks],
+                                1)
+        wall_time = time.perf_counter() - t_start
+
+        pool.close()  # Not accepting any more jobs on this pool
+        pool.join()   # Wait for all processes to finish
+
+        return wall_time, sum(n_solved)
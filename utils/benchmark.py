@@ -3,6 +3,9 @@ import pandas as pd
 import numpy as np
 import solvers.statuses as statuses
 from solvers.solvers import time_limit
+from solvers.piqp import PIQPSolver
+from utils.general import make_sure_path_exists
+from utils.trace import time_to_tolerance
 
 # Plotting
 import matplotlib
@@ -26,6 +29,7 @@ def plot_performance_profiles(problems, solvers):
 
     df = pd.read_csv('./results/%s/performance_profiles.csv' % problems)
     plt.figure(0)
+    plt.clf()
     for solver in solvers:
         plt.plot(df["tau"].to_numpy(), df[solver].to_numpy(), label=solver.replace('_high', ''))
     plt.xlim(1., 10000.)
@@ -36,10 +40,11 @@ def plot_performance_profiles(problems, solvers):
     plt.legend()
     plt.grid()
     plt.show(block=False)
-    results_file = './results/%s/%s.png' % (problems, problems)
+    plot_name = os.path.basename(problems)
+    results_file = './results/%s/%s.png' % (problems, plot_name)
     print("Saving plots to %s" % results_file)
     plt.savefig(results_file, dpi=300)
-    results_file = './results/%s/%s.pdf' % (problems, problems)
+    results_file = './results/%s/%s.pdf' % (problems, plot_name)
     print("Saving plots to %s" % results_file)
     plt.savefig(results_file, bbox_inches='tight')
 
@@ -449,6 +454,522 @@ def compute_rho_updates(problems_type, high_accuracy=False):
     df_ratio.to_frame().transpose().to_csv(rho_updates_file, index=False)
 
 
+def fit_piqp_backend_crossover(problems_type, sparse_solver, dense_solver):
+    """
+    Fit the crossover between the dense and sparse backends of PIQP, i.e.,
+    the largest number of variables and the smallest density of the dense
+    backend minimizing the shifted geometric mean of the run times
+
+    The crossover is stored in piqp_backend_crossover.csv with the fields
+    'max_n' and 'density_threshold' read by load_piqp_backend_crossover.
+    """
+    df_sparse = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                         sparse_solver, 'results.csv'))
+    df_dense = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                        dense_solver, 'results.csv'))
+    df = df_sparse.merge(df_dense, on=['name', 'n', 'm', 'N'],
+                         suffixes=('_sparse', '_dense'))
+
+    t_sparse = df['run_time_sparse'].values.astype(float)
+    t_dense = df['run_time_dense'].values.astype(float)
+    t_sparse[~df['status_sparse'].isin(statuses.SOLUTION_PRESENT).values] = MAX_TIMING
+    t_dense[~df['status_dense'].isin(statuses.SOLUTION_PRESENT).values] = MAX_TIMING
+
+    n = df['n'].values
+    density = df['N'].values / (n * (n + df['m'].values))
+
+    # Candidate thresholds (a density above the maximum means sparse only)
+    max_n_candidates = np.unique(n)
+    density_candidates = np.append(np.unique(density), np.inf)
+    best = (np.inf, PIQPSolver.DENSE_MAX_N, np.inf)
+    for max_n in max_n_candidates:
+        for d in density_candidates:
+            g_mean = geom_mean(np.where((n <= max_n) & (density >= d),
+                                        t_dense, t_sparse))
+            if g_mean < best[0]:
+                best = (g_mean, max_n, d)
+
+    crossover = {'max_n': best[1],
+                 'density_threshold': best[2],
+                 'geom_mean_auto': best[0],
+                 'geom_mean_sparse': geom_mean(t_sparse),
+                 'geom_mean_dense': geom_mean(t_dense)}
+
+    df_crossover = pd.Series(crossover)
+    crossover_file = os.path.join('.', 'results', problems_type,
+                                  'piqp_backend_crossover.csv')
+    df_crossover.to_frame().transpose().to_csv(crossover_file, index=False)
+
+    return best[1], best[2]
+
+
+def load_piqp_backend_crossover(problems_type):
+    """
+    Load the crossover fitted by fit_piqp_backend_crossover as the settings
+    'dense_max_n' and 'dense_min_density' of PIQP
+
+    Returns:
+        settings dictionary, None if the crossover was not fitted
+    """
+    crossover_file = os.path.join('.', 'results', problems_type,
+                                  'piqp_backend_crossover.csv')
+    if not os.path.isfile(crossover_file):
+        return None
+    crossover = pd.read_csv(crossover_file).iloc[0]
+    return {'dense_max_n': int(crossover['max_n']),
+            'dense_min_density': float(crossover['density_threshold'])}
+
+
+def compute_cvxpy_overhead(solvers, problems_type):
+    """
+    Compute the share of the CVXPY compile, solve and retrieval phases in
+    the run time on the problems solved by each solver
+    """
+    overhead_file = os.path.join(".", "results", problems_type,
+                                 "cvxpy_overhead.csv")
+
+    row_list = []
+    for solver in solvers:
+        path = os.path.join('.', 'results', problems_type,
+                            solver, 'results.csv')
+        df = pd.read_csv(path)
+        df = df.loc[df['status'].isin(statuses.SOLUTION_PRESENT)]
+        if len(df) == 0:
+            continue
+
+        run_time = df['run_time'].values
+        row = {'solver': solver, 'n_problems': len(df)}
+        for phase in ['compile', 'solve', 'retrieval', 'recompile']:
+            phase_time = df['%s_time' % phase].values
+            row['median_%s_time' % phase] = np.nanmedian(phase_time)
+            row['median_%s_percentage' % phase] = \
+                np.nanmedian(100 * phase_time / run_time)
+        row['median_compile_recompile_ratio'] = \
+            np.nanmedian(df['compile_time'].values /
+                         df['recompile_time'].values)
+        row_list.append(row)
+
+    df_overhead = pd.DataFrame(row_list)
+    df_overhead.to_csv(overhead_file, index=False)
+
+
+def compute_tolerance_ladder(solvers, problems_type, tolerances,
+                             performance_profiles=True):
+    """
+    Compute the failure rates, shifted geometric means and performance
+    profiles at each tolerance of the ladder, and the time versus accuracy
+    curves of the solvers
+    """
+    row_list = []
+    for eps in tolerances:
+        tolerance_type = os.path.join(problems_type, 'eps_%.0e' % eps)
+        compute_failure_rates(solvers, tolerance_type)
+        compute_performance_profiles(solvers, tolerance_type)
+        compute_shifted_geometric_means(solvers, tolerance_type)
+        if performance_profiles:
+            plot_performance_profiles(tolerance_type, solvers)
+
+        for solver in solvers:
+            df = pd.read_csv(os.path.join('.', 'results', tolerance_type,
+                                          solver, 'results.csv'))
+            failed = ~df['status'].isin(statuses.SOLUTION_PRESENT).values
+            t = df['run_time'].values.astype(float)
+            t[failed] = MAX_TIMING
+            row_list.append({'solver': solver,
+                             'eps_abs': eps,
+                             'geom_mean': geom_mean(t),
+                             'failure_rate': 100 * np.mean(failed)})
+
+    df_ladder = pd.DataFrame(row_list)
+    ladder_file = os.path.join('.', 'results', problems_type,
+                               'tolerance_ladder.csv')
+    df_ladder.to_csv(ladder_file, index=False)
+
+    plot_tolerance_ladder(problems_type, solvers)
+
+
+def plot_tolerance_ladder(problems, solvers):
+    """
+    Plot shifted geometric mean of the run times versus tolerance
+    """
+    df = pd.read_csv('./results/%s/tolerance_ladder.csv' % problems)
+
+    plt.figure(3)
+    plt.clf()
+    maker_shapes = ['o', 's', 'd', 'v', '^', '*', 'P', '<', '>', 'X']
+    for i, solver in enumerate(solvers):
+        df_solver = df.loc[df['solver'] == solver]
+        plt.plot(df_solver['eps_abs'].to_numpy(),
+                 df_solver['geom_mean'].to_numpy(),
+                 marker=maker_shapes[i % len(maker_shapes)],
+                 label=solver.replace('_high', ''))
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.gca().invert_xaxis()
+    plt.xlabel(r'Tolerance $\epsilon_{\mathrm{abs}}$')
+    plt.ylabel('Shifted geometric mean')
+    plt.legend()
+    plt.grid()
+    plt.show(block=False)
+    results_file = './results/%s/tolerance_ladder.png' % problems
+    print("Saving plots to %s" % results_file)
+    plt.savefig(results_file, dpi=300)
+    results_file = './results/%s/tolerance_ladder.pdf' % problems
+    print("Saving plots to %s" % results_file)
+    plt.savefig(results_file, bbox_inches='tight')
+
+
+def compute_time_to_tolerance(solvers, problems_type, tolerances,
+                              rel_factor=0.1, performance_profiles=True):
+    """
+    Compute the time to reach each tolerance from the convergence traces
+    and the performance profiles at each tolerance
+
+    A trace reaches the absolute tolerance eps_abs if its residuals are
+    below eps_abs + eps_rel * scale with eps_rel = rel_factor * eps_abs,
+    i.e., the criterion of is_qp_solution_optimal, where the scales are the
+    ones of the returned solution. Without solution the scales are zero.
+
+    A problem without trace, e.g., if the solver crashed, or whose trace
+    never reaches the tolerance counts as a failure.
+    """
+    scale_columns = ['pri_scale', 'dua_scale', 'gap_scale']
+    row_list = []
+    for solver in solvers:
+        df = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                      solver, 'results.csv'))
+        for column in scale_columns:
+            if column not in df:
+                df[column] = 0.
+        traces_dir = os.path.join('.', 'results', problems_type,
+                                  solver, 'traces')
+        for _, row in df.iterrows():
+            problem = row['name']
+            trace_file = os.path.join(traces_dir, problem + '.npy')
+            trace = np.load(trace_file) if os.path.isfile(trace_file) \
+                else None
+            scales = np.nan_to_num(row[scale_columns].values.astype(float))
+            for eps_abs in tolerances:
+                eps_rel = rel_factor * eps_abs
+                row_list.append({'name': problem,
+                                 'solver': solver,
+                                 'eps_abs': eps_abs,
+                                 'eps_rel': eps_rel,
+                                 'time': time_to_tolerance(trace, eps_abs,
+                                                           eps_rel,
+                                                           scales)})
+
+    df_tol = pd.DataFrame(row_list)
+    tol_file = os.path.join('.', 'results', problems_type,
+                            'time_to_tolerance.csv')
+    df_tol.to_csv(tol_file, index=False)
+
+    # Store the times as results of the solvers at each tolerance
+    for eps_abs in tolerances:
+        tolerance_type = os.path.join(problems_type, 'time_to_tolerance',
+                                      'eps_abs_%.0e' % eps_abs)
+        for solver in solvers:
+            path = os.path.join('.', 'results', tolerance_type, solver)
+            make_sure_path_exists(path)
+            df_solver = df_tol.loc[(df_tol['solver'] == solver) &
+                                   (df_tol['eps_abs'] == eps_abs)]
+            reached = np.isfinite(df_solver['time'].values)
+            pd.DataFrame({
+                'name': df_solver['name'].values,
+                'solver': solver,
+                'status': np.where(reached, statuses.OPTIMAL,
+                                   statuses.SOLVER_ERROR),
+                'run_time': np.where(reached, df_solver['time'].values,
+                                     MAX_TIMING)
+            }).to_csv(os.path.join(path, 'results.csv'), index=False)
+
+        compute_failure_rates(solvers, tolerance_type)
+        compute_performance_profiles(solvers, tolerance_type)
+        compute_shifted_geometric_means(solvers, tolerance_type)
+        if performance_profiles:
+            plot_performance_profiles(tolerance_type, solvers)
+
+
+def compute_scaling_curves(solvers, problems_type, by_problem=False):
+    """
+    Compute the run time versus problem size curves of the solvers, i.e.,
+    for each dimension the median number of nonzeros and the median run
+    time over the instances, where the failures count as MAX_TIMING, and
+    the median peak memory if it is in the results
+
+    If by_problem is True, the curves are computed for each value of the
+    'problem' column of the results, e.g., for each replicated problem.
+    """
+    keys = ['problem', 'dimension'] if by_problem else ['dimension']
+    row_list = []
+    for solver in solvers:
+        df = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                      solver, 'results.csv'))
+        failed = ~df['status'].isin(statuses.SOLUTION_PRESENT).values
+        df['run_time'] = np.where(failed, MAX_TIMING,
+                                  df['run_time'].values.astype(float))
+        df['failed'] = failed
+        for group, df_dim in df.groupby(keys):
+            if not isinstance(group, tuple):
+                group = (group,)
+            row = {'solver': solver}
+            row.update(zip(keys, group))
+            row.update({'N': df_dim['N'].median(),
+                        'run_time': df_dim['run_time'].median(),
+                        'geom_mean': geom_mean(df_dim['run_time'].values),
+                        'failure_rate': 100 * df_dim['failed'].mean()})
+            if 'peak_memory' in df_dim:
+                row['peak_memory'] = df_dim['peak_memory'].median()
+            row_list.append(row)
+
+    df_scaling = pd.DataFrame(row_list)
+    scaling_file = os.path.join('.', 'results', problems_type,
+                                'scaling.csv')
+    df_scaling.to_csv(scaling_file, index=False)
+
+    plot_scaling_curves(problems_type, solvers)
+
+
+def plot_scaling_curves(problems, solvers):
+    """
+    Plot median run time versus number of nonzeros
+    """
+    df = pd.read_csv('./results/%s/scaling.csv' % problems)
+
+    plt.figure(4)
+    plt.clf()
+    maker_shapes = ['o', 's', 'd', 'v', '^', '*', 'P', '<', '>', 'X']
+    line_styles = ['-', '--', ':', '-.']
+    for i, solver in enumerate(solvers):
+        df_solver = df.loc[df['solver'] == solver]
+        if 'problem' in df_solver:
+            # One curve per problem
+            for j, (problem, df_problem) in enumerate(
+                    df_solver.groupby('problem')):
+                plt.plot(df_problem['N'].to_numpy(),
+                         df_problem['run_time'].to_numpy(),
+                         marker=maker_shapes[i % len(maker_shapes)],
+                         linestyle=line_styles[j % len(line_styles)],
+                         label='%s %s' % (solver.replace('_high', ''),
+                                          problem))
+        else:
+            plt.plot(df_solver['N'].to_numpy(),
+                     df_solver['run_time'].to_numpy(),
+                     marker=maker_shapes[i % len(maker_shapes)],
+                     label=solver.replace('_high', ''))
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.xlabel(r'Number of nonzeros $N$')
+    plt.ylabel('Median run time [s]')
+    plt.legend()
+    plt.grid()
+    plt.show(block=False)
+    results_file = './results/%s/scaling.png' % problems
+    print("Saving plots to %s" % results_file)
+    plt.savefig(results_file, dpi=300)
+    results_file = './results/%s/scaling.pdf' % problems
+    print("Saving plots to %s" % results_file)
+    plt.savefig(results_file, bbox_inches='tight')
+
+
+def compute_complexity_fits(solvers, problems_type):
+    """
+    Fit the empirical complexity run_time = c * N^p of every solver on
+    the successfully solved problems, where N is the number of nonzeros
+
+    The exponents p, the constants c and the coefficients of determination
+    of the fits in log-log scale are stored in
+    ./results/{problems_type}/complexity.csv
+    """
+    row_list = []
+    for solver in solvers:
+        df = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                      solver, 'results.csv'))
+        df = df.loc[df['status'].isin(statuses.SOLUTION_PRESENT) &
+                    (df['run_time'] > 0)]
+        row = {'solver': solver, 'n_points': len(df)}
+        if len(df) >= 2 and df['N'].nunique() >= 2:
+            log_N = np.log10(df['N'].values.astype(float))
+            log_t = np.log10(df['run_time'].values.astype(float))
+            p, log_c = np.polyfit(log_N, log_t, 1)
+            residuals = log_t - (p * log_N + log_c)
+            row['exponent'] = p
+            row['constant'] = 10 ** log_c
+            row['r2'] = 1. - np.sum(residuals ** 2) / \
+                max(np.sum((log_t - log_t.mean()) ** 2), 1e-20)
+        row_list.append(row)
+
+    complexity_file = os.path.join('.', 'results', problems_type,
+                                   'complexity.csv')
+    pd.DataFrame(row_list, columns=['solver', 'n_points', 'exponent',
+                                    'constant', 'r2']).to_csv(
+        complexity_file, index=False)
+
+
+def compute_formulation_comparison(solvers, formulations, output_folder):
+    """
+    Compare the scaling curves of the same problems in different
+    formulations, e.g., {'dense': 'portfolio_problems_dense', ...}
+
+    For each solver and dimension the median run times of every
+    formulation and the fastest formulation, None if all formulations
+    failed, are stored in ./results/{output_folder}/formulations.csv
+    """
+    df = None
+    for formulation, problems_type in formulations.items():
+        df_scaling = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                              'scaling.csv'))
+        df_scaling = df_scaling[['solver', 'dimension', 'N', 'run_time',
+                                 'failure_rate']].rename(
+            columns={'N': 'N_%s' % formulation,
+                     'run_time': 'run_time_%s' % formulation,
+                     'failure_rate': 'failure_rate_%s' % formulation})
+        df = df_scaling if df is None else \
+            df.merge(df_scaling, on=['solver', 'dimension'])
+
+    df = df.loc[df['solver'].isin(solvers)].copy()
+    run_times = df[['run_time_%s' % f for f in formulations]].values
+    all_failed = (df[['failure_rate_%s' % f for f in formulations]].values
+                  >= 100).all(axis=1)
+    best_formulation = np.array(list(formulations), dtype=object)[
+        np.argmin(run_times, axis=1)]
+    best_formulation[all_failed] = None
+    df['best_formulation'] = best_formulation
+
+    path = os.path.join('.', 'results', output_folder)
+    make_sure_path_exists(path)
+    df.to_csv(os.path.join(path, 'formulations.csv'), index=False)
+
+
+def compute_permutation_spread(solvers, problems_type):
+    """
+    Compute the spread of the run times of every solver over the
+    permutations of each problem
+
+    The failures count as MAX_TIMING. The results are stored in
+    ./results/{problems_type}/ as
+        - 'permutation_spread.csv': minimum, median and maximum run time,
+          ratio of the maximum and the minimum run time and number of
+          failed permutations of each solver and problem
+        - 'permutation_summary.csv': median and maximum ratio, percentage
+          of problems with a ratio above 2 and with a status depending on
+          the permutation, and the shifted geometric means of the original
+          and the median permuted run times of each solver
+    """
+    row_list = []
+    summary_list = []
+    for solver in solvers:
+        df = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                      solver, 'results.csv'))
+        failed = ~df['status'].isin(statuses.SOLUTION_PRESENT).values
+        df['run_time'] = np.where(failed, MAX_TIMING,
+                                  df['run_time'].values.astype(float))
+        df['failed'] = failed
+
+        rows = []
+        for problem, df_problem in df.groupby('name', sort=False):
+            t = df_problem['run_time'].values
+            n_failed = df_problem['failed'].sum()
+            rows.append({'solver': solver,
+                         'name': problem,
+                         'original': t[df_problem['permutation'].values == 0][0],
+                         'min': t.min(),
+                         'median': np.median(t),
+                         'max': t.max(),
+                         'ratio': t.max() / max(t.min(), 1e-09),
+                         'failed': n_failed,
+                         'status_changes': 0 < n_failed < len(t)})
+        df_spread = pd.DataFrame(rows)
+        row_list += rows
+
+        summary_list.append({
+            'solver': solver,
+            'median_ratio': df_spread['ratio'].median(),
+            'max_ratio': df_spread['ratio'].max(),
+            'ratio_above_2': 100 * np.mean(df_spread['ratio'] > 2.),
+            'status_changes': 100 * df_spread['status_changes'].mean(),
+            'geom_mean_original': geom_mean(df_spread['original'].values),
+            'geom_mean_median': geom_mean(df_spread['median'].values)})
+
+    results_dir = os.path.join('.', 'results', problems_type)
+    pd.DataFrame(row_list).to_csv(
+        os.path.join(results_dir, 'permutation_spread.csv'), index=False)
+    pd.DataFrame(summary_list).to_csv(
+        os.path.join(results_dir, 'permutation_summary.csv'), index=False)
+
+
+def compute_conditioning_degradation(solvers, problems_type, levels,
+                                     performance_profiles=True):
+    """
+    Compute the failure rates, shifted geometric means and performance
+    profiles at each stress level, and the degradation curves of the
+    solvers versus the stress level, i.e., the decades added to the
+    coefficient ranges, with the median achieved coefficient range and
+    KKT row norm range
+    """
+    row_list = []
+    for level in levels:
+        level_type = os.path.join(problems_type, 'level_%i' % level)
+        compute_failure_rates(solvers, level_type)
+        compute_performance_profiles(solvers, level_type)
+        compute_shifted_geometric_means(solvers, level_type)
+        if performance_profiles:
+            plot_performance_profiles(level_type, solvers)
+
+        for solver in solvers:
+            df = pd.read_csv(os.path.join('.', 'results', level_type,
+                                          solver, 'results.csv'))
+            failed = ~df['status'].isin(statuses.SOLUTION_PRESENT).values
+            t = df['run_time'].values.astype(float)
+            t[failed] = MAX_TIMING
+            row_list.append({'solver': solver,
+                             'level': level,
+                             'coef_range': df['coef_range'].median(),
+                             'kkt_norm_range':
+                                 df['kkt_norm_range'].median(),
+                             'coef_range_P': df['coef_range_P'].median(),
+                             'coef_range_A': df['coef_range_A'].median(),
+                             'geom_mean': geom_mean(t),
+                             'median_iter': df['iter'][~failed].median(),
+                             'failure_rate': 100 * np.mean(failed)})
+
+    df_degradation = pd.DataFrame(row_list)
+    degradation_file = os.path.join('.', 'results', problems_type,
+                                    'conditioning.csv')
+    df_degradation.to_csv(degradation_file, index=False)
+
+    plot_conditioning_degradation(problems_type, solvers)
+
+
+def plot_conditioning_degradation(problems, solvers):
+    """
+    Plot shifted geometric mean of the run times versus stress level
+    """
+    df = pd.read_csv('./results/%s/conditioning.csv' % problems)
+
+    plt.figure(5)
+    plt.clf()
+    maker_shapes = ['o', 's', 'd', 'v', '^', '*', 'P', '<', '>', 'X']
+    for i, solver in enumerate(solvers):
+        df_solver = df.loc[df['solver'] == solver]
+        plt.plot(df_solver['level'].to_numpy(),
+                 df_solver['geom_mean'].to_numpy(),
+                 marker=maker_shapes[i % len(maker_shapes)],
+                 label=solver.replace('_high', ''))
+    plt.yscale('log')
+    plt.xlabel(r'Added coefficient range $s$ [decades]')
+    plt.ylabel('Shifted geometric mean')
+    plt.legend()
+    plt.grid()
+    plt.show(block=False)
+    results_file = './results/%s/conditioning.png' % problems
+    print("Saving plots to %s" % results_file)
+    plt.savefig(results_file, dpi=300)
+    results_file = './results/%s/conditioning.pdf' % problems
+    print("Saving plots to %s" % results_file)
+    plt.savefig(results_file, bbox_inches='tight')
+
+
 def compute_stats_info(solvers, benchmark_type,
                        problems=None,
                        high_accuracy=False,
@@ -5,6 +5,7 @@ import errno
 import os
 
 import sys
+import time
 from contextlib import contextmanager
 
 
@@ -72,18 +73,22 @@ def gen_int_log_space(min_val, limit, n):
                     dtype=int)
 
 
-def is_qp_solution_optimal(qp_problem, x, y, high_accuracy=False):
+def estimate_dense_memory(n, m):
     '''
-    Check optimality condition of the QP given the
-    primal-dual solution (x, y) and the tolerance eps
+    Estimate the memory in bytes needed to store the QP matrices
+    P (n x n) and A (m x n) as dense double precision arrays
     '''
-    if high_accuracy:
-        eps_abs = s.eps_abs_high
-        eps_rel = s.eps_rel_high
-    else:
-        eps_abs = s.eps_abs_low
-        eps_rel = s.eps_rel_low
+    return 8. * n * (n + m)
+
 
+def _kkt_terms(qp_problem, x, y):
+    '''
+    Compute the KKT residuals of the QP given the primal-dual solution (x, y)
+    together with the norms of the terms they are made of
+
+    Returns:
+        dictionary {residual name: (absolute residual, scale)}
+    '''
     # Get problem matrices
     P = qp_problem['P']
     q = qp_problem['q']
@@ -91,31 +96,134 @@ def is_qp_solution_optimal(qp_problem, x, y, high_accuracy=False):
     l = qp_problem['l']
     u = qp_problem['u']
 
-    l_finite = l[l < np.inf]
-    u_finite = u[u > -np.inf]
+    l_finite = np.isfinite(l)
+    u_finite = np.isfinite(u)
 
-    # Check primal feasibility
+    # Sparse matrix-vector products
     Ax = A.dot(x)
-    eps_pri = eps_abs + eps_rel * np.max([la.norm(Ax, np.inf), la.norm(l_finite, np.inf), la.norm(u_finite, np.inf)])
-    pri_res = np.minimum(Ax - l, 0) + np.maximum(Ax - u, 0)
-
-    if la.norm(pri_res, np.inf) > eps_pri:
-        print("Error in primal residual: %.4e > %.4e" %
-              (la.norm(pri_res, np.inf), eps_pri))
-        # return False
-
-    # Check dual feasibility
     Px = P.dot(x)
     Aty = A.T.dot(y)
-    eps_dua = eps_abs + eps_rel * np.max([la.norm(Px, np.inf),
-                                          la.norm(q, np.inf),
-                                          la.norm(Aty, np.inf)])
-    dua_res = Px + q + Aty
-
-    if la.norm(dua_res, np.inf) > eps_dua:
-        print("Error in dual residual: %.4e > %.4e" %
-              (la.norm(dua_res, np.inf), eps_dua))
-        # return False
-
-    # If we arrived until here, the solution is optimal
-    return True
+
+    # Primal residual: distance of A x from [l, u]
+    z = np.minimum(np.maximum(Ax, l), u)
+    pri_res = la.norm(Ax - z, np.inf)
+    pri_scale = np.max([la.norm(Ax, np.inf),
+                        la.norm(l[l_finite], np.inf),
+                        la.norm(u[u_finite], np.inf)])
+
+    # Dual residual
+    dua_res = la.norm(Px + q + Aty, np.inf)
+    dua_scale = np.max([la.norm(Px, np.inf),
+                        la.norm(q, np.inf),
+                        la.norm(Aty, np.inf)])
+
+    # Duality gap: x' P x + q' x plus the support function of [l, u] at y
+    y_u = np.maximum(y, 0)
+    y_l = np.maximum(-y, 0)
+    xPx = x.dot(Px)
+    qx = q.dot(x)
+    support = u[u_finite].dot(y_u[u_finite]) - l[l_finite].dot(y_l[l_finite])
+    gap = abs(xPx + qx + support)
+    gap_scale = np.max([abs(xPx), abs(qx), abs(support)])
+
+    # Complementarity: the multipliers of infinite bounds have to be zero
+    compl_u = np.where(u_finite, y_u * (np.where(u_finite, u, 0) - z), y_u)
+    compl_l = np.where(l_finite, y_l * (z - np.where(l_finite, l, 0)), y_l)
+    compl_res = max(la.norm(compl_u, np.inf), la.norm(compl_l, np.inf))
+    compl_scale = la.norm(y, np.inf) * pri_scale
+
+    return {'pri_res': (pri_res, pri_scale),
+            'dua_res': (dua_res, dua_scale),
+            'gap': (gap, gap_scale),
+            'compl_res': (compl_res, compl_scale)}
+
+
+def kkt_residuals(qp_problem, x, y):
+    '''
+    Compute the absolute and relative primal residual, dual residual,
+    duality gap and complementarity residual of the QP given the
+    primal-dual solution (x, y)
+
+    The relative residuals are normalized by the largest norm of the terms
+    of each residual.
+
+    Returns:
+        dictionary with keys 'pri_res', 'pri_res_rel', 'dua_res', ...
+    '''
+    residuals = {}
+    for name, (res, scale) in _kkt_terms(qp_problem, x, y).items():
+        residuals[name] = res
+        residuals[name + '_rel'] = res / scale if scale > 0 else res
+    return residuals
+
+
+def kkt_scales(qp_problem, x, y):
+    '''
+    Compute the scales of the primal residual, dual residual and duality
+    gap of the QP given the primal-dual solution (x, y), i.e., the largest
+    norm of the terms of each residual as in is_qp_solution_optimal
+
+    Returns:
+        dictionary with keys 'pri_scale', 'dua_scale' and 'gap_scale'
+    '''
+    terms = _kkt_terms(qp_problem, x, y)
+    return {'pri_scale': terms['pri_res'][1],
+            'dua_scale': terms['dua_res'][1],
+            'gap_scale': terms['gap'][1]}
+
+
+# Durations of the optimality checks, see timed_optimality_checks
+_check_times = None
+
+
+@contextmanager
+def timed_optimality_checks():
+    '''
+    Record the duration in seconds of every call of is_qp_solution_optimal,
+    e.g., to exclude the checks of the solver wrappers from timings
+
+    with timed_optimality_checks() as check_times:
+        solver.solve(example)
+    check_time = sum(check_times)
+    '''
+    global _check_times
+    _check_times = []
+    try:
+        yield _check_times
+    finally:
+        _check_times = None
+
+
+def is_qp_solution_optimal(qp_problem, x, y, high_accuracy=False,
+                           eps_abs=None, eps_rel=None, strict=False):
+    '''
+    Check optimality condition of the QP given the
+    primal-dual solution (x, y) and the tolerance eps, i.e., the primal
+    residual, dual residual, duality gap and complementarity residual are
+    below eps_abs + eps_rel * (norm of their terms)
+
+    NB. The tolerances eps_abs and eps_rel override the ones selected by
+    high_accuracy. The residuals are only reported unless strict is True.
+    '''
+    t_start = time.perf_counter()
+
+    if eps_abs is None or eps_rel is None:
+        if high_accuracy:
+            eps_abs = s.eps_abs_high
+            eps_rel = s.eps_rel_high
+        else:
+            eps_abs = s.eps_abs_low
+            eps_rel = s.eps_rel_low
+
+    optimal = True
+    for name, (res, scale) in _kkt_terms(qp_problem, x, y).items():
+        eps = eps_abs + eps_rel * scale
+        if res > eps:
+            print("Error in %s: %.4e > %.4e" % (name, res, eps))
+            optimal = False
+
+    if _check_times is not None:
+        _check_times.append(time.perf_counter() - t_start)
+
+    # Without strict the residuals are only reported
+    return optimal or not strict
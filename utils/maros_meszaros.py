@@ -1,3 +1,7 @@
+import os
+import numpy as np
+import numpy.linalg as la
+
 # Define map from problem name to optimal cost
 
 OPT_COST_MAP = {}
@@ -141,3 +145,44 @@ OPT_COST_MAP['UBH1'] = 1.1160008e+00
 OPT_COST_MAP['VALUES'] = -1.3966211e+00
 OPT_COST_MAP['YAO'] = 1.9770426e+02
 OPT_COST_MAP['ZECEVIC2'] = -4.1250000e+00
+
+
+# Folder of the high-accuracy reference solutions (see
+# maros_meszaros_problems/maros_meszaros_reference.py)
+REFERENCE_FOLDER = os.path.join(".", "problem_classes",
+                                "maros_meszaros_reference")
+
+
+def load_reference_solution(problem):
+    '''
+    Load the reference solution of Maros Meszaros 'problem'
+
+    Returns:
+        dictionary with the primal-dual solution 'x', 'y', the objective
+        value 'obj_val' and the 'solver', or None if it was not computed
+    '''
+    file_name = os.path.join(REFERENCE_FOLDER, problem + '.npz')
+    if not os.path.isfile(file_name):
+        return None
+    reference = np.load(file_name)
+    return {'x': reference['x'],
+            'y': reference['y'],
+            'obj_val': float(reference['obj_val']),
+            'solver': str(reference['solver'])}
+
+
+def reference_errors(reference, x, y, obj_val):
+    '''
+    Distance of the solution (x, y) with objective value obj_val from the
+    reference solution
+
+    NB. The solution of problems with a singular P might not be unique.
+    '''
+    obj_ref = reference['obj_val']
+    if obj_val is None:
+        obj_err_rel = np.nan
+    else:
+        obj_err_rel = abs(obj_val - obj_ref) / max(1., abs(obj_ref))
+    return {'x_err': la.norm(x - reference['x'], np.inf),
+            'y_err': la.norm(y - reference['y'], np.inf),
+            'obj_err_rel': obj_err_rel}
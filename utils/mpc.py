@@ -0,0 +1,43 @@
+import os
+import numpy as np
+import pandas as pd
+import solvers.statuses as statuses
+
+
+def compute_mpc_latency(solvers, modes, dimensions, output_folder):
+    """
+    Compute the per-step latency statistics of the closed-loop MPC
+    simulations
+
+    The results are stored in ./results/{output_folder}/mpc_latency.csv
+    with one row per solver, mode and number of states and fields
+        - 'p50', 'p99', 'max': percentiles of the run time per step
+        - 'total_time': sum of the run times of the steps
+        - 'loop_time': wall clock time of the closed loop
+        - 'failure_rate': percentage of failed steps
+    """
+    row_list = []
+    for solver in solvers:
+        for mode in modes:
+            for nx in dimensions:
+                df = pd.read_csv(os.path.join('.', 'results', output_folder,
+                                              '%s %s' % (solver, mode),
+                                              'n%i.csv' % nx))
+                t = df['run_time'].values.astype(float)
+                failed = ~df['status'].isin(statuses.SOLUTION_PRESENT).values
+                row_list.append({'solver': solver,
+                                 'mode': mode,
+                                 'nx': nx,
+                                 'n': df['n'].iloc[0],
+                                 'p50': np.nanpercentile(t, 50),
+                                 'p99': np.nanpercentile(t, 99),
+                                 'max': np.nanmax(t),
+                                 'total_time': np.nansum(t),
+                                 'loop_time': df['wall_time'].iloc[-1],
+                                 'failure_rate': 100 * np.mean(failed)})
+
+    df_latency = pd.DataFrame(row_list)
+    latency_file = os.path.join('.', 'results', output_folder,
+                                'mpc_latency.csv')
+    print("Saving MPC latency statistics to %s" % latency_file)
+    df_latency.to_csv(latency_file, index=False)
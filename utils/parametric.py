@@ -2,52 +2,61 @@ import os
 import pandas as pd
 
 
-def print_results_parametric(problem, dimension):
+def load_results_parametric(solver, problem, dimension):
     """
-    Print parametric problem results
+    Load parametric problem results of 'solver' without and with
+    warm start
     """
-    print('[%s]' % problem)
-    ws_file = os.path.join('.', 'results', 'parametric_problems',
-                           'OSQP warmstart',
-                           problem,
-                           'n%i.csv' % dimension
-                           )
     no_ws_file = os.path.join('.', 'results', 'parametric_problems',
-                              'OSQP no warmstart',
+                              '%s no warmstart' % solver,
                               problem,
                               'n%i.csv' % dimension
                               )
+    ws_file = os.path.join('.', 'results', 'parametric_problems',
+                           '%s warmstart' % solver,
+                           problem,
+                           'n%i.csv' % dimension
+                           )
 
-    no_ws_df = pd.read_csv(no_ws_file)
-    ws_df = pd.read_csv(ws_file)
+    return pd.read_csv(no_ws_file), pd.read_csv(ws_file)
+
+
+def print_results_parametric(problem, dimension, solvers=['OSQP']):
+    """
+    Print parametric problem results
+    """
+    print('[%s]' % problem)
 
     # Store results
     results_file = os.path.join(".", "results", "parametric_problems",
                                 "%s_results.txt" % problem.lower())
     print("Saving statistics to file %s" % results_file)
     f = open(results_file, "w")
-    f.write('  OSQP (no warm start): \n')
-    f.write('   - median time: %.4e sec\n' % no_ws_df['run_time'].median())
-    f.write('   - mean time:   %.4e sec\n' % no_ws_df['run_time'].mean())
-    f.write('   - median iter: %d\n' % no_ws_df['iter'].median())
-    f.write('   - mean iter:   %d\n' % no_ws_df['iter'].mean())
-
-    f.write('  OSQP (warm start): \n')
-    f.write('   - median time: %.4e sec\n' % ws_df['run_time'].median())
-    f.write('   - mean time:   %.4e sec\n' % ws_df['run_time'].mean())
-    f.write('   - median iter: %d\n' % ws_df['iter'].median())
-    f.write('   - mean iter:   %d\n' % ws_df['iter'].mean())
-
-    f.write("  Speedups\n")
-    f.write('   - median time: %.2f x\n' %
-            (no_ws_df['run_time'].median() / ws_df['run_time'].median()))
-    f.write('   - mean time:   %.2f x\n' %
-            (no_ws_df['run_time'].mean() / ws_df['run_time'].mean()))
+    for solver in solvers:
+        no_ws_df, ws_df = load_results_parametric(solver, problem, dimension)
+
+        f.write('  %s (no warm start): \n' % solver)
+        f.write('   - median time: %.4e sec\n' % no_ws_df['run_time'].median())
+        f.write('   - mean time:   %.4e sec\n' % no_ws_df['run_time'].mean())
+        f.write('   - median iter: %d\n' % no_ws_df['iter'].median())
+        f.write('   - mean iter:   %d\n' % no_ws_df['iter'].mean())
+
+        f.write('  %s (warm start): \n' % solver)
+        f.write('   - median time: %.4e sec\n' % ws_df['run_time'].median())
+        f.write('   - mean time:   %.4e sec\n' % ws_df['run_time'].mean())
+        f.write('   - median iter: %d\n' % ws_df['iter'].median())
+        f.write('   - mean iter:   %d\n' % ws_df['iter'].mean())
+
+        f.write("  %s speedups\n" % solver)
+        f.write('   - median time: %.2f x\n' %
+                (no_ws_df['run_time'].median() / ws_df['run_time'].median()))
+        f.write('   - mean time:   %.2f x\n' %
+                (no_ws_df['run_time'].mean() / ws_df['run_time'].mean()))
     f.close()
 
     print("")
 
-def compute_results_parametric(problems, dimensions):
+def compute_results_parametric(problems, dimensions, solvers=['OSQP']):
 
     row_list = []
     statistics_file = os.path.join('.', 'results', 'parametric_problems',
@@ -58,34 +67,26 @@ def compute_results_parametric(problems, dimensions):
                                             "statistics_%s.csv" % p.lower())
         row_list_prob = []
         for d in dimensions[p]:
-            ws_file = os.path.join('.', 'results', 'parametric_problems',
-                                   'OSQP warmstart',
-                                   p,
-                                   'n%i.csv' % d
-                                   )
-            no_ws_file = os.path.join('.', 'results', 'parametric_problems',
-                                      'OSQP no warmstart',
-                                      p,
-                                      'n%i.csv' % d
-                                      )
-            no_ws_df = pd.read_csv(no_ws_file)
-            ws_df = pd.read_csv(ws_file)
             dict_stats = {
                     'problem': p,
-                    'dimension': d,
-                    'OSQP_ws_mean_time': ws_df['run_time'].mean(),
-                    'OSQP_ws_median_time': ws_df['run_time'].median(),
-                    'OSQP_ws_mean_iter': ws_df['iter'].mean(),
-                    'OSQP_ws_median_iter': ws_df['iter'].median(),
-                    'OSQP_nows_mean_time': no_ws_df['run_time'].mean(),
-                    'OSQP_nows_median_time': no_ws_df['run_time'].median(),
-                    'OSQP_nows_mean_iter': no_ws_df['iter'].mean(),
-                    'OSQP_nows_median_iter': no_ws_df['iter'].median(),
-                    'time_speedup_mean': no_ws_df['run_time'].mean()/ws_df['run_time'].mean(),
-                    'time_speedup_median': no_ws_df['run_time'].median()/ws_df['run_time'].median(),
-                    'iter_reduction_mean': no_ws_df['iter'].mean()/ws_df['iter'].mean(),
-                    'iter_reduction_median': no_ws_df['iter'].median()/ws_df['iter'].median()
+                    'dimension': d
                     }
+            for solver in solvers:
+                no_ws_df, ws_df = load_results_parametric(solver, p, d)
+                dict_stats.update({
+                    '%s_ws_mean_time' % solver: ws_df['run_time'].mean(),
+                    '%s_ws_median_time' % solver: ws_df['run_time'].median(),
+                    '%s_ws_mean_iter' % solver: ws_df['iter'].mean(),
+                    '%s_ws_median_iter' % solver: ws_df['iter'].median(),
+                    '%s_nows_mean_time' % solver: no_ws_df['run_time'].mean(),
+                    '%s_nows_median_time' % solver: no_ws_df['run_time'].median(),
+                    '%s_nows_mean_iter' % solver: no_ws_df['iter'].mean(),
+                    '%s_nows_median_iter' % solver: no_ws_df['iter'].median(),
+                    '%s_time_speedup_mean' % solver: no_ws_df['run_time'].mean()/ws_df['run_time'].mean(),
+                    '%s_time_speedup_median' % solver: no_ws_df['run_time'].median()/ws_df['run_time'].median(),
+                    '%s_iter_reduction_mean' % solver: no_ws_df['iter'].mean()/ws_df['iter'].mean(),
+                    '%s_iter_reduction_median' % solver: no_ws_df['iter'].median()/ws_df['iter'].median()
+                    })
             row_list_prob.append(dict_stats)
 
         # Store prob statistics
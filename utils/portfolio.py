@@ -0,0 +1,163 @@
+import os
+from itertools import combinations, permutations
+import numpy as np
+import pandas as pd
+import solvers.statuses as statuses
+from utils.benchmark import MAX_TIMING, geom_mean
+
+
+def load_run_times(solvers, problems_type):
+    '''
+    Load the run times of the solvers as matrices with one row per problem
+    and one column per solver
+
+    Returns:
+        problem names,
+        run times until success, infinite if the solver failed,
+        run times until the solver stopped, successful or not
+    '''
+    dfs = []
+    for solver in solvers:
+        df = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                      solver, 'results.csv'))
+        # Failures without timing, e.g., memory limit, stop immediately
+        run_time = np.nan_to_num(df['run_time'].values.astype(float),
+                                 nan=0.)
+        failed = ~df['status'].isin(statuses.SOLUTION_PRESENT).values
+        dfs.append(pd.DataFrame({'name': df['name'].values,
+                                 'solver': solver,
+                                 'solved': np.where(failed, np.inf,
+                                                    run_time),
+                                 'stopped': np.minimum(run_time,
+                                                       MAX_TIMING)}))
+    df = pd.concat(dfs)
+    T = df.pivot(index='name', columns='solver', values='solved')
+    T = T[solvers].fillna(np.inf)
+    T_stop = df.pivot(index='name', columns='solver', values='stopped')
+    T_stop = T_stop[solvers].fillna(MAX_TIMING)
+    return T.index.values, T.values, T_stop.values
+
+
+def portfolio_stats(t):
+    '''
+    Shifted geometric mean and failure rate of the run times t of the
+    problems, where infinite run times are failures
+    '''
+    failed = ~np.isfinite(t)
+    return geom_mean(np.where(failed, MAX_TIMING, t)), 100 * np.mean(failed)
+
+
+def fallback_chain_times(T, T_stop, budgets):
+    '''
+    Run times of a sequential fallback chain, i.e., the solvers are run one
+    after another and the next one starts when the previous one failed or
+    used up its time budget
+
+    Args:
+        T: run times until success of the solvers of the chain
+           (n_problems x chain length), infinite if the solver failed
+        T_stop: run times until the solvers stopped
+        budgets: time budgets of all solvers of the chain but the last one,
+                 which gets the remaining time
+
+    Returns:
+        run times of the chain, infinite if all solvers failed
+    '''
+    t = np.full(T.shape[0], np.inf)
+    elapsed = np.zeros(T.shape[0])
+    for j in range(T.shape[1]):
+        budget = MAX_TIMING - elapsed
+        if j < len(budgets):
+            budget = np.minimum(budget, budgets[j])
+        unsolved = ~np.isfinite(t)
+        solved = unsolved & (T[:, j] <= budget)
+        t[solved] = elapsed[solved] + T[solved, j]
+        elapsed += np.where(unsolved & ~solved,
+                            np.minimum(T_stop[:, j], budget), 0.)
+    return t
+
+
+def compute_portfolio_analysis(solvers, problems_type,
+                               max_portfolio_size=3,
+                               max_chain_length=2,
+                               n_budgets=20):
+    """
+    Compute the virtual best solver (VBS), the marginal contribution of
+    each solver, the best k-solver portfolios and the best sequential
+    fallback chains
+
+    The results are stored in ./results/{problems_type}/ as
+        - 'virtual_best.csv': best solver and run time of each problem
+        - 'marginal_contribution.csv': VBS without each solver
+        - 'portfolios.csv': VBS of every portfolio with up to
+          max_portfolio_size solvers
+        - 'fallback_chains.csv': best time budgets of every chain with up
+          to max_chain_length solvers
+    """
+    names, T, T_stop = load_run_times(solvers, problems_type)
+    results_dir = os.path.join('.', 'results', problems_type)
+
+    # Virtual best solver
+    t_vbs = np.min(T, axis=1)
+    best_solver = np.array(solvers)[np.argmin(T, axis=1)]
+    best_solver[~np.isfinite(t_vbs)] = ''
+    pd.DataFrame({'name': names,
+                  'solver': best_solver,
+                  'run_time': t_vbs}).to_csv(
+        os.path.join(results_dir, 'virtual_best.csv'), index=False)
+    g_vbs, failure_vbs = portfolio_stats(t_vbs)
+
+    # Marginal contribution: degradation of the VBS without the solver
+    row_list = []
+    for i, solver in enumerate(solvers):
+        g_mean, failure_rate = portfolio_stats(
+            np.min(np.delete(T, i, axis=1), axis=1)
+            if len(solvers) > 1 else np.full(len(names), np.inf))
+        row_list.append({'solver': solver,
+                         'best_count': np.sum(best_solver == solver),
+                         'geom_mean_ratio': g_mean / g_vbs,
+                         'failure_rate_increase': failure_rate - failure_vbs})
+    pd.DataFrame(row_list).sort_values(
+        'geom_mean_ratio', ascending=False).to_csv(
+        os.path.join(results_dir, 'marginal_contribution.csv'), index=False)
+
+    # Best k-solver portfolios
+    row_list = []
+    for k in range(1, min(max_portfolio_size, len(solvers)) + 1):
+        for portfolio in combinations(range(len(solvers)), k):
+            g_mean, failure_rate = portfolio_stats(
+                np.min(T[:, list(portfolio)], axis=1))
+            row_list.append({'size': k,
+                             'solvers': ' '.join(solvers[i]
+                                                 for i in portfolio),
+                             'geom_mean': g_mean / g_vbs,
+                             'failure_rate': failure_rate})
+    pd.DataFrame(row_list).sort_values(['size', 'geom_mean']).to_csv(
+        os.path.join(results_dir, 'portfolios.csv'), index=False)
+
+    # Best sequential fallback chains: grid search over the time budgets
+    # of all solvers but the last one
+    budget_grid = np.logspace(-3, np.log10(MAX_TIMING), n_budgets)
+    row_list = []
+    for k in range(2, min(max_chain_length, len(solvers)) + 1):
+        for chain in permutations(range(len(solvers)), k):
+            best = None
+            for budgets in np.stack(np.meshgrid(
+                    *[budget_grid] * (k - 1)), -1).reshape(-1, k - 1):
+                g_mean, failure_rate = portfolio_stats(
+                    fallback_chain_times(T[:, list(chain)],
+                                         T_stop[:, list(chain)],
+                                         budgets))
+                if best is None or g_mean < best['geom_mean']:
+                    best = {'length': k,
+                            'solvers': ' '.join(solvers[i] for i in chain),
+                            'budgets': ' '.join('%.2e' % b
+                                                for b in budgets),
+                            'geom_mean': g_mean,
+                            'failure_rate': failure_rate}
+            best['geom_mean'] /= g_vbs
+            row_list.append(best)
+    pd.DataFrame(row_list, columns=['length', 'solvers', 'budgets',
+                                    'geom_mean', 'failure_rate']).sort_values(
+        ['length', 'geom_mean']).to_csv(
+        os.path.join(results_dir, 'fallback_chains.csv'), index=False)
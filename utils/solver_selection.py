@@ -0,0 +1,157 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import solvers.statuses as statuses
+from problem_classes.maros_meszaros import MarosMeszaros
+from utils.general import make_sure_path_exists
+from utils.portfolio import load_run_times
+from utils.benchmark import MAX_TIMING
+
+PROBLEMS_FOLDER = "maros_meszaros_data"
+
+# Problem features used to predict the run times
+FEATURES = ['log_n', 'log_m', 'log_nnz_P', 'log_nnz_A', 'log_density',
+            'frac_eq', 'frac_two_sided', 'frac_bounded_vars', 'P_diagonal',
+            'P_zero']
+
+
+def problem_features(qp_problem):
+    '''
+    Features of the QP in the format of the qp_problem dictionary of
+    MarosMeszaros, i.e., with the variable bounds in the last n rows of A
+    '''
+    P = qp_problem['P']
+    n = qp_problem['n']
+    m = qp_problem['m']
+    A = qp_problem['A'][:-n]
+    l = qp_problem['l']
+    u = qp_problem['u']
+    m_c = A.shape[0]
+
+    n_eq = len(qp_problem['eq_rows'])
+    cl = l[:-n]
+    cu = u[:-n]
+    n_two_sided = np.sum(np.isfinite(cl) & np.isfinite(cu)) - n_eq
+    bounded_vars = np.isfinite(l[-n:]) | np.isfinite(u[-n:])
+    nnz_P_diag = np.count_nonzero(P.diagonal())
+
+    return np.array([
+        np.log10(n),
+        np.log10(1 + m_c),
+        np.log10(1 + P.nnz),
+        np.log10(1 + A.nnz),
+        np.log10((P.nnz + qp_problem['A'].nnz) / (n * (n + m))),
+        n_eq / max(m_c, 1),
+        n_two_sided / max(m_c, 1),
+        np.mean(bounded_vars),
+        float(P.nnz > 0 and P.nnz == nnz_P_diag),
+        float(P.nnz == 0)])
+
+
+def fit_runtime_model(X, Y, reg=1.0):
+    '''
+    Fit a ridge regression of the log run times Y (problems x solvers) on
+    the standardized features X (problems x features)
+    '''
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.
+    Z = np.hstack([(X - mean) / std, np.ones((X.shape[0], 1))])
+    R = reg * np.eye(Z.shape[1])
+    R[-1, -1] = 0.  # Do not regularize the bias
+    W = np.linalg.solve(Z.T.dot(Z) + R, Z.T.dot(Y))
+    return {'mean': mean, 'std': std, 'W': W}
+
+
+def predict_log_run_times(model, X):
+    '''
+    Predict the log run times of the solvers for the features X
+    '''
+    X = np.atleast_2d(X)
+    Z = np.hstack([(X - model['mean']) / model['std'],
+                   np.ones((X.shape[0], 1))])
+    return Z.dot(model['W'])
+
+
+def save_model(model, solvers, model_file):
+    np.savez(model_file, solvers=np.array(solvers), **model)
+
+
+def load_model(model_file):
+    '''
+    Load solver selection model
+
+    Returns:
+        model, solver names
+    '''
+    data = np.load(model_file)
+    model = {key: data[key] for key in ['mean', 'std', 'W']}
+    return model, [str(solver) for solver in data['solvers']]
+
+
+def train_solver_selection(solvers, problems_type, output_folder,
+                           auto_solver, reg=1.0):
+    """
+    Train the solver selection model on the results of the solvers and
+    evaluate it with leave-one-out over the problems
+
+    The failures count as MAX_TIMING. The results of the solvers and the
+    leave-one-out selection, stored as solver 'auto_solver', are copied to
+    ./results/{output_folder}/ to compare their statistics. The model
+    trained on all problems is stored in
+    ./results/{problems_type}/solver_selection_model.npz
+    """
+    names, T, T_stop = load_run_times(solvers, problems_type)
+
+    X = []
+    for problem in names:
+        full_name = os.path.join(".", "problem_classes",
+                                 PROBLEMS_FOLDER, problem)
+        X.append(problem_features(MarosMeszaros(full_name).qp_problem))
+    X = np.array(X)
+    Y = np.log10(np.maximum(np.where(np.isfinite(T), T, MAX_TIMING), 1e-06))
+
+    # Leave-one-out evaluation
+    selected = np.zeros(len(names), dtype=int)
+    for i in range(len(names)):
+        train = np.arange(len(names)) != i
+        model = fit_runtime_model(X[train], Y[train], reg=reg)
+        selected[i] = np.argmin(predict_log_run_times(model, X[i]))
+
+    t_selected = T[np.arange(len(names)), selected]
+    df = pd.DataFrame({
+        'name': names,
+        'solver': auto_solver,
+        'selected_solver': np.array(solvers)[selected],
+        'best_solver': np.array(solvers)[np.argmin(T, axis=1)],
+        'status': np.where(np.isfinite(t_selected), statuses.OPTIMAL,
+                           statuses.SOLVER_ERROR),
+        'run_time': np.where(np.isfinite(t_selected), t_selected,
+                             T_stop[np.arange(len(names)), selected])
+    })
+
+    # Same order of the problems as in the results of the solvers
+    order = pd.read_csv(os.path.join('.', 'results', problems_type,
+                                     solvers[0], 'results.csv'))['name']
+    df = df.set_index('name').loc[order].reset_index()
+    df.to_csv(os.path.join(make_results_dir(output_folder, auto_solver),
+                           'results.csv'), index=False)
+
+    for solver in solvers:
+        shutil.copy(os.path.join('.', 'results', problems_type, solver,
+                                 'results.csv'),
+                    os.path.join(make_results_dir(output_folder, solver),
+                                 'results.csv'))
+
+    # Model trained on all problems
+    model = fit_runtime_model(X, Y, reg=reg)
+    save_model(model, solvers,
+               os.path.join('.', 'results', problems_type,
+                            'solver_selection_model.npz'))
+
+
+def make_results_dir(output_folder, solver):
+    path = os.path.join('.', 'results', output_folder, solver)
+    make_sure_path_exists(path)
+    return path
@@ -0,0 +1,185 @@
+import ctypes
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+import numpy as np
+
+# Columns of a convergence trace, i.e., one row per logged iteration
+TRACE_COLUMNS = ['time', 'pri_res', 'dua_res', 'gap']
+
+libc = ctypes.CDLL(None)
+
+
+@contextmanager
+def stdout_captured():
+    '''
+    Capture the output of python and of the C/C++ libraries into a list
+
+    with stdout_captured() as log:
+        solver.solve()
+    text = log[0]
+    '''
+    log = []
+    fd = sys.stdout.fileno()
+    sys.stdout.flush()
+    libc.fflush(None)
+    saved_fd = os.dup(fd)
+    with tempfile.TemporaryFile(mode='w+') as file:
+        os.dup2(file.fileno(), fd)
+        try:
+            yield log
+        finally:
+            sys.stdout.flush()
+            libc.fflush(None)
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+            file.seek(0)
+            log.append(file.read())
+
+
+def make_trace(rows):
+    '''
+    Convert a list of rows (time, pri_res, dua_res, gap) into a trace array
+    '''
+    return np.array(rows, dtype=float).reshape(-1, len(TRACE_COLUMNS))
+
+
+def _log_rows(text, n_tokens, separator=None):
+    '''
+    Split the iteration lines of a solver log, i.e., the lines starting with
+    the iteration number and with one of the numbers of tokens n_tokens
+    '''
+    rows = []
+    for line in text.splitlines():
+        if separator is not None:
+            line = line.replace(separator, ' ')
+        tokens = line.split()
+        if len(tokens) in n_tokens and tokens[0].isdigit():
+            rows.append(tokens)
+    return rows
+
+
+def _float(token):
+    '''
+    Convert a log token into a float, e.g., '------' into nan
+    '''
+    try:
+        return float(token.rstrip('s'))
+    except ValueError:
+        return np.nan
+
+
+def _interpolate_time(iters, start_time, run_time):
+    '''
+    Time of the iterations of solvers which do not log it, assuming a
+    constant cost per iteration between start_time and run_time
+    '''
+    iters = np.array(iters, dtype=float)
+    if len(iters) == 0 or iters[-1] == 0:
+        return np.full(len(iters), run_time)
+    return start_time + (run_time - start_time) * iters / iters[-1]
+
+
+def parse_osqp_log(text):
+    '''
+    Parse the iterations of the OSQP log
+
+        iter   objective    pri res    dua res    rho        time
+
+    (OSQP >= 1.0 adds the gap and rel kkt columns). The logged time
+    includes the setup time.
+    '''
+    rows = []
+    for tokens in _log_rows(text, [6, 8]):
+        if len(tokens) == 6:
+            gap = np.nan
+        else:
+            gap = abs(_float(tokens[4]))
+        rows.append([_float(tokens[-1]),
+                     _float(tokens[2]), _float(tokens[3]), gap])
+    return make_trace(rows)
+
+
+def parse_piqp_log(text, setup_time, run_time):
+    '''
+    Parse the iterations of the PIQP log
+
+        iter  prim_obj  dual_obj  duality_gap  prim_inf  dual_inf  ...
+
+    (older versions print no duality_gap column). PIQP does not log the
+    time, which is interpolated over the solve time.
+    '''
+    iters = []
+    rows = []
+    for tokens in _log_rows(text, [10, 11]):
+        if len(tokens) == 11:
+            gap = abs(_float(tokens[3]))
+            pri_res, dua_res = _float(tokens[4]), _float(tokens[5])
+        else:
+            gap = abs(_float(tokens[1]) - _float(tokens[2]))
+            pri_res, dua_res = _float(tokens[3]), _float(tokens[4])
+        iters.append(int(tokens[0]))
+        rows.append([np.nan, pri_res, dua_res, gap])
+    trace = make_trace(rows)
+    trace[:, 0] = _interpolate_time(iters, setup_time, run_time)
+    return trace
+
+
+def parse_scs_log(text, setup_time=0.):
+    '''
+    Parse the iterations of the SCS log
+
+         iter | pri res | dua res |   gap   |   obj   |  scale  | time (s)
+    '''
+    rows = []
+    for tokens in _log_rows(text, [7], separator='|'):
+        rows.append([setup_time + _float(tokens[6]),
+                     _float(tokens[1]), _float(tokens[2]),
+                     abs(_float(tokens[3]))])
+    return make_trace(rows)
+
+
+def parse_clarabel_log(text, run_time):
+    '''
+    Parse the iterations of the Clarabel log
+
+        iter    pcost    dcost    gap    pres    dres    k/t    μ    step
+
+    Clarabel does not log the time, which is interpolated over the solve
+    time.
+    '''
+    iters = []
+    rows = []
+    for tokens in _log_rows(text, [9]):
+        iters.append(int(tokens[0]))
+        rows.append([np.nan, _float(tokens[4]), _float(tokens[5]),
+                     abs(_float(tokens[3]))])
+    trace = make_trace(rows)
+    trace[:, 0] = _interpolate_time(iters, 0., run_time)
+    return trace
+
+
+def time_to_tolerance(trace, eps_abs, eps_rel=0., scales=(0., 0., 0.)):
+    '''
+    First time in the trace where the primal and dual residuals and the
+    duality gap (if logged) are below eps_abs + eps_rel * scale, i.e., the
+    criterion of is_qp_solution_optimal
+
+    The scales of the primal residual, dual residual and duality gap are
+    the norms of their terms, e.g., at the returned solution, see
+    kkt_scales.
+
+    Returns:
+        time or np.inf if the tolerance is never reached
+    '''
+    if trace is None or len(trace) == 0:
+        return np.inf
+    time, pri_res, dua_res, gap = trace.T
+    eps_pri, eps_dua, eps_gap = [eps_abs + eps_rel * scale
+                                 for scale in scales]
+    reached = (pri_res <= eps_pri) & (dua_res <= eps_dua) & \
+        (np.isnan(gap) | (gap <= eps_gap))
+    if not np.any(reached):
+        return np.inf
+    return time[np.argmax(reached)]